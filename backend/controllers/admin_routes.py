@@ -7,6 +7,11 @@ from ..core.security import get_current_user, DYNAMIC_JWT_SECRET
 from ..core.db import resumes, interviews, users, fs
 import jwt
 from ..core.config import JWT_ALGORITHM
+from ..services.rag_engine import rag_engine
+from ..services.telemetry import audit_writer
+from ..services.interview_engine import get_prompt_stats
+from ..services.db_maintenance import get_stats as get_db_maintenance_stats
+from ..services.session_reaper import session_reaper
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -258,6 +263,41 @@ async def metrics(current=Depends(get_current_user)):
     count = await interviews.count_documents({})
     return {"interview_count": count}
 
+@router.get("/rag/stats")
+async def rag_stats(current=Depends(get_current_user)):
+    ensure_admin_role(current)
+    return rag_engine.get_cache_stats()
+
+@router.post("/rag/reload")
+async def rag_reload(current=Depends(get_current_user)):
+    """Re-index the RAG corpus in place; only new or edited chunks are embedded."""
+    ensure_admin_role(current)
+    return await rag_engine.reload()
+
+@router.get("/telemetry/stats")
+async def telemetry_stats(current=Depends(get_current_user)):
+    """Audit log write-behind queue: queued, written, dropped and failed events."""
+    ensure_admin_role(current)
+    return audit_writer.get_stats()
+
+@router.get("/db/maintenance")
+async def db_maintenance_stats(current=Depends(get_current_user)):
+    """Last startup index/migration run: created, drifted and unmanaged indexes, applied migrations."""
+    ensure_admin_role(current)
+    return get_db_maintenance_stats()
+
+@router.get("/interview/reaper-stats")
+async def interview_reaper_stats(current=Depends(get_current_user)):
+    """Idle session reaper: passes run, sessions closed and the idle timeout in use."""
+    ensure_admin_role(current)
+    return session_reaper.get_stats()
+
+@router.get("/interview/prompt-stats")
+async def interview_prompt_stats(current=Depends(get_current_user)):
+    """Per-turn interview prompt size, static-prefix memo hits and response cache counters."""
+    ensure_admin_role(current)
+    return get_prompt_stats()
+
 
 @router.post("/verify_passphrase")
 async def verify_passphrase(payload: dict = Body(...)):
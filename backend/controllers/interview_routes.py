@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Form
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Form, Response
+from fastapi.responses import StreamingResponse
 from datetime import datetime, timedelta, timezone
 from bson import ObjectId
+from pymongo import ReturnDocument
 from ..core.db import interviews, users, resumes
 from ..core.security import get_current_user
-from ..core.config import SESSION_MAX_QUESTIONS, INTERVIEW_DEFAULT_QUESTIONS, DAILY_QUESTION_LIMIT
-from ..services.interview_engine import interview_reply
+from ..core.config import SESSION_MAX_QUESTIONS, INTERVIEW_DEFAULT_QUESTIONS, DAILY_QUESTION_LIMIT, INTERVIEW_SPECULATIVE_GUARDRAIL
+from ..services.interview_engine import interview_reply, stream_interview_reply, build_candidate_profile, normalize_score
+from ..services.interview_context import transcript_context, schedule_refresh
+from ..services.transcript_store import transcript_store
+from ..services.pagination import fetch_page
 from ..services.rag_engine import rag_engine
 from ..services.rate_limit import rate_limit
 from ..services.utils import is_gibberish, get_malaysia_time
@@ -29,15 +36,62 @@ async def inc_question(user_id: str):
     oid = ObjectId(user_id)
     await users.update_one({"_id": oid}, {"$inc": {"daily_question_count": 1}})
 
-@router.post("/start")
-async def start(
-    job_title: str = Form(None),
-    resume_feedback: str = Form(None),
-    questions_limit: int = Form(None),
-    difficulty: str = Form("Beginner"),
-    current=Depends(get_current_user),
-    _: None = Depends(rate_limit),
-):
+async def enforce_guardrail(guard_task: asyncio.Task):
+    """Waits for the input guardrail and rejects the turn if it flagged the input as malicious."""
+    guardrail = await guard_task
+    if not guardrail.get("safe", True) and guardrail.get("category") == "malicious":
+        raise HTTPException(status_code=400, detail=f"Invalid input detected: {guardrail.get('reason')}")
+
+# Sessions whose transcript lives in the turn store (see migrated_session)
+MIGRATED = {"transcript": {"$exists": False}}
+
+async def migrated_session(s: dict) -> dict:
+    """
+    Moves a legacy embedded transcript into the turn store on first use, so a session reached
+    before startup migration 0001 gets to it neither reads an empty transcript nor has its
+    next turn claim seqs the legacy entries still need. Returns the session as stored after.
+    """
+    if s and "transcript" in s:
+        await transcript_store.migrate_session(interviews, s)
+        s = await interviews.find_one({"_id": s["_id"]})
+    return s
+
+async def write_turn(s: dict, session_id: str, update: dict, entries: list, guard: str = "asked_count") -> dict:
+    """
+    Applies one turn's session update atomically and returns the post-image. The write only
+    matches while the session is open and `guard` still holds the value read at the start of
+    the request, so a concurrent turn on the same session gets a 409 instead of interleaving.
+    The same update claims the seqs for `entries`, which are then stored in the turn store;
+    sessions still carrying a legacy embedded transcript are refused, their seqs are not free yet.
+    """
+    update.setdefault("$inc", {})["turn_count"] = len(entries)
+    # Keeps the session away from the idle reaper
+    update.setdefault("$set", {})["last_activity_at"] = entries[-1]["at"]
+    post = await interviews.find_one_and_update(
+        {"session_id": session_id, "ended_at": None, guard: s.get(guard), **MIGRATED},
+        update,
+        projection={"asked_count": 1, "turn_count": 1, "context_summary_upto": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    if post is None:
+        raise HTTPException(status_code=409, detail="Session was updated by another request. Please retry.")
+    await transcript_store.append(session_id, post["turn_count"] - len(entries), entries)
+    return post
+
+async def session_history(s: dict) -> list:
+    """Chat history for the turns not yet covered by the rolling summary."""
+    upto = s.get("context_summary_upto", 0) or 0
+    return transcript_context.build_history(await transcript_store.read(s["session_id"], start=upto))
+
+def ai_http_error(e: Exception) -> HTTPException:
+    """Maps an interview model failure to the HTTP error the frontend expects."""
+    err_str = str(e)
+    if "429" in err_str or "rate_limit" in err_str.lower() or "AI_RATE_LIMIT" in err_str:
+        return HTTPException(status_code=429, detail="AI_RATE_LIMIT")
+    return HTTPException(status_code=500, detail=f"AI Error: {err_str}")
+
+async def prepare_start(current: dict, job_title, resume_feedback, questions_limit, difficulty):
+    """Validates a start request and resolves (job_title, feedback_dict, questions_limit, difficulty)."""
     u = await users.find_one({"_id": ObjectId(current["id"])})
     
     # Validate questions_limit
@@ -84,235 +138,321 @@ async def start(
     can_start, _ = await check_daily_limit(current["id"], "daily_interview_count", 3)
     if not can_start:
         raise HTTPException(status_code=429, detail="Daily interview session limit reached. Resets at 00:00 Malaysia Time.")
-    
-    try:
-        ai = interview_reply([], job_title=job_title, resume_feedback=feedback_dict, questions_limit=questions_limit, difficulty=difficulty, current_asked_count=0)
-    except Exception as e:
-        err_str = str(e)
-        if "429" in err_str or "rate_limit" in err_str.lower() or "AI_RATE_LIMIT" in err_str:
-            raise HTTPException(status_code=429, detail="AI_RATE_LIMIT")
-        raise HTTPException(status_code=500, detail=f"AI Error: {err_str}")
+    return job_title, feedback_dict, questions_limit, difficulty
 
+def session_profile(s: dict) -> str:
+    """Compact candidate profile of a session; derived on the fly for sessions created before it was stored."""
+    profile = s.get("candidate_profile")
+    if profile is None:
+        profile = build_candidate_profile(s.get("resume_feedback"))
+    return profile
+
+async def create_session(current: dict, job_title, feedback_dict, profile: str, questions_limit, difficulty, ai: str) -> dict:
+    """Persists a new session opened with the greeting message `ai` and returns the start response."""
     sid = str(ObjectId())
     doc = {
         "session_id": sid,
         "user_id": current["id"],
         "job_title": job_title,
         "resume_feedback": feedback_dict,
+        "candidate_profile": profile,
         "questions_limit": questions_limit,
         "difficulty": difficulty,
-        "asked_count": 0,
+        # The greeting is the first question
+        "asked_count": 1,
         "invalid_attempts": 0,
-        "transcript": [],
+        "turn_count": 1,
         "created_at": get_malaysia_time(),
+        "last_activity_at": get_malaysia_time(),
         "ended_at": None,
     }
-    res = await interviews.insert_one(doc)
+    await interviews.insert_one(doc)
+    await transcript_store.append(sid, 0, [{"role": "assistant", "text": ai, "at": get_malaysia_time()}])
     await inc_question(current["id"])
-    await interviews.update_one({"_id": res.inserted_id}, {"$push": {"transcript": {"role": "assistant", "text": ai, "at": get_malaysia_time()}}, "$inc": {"asked_count": 1}})
     return {"session_id": sid, "message": ai, "asked_count": 1, "questions_limit": questions_limit}
 
+@router.post("/start")
+async def start(
+    job_title: str = Form(None),
+    resume_feedback: str = Form(None),
+    questions_limit: int = Form(None),
+    difficulty: str = Form("Beginner"),
+    current=Depends(get_current_user),
+    _: None = Depends(rate_limit),
+):
+    job_title, feedback_dict, questions_limit, difficulty = await prepare_start(
+        current, job_title, resume_feedback, questions_limit, difficulty
+    )
+
+    profile = build_candidate_profile(feedback_dict)
+
+    try:
+        turn = await interview_reply([], job_title=job_title, resume_feedback=profile, questions_limit=questions_limit, difficulty=difficulty, current_asked_count=0)
+    except Exception as e:
+        raise ai_http_error(e)
+
+    return await create_session(current, job_title, feedback_dict, profile, questions_limit, difficulty, turn["message"])
+
+async def handle_gibberish_turn(s: dict, session_id: str, user_id: str, user_text: str) -> dict:
+    """Records a non-word answer, asks again, and closes the session after three of them."""
+    msg = "I didn’t quite catch that. Please answer in clear words. Please try answering the previous question again in your own words."
+    now = get_malaysia_time()
+    entries = [
+        {"role": "user", "text": user_text, "at": now},
+        {"role": "assistant", "text": msg, "at": now},
+    ]
+    update = {"$inc": {"invalid_attempts": 1}}
+    invalids = int(s.get("invalid_attempts") or 0) + 1
+    explain = None
+    if invalids >= 3:
+        explain = (
+            "We received multiple responses that looked like random characters or non-words. "
+            "To keep the interview productive, this session is now closed. "
+            "Because the interview was not completed with valid answers, the Interview Readiness Score is N/A."
+        )
+        entries.append({"role": "assistant", "text": explain, "at": now})
+        update["$set"] = {
+            "ended_at": now,
+            "readiness_score": None,
+            "readiness_feedback": explain,
+        }
+    await write_turn(s, session_id, update, entries, guard="invalid_attempts")
+    if explain:
+        await increment_daily_limit(user_id, "daily_interview_count")
+        return {"message": explain, "ended": True}
+    return {"message": msg}
+
+async def complete_turn(s: dict, session_id: str, user_id: str, user_text: str, turn: dict) -> dict:
+    """Persists a finished turn (user answer + AI reply), handles the session end and scoring."""
+    ai = turn["message"]
+    
+    # Session ends ONLY if we've asked enough questions AND (AI signals it OR we hit the hard limit)
+    # Start: asked_count=0 -> AI sends Q1 -> asked_count=1
+    # User R1 -> AI sends Q2 -> asked_count=2
+    # ...
+    # User R10 -> AI sends Wrap-up -> asked_count=11 (if limit=10)
+    asked_now = int(s.get("asked_count", 0)) + 1
+    limit = int(s.get("questions_limit", SESSION_MAX_QUESTIONS))
+    
+    # We end the session if asked_now > limit (meaning we've just sent the wrap-up)
+    # OR if the AI explicitly marked the turn as finished
+    ended_now = (asked_now > limit) or turn.get("finished", False)
+
+    now = get_malaysia_time()
+    entries = [
+        {"role": "user", "text": user_text, "at": now},
+        {"role": "assistant", "text": ai, "at": now},
+    ]
+    update = {"$inc": {"asked_count": 1}}
+    if ended_now:
+        # Score and breakdown come from the structured turn; clamped and made consistent here
+        readiness_score, breakdown = normalize_score(turn.get("score"), turn.get("breakdown"))
+        feedback_text = ai
+        update["$set"] = {
+            "ended_at": now,
+            "readiness_score": readiness_score,
+            "readiness_breakdown": breakdown,
+            "readiness_feedback": feedback_text,
+        }
+
+    # One guarded session write per turn; the session can only be ended (and counted) once
+    post = await write_turn(s, session_id, update, entries)
+    await inc_question(user_id)
+    if ended_now:
+        await increment_daily_limit(user_id, "daily_interview_count")
+        return {"message": ai, "ended": True, "asked_count": asked_now, "questions_limit": limit, "score": readiness_score, "breakdown": breakdown, "feedback": feedback_text}
+    # Fold older turns into the rolling summary off the request path
+    schedule_refresh(interviews, session_id, post["turn_count"], post.get("context_summary_upto", 0) or 0,
+                     store=transcript_store)
+    return {"message": ai, "asked_count": asked_now, "questions_limit": limit}
+
 @router.post("/{session_id}/reply")
 async def reply(session_id: str, user_text: str = Form(...), current=Depends(get_current_user), _: None = Depends(rate_limit)):
-    s = await interviews.find_one({"session_id": session_id, "user_id": current["id"]})
+    s = await migrated_session(await interviews.find_one({"session_id": session_id, "user_id": current["id"]}))
     if not s:
         raise HTTPException(status_code=404, detail="Not found")
     if s.get("ended_at"):
         return {"ended": True, "message": "Session has ended"}
     
     job_title = s.get("job_title", "")
-    resume_feedback = s.get("resume_feedback")
+    resume_feedback = session_profile(s)
     questions_limit = s.get("questions_limit", INTERVIEW_DEFAULT_QUESTIONS)
     difficulty = s.get("difficulty", "Beginner")
 
     # --- RAG GUARDRAIL & MONITORING ---
-    # Validate user response for quality/behavior monitoring
-    guardrail = await rag_engine.validate_input(user_text[:500])
-    if not guardrail.get("safe", True) and guardrail.get("category") == "malicious":
-        raise HTTPException(status_code=400, detail=f"Invalid input detected: {guardrail.get('reason')}")
-    # --- END GUARDRAIL ---
+    # Validate user response for quality/behavior monitoring. In speculative mode the
+    # guardrail runs alongside the interview completion and only gates its result.
+    guard_task = asyncio.create_task(rag_engine.validate_input(user_text[:500]))
+    try:
+        if not INTERVIEW_SPECULATIVE_GUARDRAIL:
+            await enforce_guardrail(guard_task)
+        # --- END GUARDRAIL ---
 
-    if is_gibberish(user_text, strict=False):
-        msg = "I didn’t quite catch that. Please answer in clear words. Please try answering the previous question again in your own words."
-        await interviews.update_one(
-            {"session_id": session_id},
-            {"$push": {"transcript": {"role": "user", "text": user_text, "at": get_malaysia_time()}}},
-        )
-        await interviews.update_one(
-            {"session_id": session_id},
-            {"$push": {"transcript": {"role": "assistant", "text": msg, "at": get_malaysia_time()}}},
-        )
-        await interviews.update_one(
-            {"session_id": session_id},
-            {"$inc": {"invalid_attempts": 1}}
-        )
-        s2 = await interviews.find_one({"session_id": session_id})
-        invalids = int(s2.get("invalid_attempts", 0))
-        if invalids >= 3:
-            explain = (
-                "We received multiple responses that looked like random characters or non-words. "
-                "To keep the interview productive, this session is now closed. "
-                "Because the interview was not completed with valid answers, the Interview Readiness Score is N/A."
-            )
-            await increment_daily_limit(current["id"], "daily_interview_count")
-            await interviews.update_one(
-                {"session_id": session_id},
-                {
-                    "$set": {
-                        "ended_at": get_malaysia_time(),
-                        "readiness_score": None,
-                        "readiness_feedback": explain,
-                    },
-                    "$push": {"transcript": {"role": "assistant", "text": explain, "at": get_malaysia_time()}}
-                }
-            )
-            return {"message": explain, "ended": True}
-        return {"message": msg}
-    if not await can_ask(current["id"]):
-        raise HTTPException(status_code=429, detail="Daily question quota reached (60 questions per day). Resets at 00:00 Malaysia Time.")
-    history = [{"role": t["role"], "content": t["text"]} for t in s.get("transcript", [])]
+        if is_gibberish(user_text, strict=False):
+            await enforce_guardrail(guard_task)
+            return await handle_gibberish_turn(s, session_id, current["id"], user_text)
+        if not await can_ask(current["id"]):
+            await enforce_guardrail(guard_task)
+            raise HTTPException(status_code=429, detail="Daily question quota reached (60 questions per day). Resets at 00:00 Malaysia Time.")
+        history = await session_history(s)
+    except BaseException:
+        # Request failed before the reply started: nothing will await the guardrail
+        guard_task.cancel()
+        raise
     history.append({"role": "user", "content": user_text})
     
     current_asked_count = s.get("asked_count", 0)
+    reply_task = asyncio.create_task(interview_reply(
+        history, job_title=job_title, resume_feedback=resume_feedback,
+        questions_limit=questions_limit, difficulty=difficulty, current_asked_count=current_asked_count,
+        context_summary=s.get("context_summary", ""),
+    ))
     try:
-        ai = interview_reply(history, job_title=job_title, resume_feedback=resume_feedback, questions_limit=questions_limit, difficulty=difficulty, current_asked_count=current_asked_count)
+        await enforce_guardrail(guard_task)
+    except BaseException:
+        # Malicious input (or client gone): the speculative reply is discarded
+        reply_task.cancel()
+        raise
+
+    try:
+        turn = await reply_task
     except Exception as e:
-        err_str = str(e)
-        if "429" in err_str or "rate_limit" in err_str.lower() or "AI_RATE_LIMIT" in err_str:
-            raise HTTPException(status_code=429, detail="AI_RATE_LIMIT")
-        raise HTTPException(status_code=500, detail=f"AI Error: {err_str}")
+        raise ai_http_error(e)
     
-    # Check for AI signaling completion
-    ai_ended = "[FINISH]" in ai
-    ai = ai.replace("[FINISH]", "").strip()
+    return await complete_turn(s, session_id, current["id"], user_text, turn)
 
-    await inc_question(current["id"])
-    await interviews.update_one(
-        {"session_id": session_id},
-        {"$push": {"transcript": {"role": "user", "text": user_text, "at": get_malaysia_time()}}},
-    )
-    await interviews.update_one(
-        {"session_id": session_id},
-        {
-            "$push": {"transcript": {"role": "assistant", "text": ai, "at": get_malaysia_time()}},
-            "$inc": {"asked_count": 1},
-        },
+# --- STREAMING (Server-Sent Events) ---
+# Events: "token" {"text"} as the reply is generated, then "done" with the same body
+# the non-streaming endpoint returns (its "message" is authoritative), or "error" {"status", "detail"}.
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def sse_response(events) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    
-    # Session ends ONLY if we've asked enough questions AND (AI signals it OR we hit the hard limit)
-    # Start: asked_count=0 -> AI sends Q1 -> asked_count=1
-    # User R1 -> AI sends Q2 -> asked_count=2
-    # ...
-    # User R10 -> AI sends Wrap-up -> asked_count=11 (if limit=10)
-    asked_now = int(s.get("asked_count", 0)) + 1
-    limit = int(s.get("questions_limit", SESSION_MAX_QUESTIONS))
-    
-    # We end the session if asked_now > limit (meaning we've just sent the wrap-up)
-    # OR if the AI explicitly included [FINISH]
-    ended_now = (asked_now > limit) or ai_ended
 
-    if ended_now:
-        # Check if session was already ended to avoid double counting
-        s_check = await interviews.find_one({"session_id": session_id})
-        if s_check and not s_check.get("ended_at"):
-            import re
-            # Extract readiness score and feedback from the AI message
-            # Format expected: "Interview Readiness Score: XX/100"
-            # Breakdown expected: "Breakdown: Technical: XX, Communication: XX, Alignment: XX, Relevance: XX"
-            score_match = re.search(r"Interview Readiness Score:\s*(\d+)/100", ai, re.IGNORECASE)
-            readiness_score = int(score_match.group(1)) if score_match else None
-            
-            # Extract breakdown
-            breakdown = {}
-            breakdown_match = re.search(r"Breakdown:\s*Technical:\s*(\d+),\s*Communication:\s*(\d+),\s*Alignment:\s*(\d+),\s*Relevance:\s*(\d+)", ai, re.IGNORECASE)
-            if breakdown_match:
-                technical = int(breakdown_match.group(1))
-                communication = int(breakdown_match.group(2))
-                alignment = int(breakdown_match.group(3))
-                relevance = int(breakdown_match.group(4))
-                
-                # Validate and clamp each score
-                technical = max(0, min(30, technical))
-                communication = max(0, min(30, communication))
-                alignment = max(0, min(20, alignment))
-                relevance = max(0, min(20, relevance))
-                
-                total = technical + communication + alignment + relevance
-                
-                # If total doesn't match score, adjust
-                if readiness_score is not None and total != readiness_score:
-                    ratio = readiness_score / total if total != 0 else 1
-                    technical = int(technical * ratio)
-                    communication = int(communication * ratio)
-                    alignment = int(alignment * ratio)
-                    relevance = readiness_score - technical - communication - alignment
-                    
-                    # Re-clamp after adjustment
-                    technical = max(0, min(30, technical))
-                    communication = max(0, min(30, communication))
-                    alignment = max(0, min(20, alignment))
-                    relevance = max(0, min(20, relevance))
-                
-                breakdown = {
-                    "TechnicalScore": technical,
-                    "CommunicationScore": communication,
-                    "AlignmentScore": alignment,
-                    "RelevanceScore": relevance
-                }
+async def single_event(event: str, data: dict):
+    yield sse_event(event, data)
+
+async def stream_reply_events(reply_kwargs: dict, on_final, guard_task: asyncio.Task = None):
+    """
+    Forwards filtered tokens from stream_interview_reply as they arrive. The model
+    stream starts immediately; tokens are only released once the guardrail has
+    passed. `on_final(turn)` persists the turn and returns the "done" payload.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            async for kind, text in stream_interview_reply(**reply_kwargs):
+                await queue.put((kind, text))
+        except Exception as e:
+            await queue.put(("error", e))
+
+    producer = asyncio.create_task(produce())
+    try:
+        if guard_task is not None:
+            try:
+                await enforce_guardrail(guard_task)
+            except HTTPException as e:
+                yield sse_event("error", {"status": e.status_code, "detail": e.detail})
+                return
+        while True:
+            kind, payload = await queue.get()
+            if kind == "token":
+                yield sse_event("token", {"text": payload})
+            elif kind == "error":
+                err = ai_http_error(payload)
+                yield sse_event("error", {"status": err.status_code, "detail": err.detail})
+                return
             else:
-                # Fallback breakdown if AI didn't provide it
-                if readiness_score is not None:
-                    # Distribute score proportionally
-                    breakdown = {
-                        "TechnicalScore": int(readiness_score * 0.3),
-                        "CommunicationScore": int(readiness_score * 0.3),
-                        "AlignmentScore": int(readiness_score * 0.2),
-                        "RelevanceScore": readiness_score - int(readiness_score * 0.3) - int(readiness_score * 0.3) - int(readiness_score * 0.2)
-                    }
-                else:
-                    breakdown = {
-                        "TechnicalScore": 0,
-                        "CommunicationScore": 0,
-                        "AlignmentScore": 0,
-                        "RelevanceScore": 0
-                    }
-
-            # Clean up the feedback text to remove the score and breakdown lines
-            feedback_text = ai.replace("[FINISH]", "").strip()
-            if score_match:
-                feedback_text = re.sub(r"Interview Readiness Score:\s*\d+/100", "", feedback_text, flags=re.IGNORECASE).strip()
-            if breakdown_match:
-                feedback_text = re.sub(r"Breakdown:\s*Technical:\s*\d+,\s*Communication:\s*\d+,\s*Alignment:\s*\d+,\s*Relevance:\s*\d+", "", feedback_text, flags=re.IGNORECASE).strip()
-            
-            await increment_daily_limit(current["id"], "daily_interview_count")
-            await interviews.update_one(
-                {"session_id": session_id}, 
-                {
-                    "$set": {
-                        "ended_at": get_malaysia_time(),
-                        "readiness_score": readiness_score,
-                        "readiness_breakdown": breakdown,
-                        "readiness_feedback": feedback_text,
-                    }
-                }
-            )
-        return {"message": ai, "ended": True, "asked_count": asked_now, "questions_limit": limit, "score": readiness_score, "breakdown": breakdown, "feedback": feedback_text}
-    return {"message": ai, "asked_count": asked_now, "questions_limit": limit}
+                break
+        try:
+            done = await on_final(payload)
+        except HTTPException as e:
+            yield sse_event("error", {"status": e.status_code, "detail": e.detail})
+            return
+        yield sse_event("done", done)
+    finally:
+        # Client gone or turn rejected: stop generating
+        if not producer.done():
+            producer.cancel()
+
+@router.post("/start/stream")
+async def start_stream(
+    job_title: str = Form(None),
+    resume_feedback: str = Form(None),
+    questions_limit: int = Form(None),
+    difficulty: str = Form("Beginner"),
+    current=Depends(get_current_user),
+    _: None = Depends(rate_limit),
+):
+    job_title, feedback_dict, questions_limit, difficulty = await prepare_start(
+        current, job_title, resume_feedback, questions_limit, difficulty
+    )
+
+    profile = build_candidate_profile(feedback_dict)
+
+    async def on_final(turn: dict) -> dict:
+        return await create_session(current, job_title, feedback_dict, profile, questions_limit, difficulty, turn["message"])
+
+    reply_kwargs = dict(history=[], job_title=job_title, resume_feedback=profile,
+                        questions_limit=questions_limit, difficulty=difficulty, current_asked_count=0)
+    return sse_response(stream_reply_events(reply_kwargs, on_final))
+
+@router.post("/{session_id}/reply/stream")
+async def reply_stream(session_id: str, user_text: str = Form(...), current=Depends(get_current_user), _: None = Depends(rate_limit)):
+    s = await migrated_session(await interviews.find_one({"session_id": session_id, "user_id": current["id"]}))
+    if not s:
+        raise HTTPException(status_code=404, detail="Not found")
+    if s.get("ended_at"):
+        return sse_response(single_event("done", {"ended": True, "message": "Session has ended"}))
+
+    guard_task = asyncio.create_task(rag_engine.validate_input(user_text[:500]))
+    try:
+        if not INTERVIEW_SPECULATIVE_GUARDRAIL:
+            await enforce_guardrail(guard_task)
+
+        if is_gibberish(user_text, strict=False):
+            await enforce_guardrail(guard_task)
+            return sse_response(single_event("done", await handle_gibberish_turn(s, session_id, current["id"], user_text)))
+        if not await can_ask(current["id"]):
+            await enforce_guardrail(guard_task)
+            raise HTTPException(status_code=429, detail="Daily question quota reached (60 questions per day). Resets at 00:00 Malaysia Time.")
+        history = await session_history(s)
+    except BaseException:
+        # Request failed before the stream started: nothing will await the guardrail
+        guard_task.cancel()
+        raise
+    history.append({"role": "user", "content": user_text})
+
+    async def on_final(turn: dict) -> dict:
+        return await complete_turn(s, session_id, current["id"], user_text, turn)
+
+    reply_kwargs = dict(history=history, job_title=s.get("job_title", ""), resume_feedback=session_profile(s),
+                        questions_limit=s.get("questions_limit", INTERVIEW_DEFAULT_QUESTIONS),
+                        difficulty=s.get("difficulty", "Beginner"), current_asked_count=s.get("asked_count", 0),
+                        context_summary=s.get("context_summary", ""))
+    return sse_response(stream_reply_events(reply_kwargs, on_final, guard_task))
 
 @router.post("/{session_id}/end")
 async def end(session_id: str, current=Depends(get_current_user)):
     # Check if session was already ended to avoid double counting
-    s = await interviews.find_one({"session_id": session_id, "user_id": current["id"]})
+    s = await migrated_session(await interviews.find_one({"session_id": session_id, "user_id": current["id"]}))
     if s and not s.get("ended_at"):
         # Generate a final message from AI explaining why no score is given
         job_title = s.get("job_title", "")
-        resume_feedback = s.get("resume_feedback")
+        resume_feedback = session_profile(s)
         questions_limit = s.get("questions_limit", INTERVIEW_DEFAULT_QUESTIONS)
         difficulty = s.get("difficulty", "Intermediate")
         asked_count = s.get("asked_count", 0)
         
-        history = [{"role": t["role"], "content": t["text"]} for t in s.get("transcript", [])]
-        responded = any((t.get("role") == "user") and (t.get("text", "").strip()) for t in s.get("transcript", []))
+        history = await session_history(s)
+        responded = await transcript_store.has_user_turn(session_id)
         if responded:
             sys_msg = "The user has ended the interview session early. Please explain that the session is now closed. Explicitly state that because the interview was not completed, a Readiness Score cannot be generated (it will be shown as N/A). Provide brief, encouraging words about their progress so far. Be professional and polite."
         else:
@@ -320,29 +460,36 @@ async def end(session_id: str, current=Depends(get_current_user)):
         history.append({"role": "user", "content": f"[SYSTEM MESSAGE]: {sys_msg}"})
         
         # Call AI to get the explanation message
-        ai_msg = interview_reply(
+        turn = await interview_reply(
             history, 
             job_title=job_title, 
             resume_feedback=resume_feedback, 
             questions_limit=questions_limit, 
             difficulty=difficulty,
             current_asked_count=asked_count,
-            force_end=True
+            force_end=True,
+            context_summary=s.get("context_summary", "")
         )
-        ai_msg = ai_msg.replace("[FINISH]", "").strip()
+        ai_msg = turn["message"]
 
-        await increment_daily_limit(current["id"], "daily_interview_count")
-        await interviews.update_one(
-            {"session_id": session_id, "user_id": current["id"]}, 
+        # Only the request that actually closes the session counts it
+        closed = await interviews.find_one_and_update(
+            {"session_id": session_id, "user_id": current["id"], "ended_at": None, **MIGRATED},
             {
                 "$set": {
                     "ended_at": get_malaysia_time(),
                     "readiness_score": None,
                     "readiness_feedback": ai_msg
                 },
-                "$push": {"transcript": {"role": "assistant", "text": ai_msg, "at": get_malaysia_time()}}
-            }
+                "$inc": {"turn_count": 1},
+            },
+            projection={"turn_count": 1},
+            return_document=ReturnDocument.AFTER,
         )
+        if closed is None:
+            return {"ended": True, "already_ended": True}
+        await transcript_store.append(session_id, closed["turn_count"] - 1, [{"role": "assistant", "text": ai_msg, "at": get_malaysia_time()}])
+        await increment_daily_limit(current["id"], "daily_interview_count")
         return {"ended": True, "message": ai_msg}
     return {"ended": True, "already_ended": True}
 
@@ -365,20 +512,39 @@ async def reset_quota(current=Depends(get_current_user)):
     )
     return {"message": "Quotas reset successfully"}
 
+HISTORY_FIELDS = ("asked_count", "created_at", "ended_at", "readiness_score", "readiness_breakdown", "readiness_feedback")
+HISTORY_SUMMARY_FIELDS = ("asked_count", "created_at", "ended_at", "readiness_score")
+
 @router.get("/history")
-async def history(current=Depends(get_current_user)):
-    cur = interviews.find({"user_id": current["id"]}).sort("created_at", -1)
+async def history(
+    response: Response,
+    limit: int = None,
+    before: str = None,
+    summary: bool = False,
+    current=Depends(get_current_user),
+):
+    """
+    Sessions newest first. With `limit`, returns one page and sets X-Next-Cursor; pass it
+    back as `before` for the next page. `summary` drops the breakdown and feedback.
+    """
+    fields = HISTORY_SUMMARY_FIELDS if summary else HISTORY_FIELDS
+    query = {"user_id": current["id"]}
+    projection = {f: 1 for f in fields}
+    if limit:
+        try:
+            docs, next_cursor = await fetch_page(interviews, query, projection, limit, before)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+    else:
+        docs = [s async for s in interviews.find(query, projection).sort("created_at", -1)]
     items = []
-    async for s in cur:
-        items.append({
-            "id": str(s["_id"]), 
-            "asked_count": s.get("asked_count", 0), 
-            "created_at": s["created_at"], 
-            "ended_at": s.get("ended_at"),
-            "readiness_score": s.get("readiness_score"),
-            "readiness_breakdown": s.get("readiness_breakdown"),
-            "readiness_feedback": s.get("readiness_feedback")
-        })
+    for s in docs:
+        item = {"id": str(s["_id"])}
+        for f in fields:
+            item[f] = s.get(f, 0) if f == "asked_count" else s.get(f)
+        items.append(item)
     return items
 
 @router.get("/{session_id}")
@@ -386,6 +552,7 @@ async def detail(session_id: str, current=Depends(get_current_user)):
     s = await interviews.find_one({"_id": ObjectId(session_id), "user_id": current["id"]})
     if not s:
         s = await interviews.find_one({"session_id": session_id, "user_id": current["id"]})
+    s = await migrated_session(s)
     if not s:
         raise HTTPException(status_code=404, detail="Not found")
     return {
@@ -395,22 +562,32 @@ async def detail(session_id: str, current=Depends(get_current_user)):
         "questions_limit": s.get("questions_limit", INTERVIEW_DEFAULT_QUESTIONS),
         "created_at": s.get("created_at"),
         "ended_at": s.get("ended_at"),
-        "transcript": s.get("transcript", []),
+        "transcript": await transcript_store.read(s["session_id"]),
         "readiness_score": s.get("readiness_score"),
         "readiness_feedback": s.get("readiness_feedback"),
     }
 
+@router.get("/{session_id}/transcript")
+async def transcript_page(session_id: str, after: int = -1, limit: int = 50, current=Depends(get_current_user)):
+    """Transcript entries after seq `after`, oldest first; pass `next_after` back to get the next page."""
+    s = await migrated_session(await interviews.find_one(
+        {"session_id": session_id, "user_id": current["id"]}, {"_id": 1, "session_id": 1, "transcript": 1}))
+    if not s:
+        raise HTTPException(status_code=404, detail="Not found")
+    return await transcript_store.page(session_id, after=after, limit=limit)
+
 @router.delete("/{session_id}")
 async def delete_session(session_id: str, current=Depends(get_current_user)):
     try:
         oid = ObjectId(session_id)
         # Try to delete by _id
-        res = await interviews.delete_one({"_id": oid, "user_id": current["id"]})
+        res = await interviews.find_one_and_delete({"_id": oid, "user_id": current["id"]}, {"session_id": 1})
     except:
         # If not a valid ObjectId, try deleting by session_id string
-        res = await interviews.delete_one({"session_id": session_id, "user_id": current["id"]})
+        res = await interviews.find_one_and_delete({"session_id": session_id, "user_id": current["id"]}, {"session_id": 1})
         
-    if res.deleted_count == 0:
+    if res is None:
         raise HTTPException(status_code=404, detail="Interview session not found")
+    await transcript_store.delete(res["session_id"])
         
     return {"message": "Interview session deleted successfully"}
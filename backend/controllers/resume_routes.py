@@ -1,4 +1,4 @@
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Response
 from datetime import datetime, timezone, timedelta
 from bson import ObjectId
 import os
@@ -16,6 +16,7 @@ from ..services.rate_limit import rate_limit
 from ..services.utils import get_malaysia_time, is_gibberish
 from ..services.daily_limit import check_daily_limit, increment_daily_limit
 from ..services.pdf_generator import generate_resume_pdf_async
+from ..services.pagination import fetch_page
 
 router = APIRouter(prefix="/api/resume", tags=["resume"])
 
@@ -257,27 +258,54 @@ async def builder_proxy(
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Proxy Error: {str(e)}")
 
+# Never the resume text or file reference
+MY_RESUME_FIELDS = {"filename": 1, "status": 1, "created_at": 1, "tags": 1, "feedback": 1, "job_title": 1}
+MY_RESUME_SUMMARY_FIELDS = {
+    "filename": 1, "status": 1, "created_at": 1, "tags": 1, "job_title": 1,
+    "feedback.Score": 1, "feedback.ScoreBreakdown": 1,
+}
+
 @router.get("/my")
-async def my_resumes(current=Depends(get_current_user)):
+async def my_resumes(
+    response: Response,
+    limit: int = None,
+    before: str = None,
+    summary: bool = False,
+    current=Depends(get_current_user),
+):
+    """
+    Resumes newest first. With `limit`, returns one page and sets X-Next-Cursor; pass it
+    back as `before` for the next page. `summary` leaves out the full feedback.
+    """
     if current.get("role") != "user":
         raise HTTPException(status_code=403, detail="Only regular users can view their resumes")
-    cur = resumes.find({"user_id": current["id"]})
+    query = {"user_id": current["id"]}
+    projection = MY_RESUME_SUMMARY_FIELDS if summary else MY_RESUME_FIELDS
+    if limit:
+        try:
+            docs, next_cursor = await fetch_page(resumes, query, projection, limit, before)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+    else:
+        docs = [r async for r in resumes.find(query, projection).sort("created_at", -1)]
     items = []
-    async for r in cur:
+    for r in docs:
         feedback = r.get("feedback", {})
-        items.append(
-            {
-                "id": str(r["_id"]),
-                "filename": r["filename"],
-                "status": r.get("status", "pending"),
-                "created_at": r.get("created_at"),
-                "tags": r.get("tags", []),
-                "feedback": feedback,
-                "resume_score": feedback.get("Score"),
-                "resume_breakdown": feedback.get("ScoreBreakdown"),
-                "job_title": r.get("job_title", ""),
-            }
-        )
+        item = {
+            "id": str(r["_id"]),
+            "filename": r["filename"],
+            "status": r.get("status", "pending"),
+            "created_at": r.get("created_at"),
+            "tags": r.get("tags", []),
+            "resume_score": feedback.get("Score"),
+            "resume_breakdown": feedback.get("ScoreBreakdown"),
+            "job_title": r.get("job_title", ""),
+        }
+        if not summary:
+            item["feedback"] = feedback
+        items.append(item)
     return items
 
 
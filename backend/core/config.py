@@ -17,6 +17,22 @@ MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY", "")
 SESSION_MAX_QUESTIONS = 100
 DAILY_QUESTION_LIMIT = 60
 INTERVIEW_DEFAULT_QUESTIONS = int(os.getenv("INTERVIEW_DEFAULT_QUESTIONS", "10"))
+INTERVIEW_MAX_CONCURRENCY = int(os.getenv("INTERVIEW_MAX_CONCURRENCY", "8"))  # in-flight interview completions per process
+# Start the interview completion while the input guardrail is still running; a malicious verdict discards it
+INTERVIEW_SPECULATIVE_GUARDRAIL = os.getenv("INTERVIEW_SPECULATIVE_GUARDRAIL", "true").lower() == "true"
+# Transcript entries replayed verbatim each turn; older ones are folded into a rolling summary
+INTERVIEW_CONTEXT_RECENT_MESSAGES = int(os.getenv("INTERVIEW_CONTEXT_RECENT_MESSAGES", "12"))
+INTERVIEW_CONTEXT_FOLD_EVERY = int(os.getenv("INTERVIEW_CONTEXT_FOLD_EVERY", "6"))  # entries folded per summary update
+INTERVIEW_SUMMARY_MAX_CHARS = int(os.getenv("INTERVIEW_SUMMARY_MAX_CHARS", "2000"))
+# Character budget of the compact candidate profile derived from the resume analysis
+INTERVIEW_PROFILE_MAX_CHARS = int(os.getenv("INTERVIEW_PROFILE_MAX_CHARS", "900"))
+# Cached opening/closing interview replies: in-memory LRU entries and TTL (seconds, shared with disk)
+INTERVIEW_RESPONSE_CACHE_SIZE = int(os.getenv("INTERVIEW_RESPONSE_CACHE_SIZE", "512"))
+INTERVIEW_RESPONSE_CACHE_TTL = int(os.getenv("INTERVIEW_RESPONSE_CACHE_TTL", "1800"))
+# Open sessions without a turn for this long are closed by the background reaper
+INTERVIEW_IDLE_TIMEOUT_MINUTES = int(os.getenv("INTERVIEW_IDLE_TIMEOUT_MINUTES", "60"))
+INTERVIEW_REAPER_INTERVAL = float(os.getenv("INTERVIEW_REAPER_INTERVAL", "300"))  # seconds between reaper passes
+INTERVIEW_REAPER_BATCH = int(os.getenv("INTERVIEW_REAPER_BATCH", "200"))  # sessions closed per update_many
 RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", "30"))
 SUPERADMIN_EMAIL = os.getenv("SUPERADMIN_EMAIL", "")
 SUPERADMIN_PASSWORD = os.getenv("SUPERADMIN_PASSWORD", "")
@@ -51,3 +67,30 @@ FORGOT_PASSWORD_EMAILJS_ACCESS_TOKEN = os.getenv("FORGOT_PASSWORD_EMAILJS_ACCESS
 # Careerjet Configuration
 CAREERJET_API_KEY = os.getenv("CAREERJET_API_KEY", "")
 CAREERJET_WIDGET_ID = os.getenv("CAREERJET_WIDGET_ID", "")
+
+# RAG Engine
+RAG_INDEX_DIR = os.getenv("RAG_INDEX_DIR", "backend/data/rag_index")
+RAG_MAX_CONCURRENCY = int(os.getenv("RAG_MAX_CONCURRENCY", "8"))
+RAG_EMBED_BATCH_WINDOW_MS = float(os.getenv("RAG_EMBED_BATCH_WINDOW_MS", "5"))
+RAG_EMBED_MAX_BATCH = int(os.getenv("RAG_EMBED_MAX_BATCH", "32"))
+# Vector search: "exact" (brute force), "ivf" (approximate), or "auto" (ivf from RAG_ANN_MIN_CHUNKS up)
+RAG_INDEX_MODE = os.getenv("RAG_INDEX_MODE", "auto").lower()
+RAG_ANN_MIN_CHUNKS = int(os.getenv("RAG_ANN_MIN_CHUNKS", "5000"))
+RAG_IVF_LISTS = int(os.getenv("RAG_IVF_LISTS", "0"))  # 0 = ~sqrt(number of chunks)
+RAG_IVF_NPROBE = int(os.getenv("RAG_IVF_NPROBE", "8"))  # clusters scanned per query: higher = better recall, slower
+RAG_CHUNK_TOKENS = int(os.getenv("RAG_CHUNK_TOKENS", "200"))  # token budget per chunk (heading included)
+RAG_CHUNK_OVERLAP = int(os.getenv("RAG_CHUNK_OVERLAP", "30"))  # tokens repeated between consecutive chunks of a section
+RAG_CRAG_CACHE_TTL = int(os.getenv("RAG_CRAG_CACHE_TTL", str(7 * 86400)))  # seconds a CRAG verdict is reused
+# Skip the CRAG grading call when every retrieved chunk's cosine similarity to the query is at
+# least this high (> 1 = never skip). mistral-embed cosines run high: off-topic pairs often land
+# around 0.6-0.75, so calibrate from the min_cosine logged with each crag_evaluation verdict and
+# keep this above the cosines of chunks the grader rejected.
+RAG_CRAG_SKIP_COSINE = float(os.getenv("RAG_CRAG_SKIP_COSINE", "0.85"))
+# Local input guardrail: highest predicted P(unsafe) accepted without the LLM check
+RAG_GUARDRAIL_SAFE_THRESHOLD = float(os.getenv("RAG_GUARDRAIL_SAFE_THRESHOLD", "0.1"))
+RAG_WATCH_INTERVAL = float(os.getenv("RAG_WATCH_INTERVAL", "0"))  # seconds between corpus checks; 0 = off
+
+# Audit log write-behind queue
+AUDIT_QUEUE_MAX = int(os.getenv("AUDIT_QUEUE_MAX", "10000"))  # events held in memory; further events are dropped
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))  # documents per insert_many
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))  # seconds between flushes
@@ -9,6 +9,10 @@ pending_users = db["pending_users"]
 reset_tokens = db["reset_tokens"]
 resumes = db["resumes"]
 interviews = db["interviews"]
+# One document per transcript entry, see services/transcript_store.py
+interview_turns = db["interview_turns"]
 usage = db["usage"]
 audit_logs = db["audit_logs"]
+# Applied data migrations, see services/db_maintenance.py
+migrations = db["migrations"]
 fs = AsyncIOMotorGridFSBucket(db, bucket_name="resume_files")
@@ -0,0 +1,79 @@
+"""
+Declarative MongoDB index registry.
+
+Every index the application relies on is listed here per collection and applied
+at startup by services/db_maintenance.py. Names are explicit so that a changed
+definition is reported as drift instead of silently creating a second index.
+Options supported: unique, expireAfterSeconds, partialFilterExpression.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+ASC, DESC = 1, -1
+
+INDEXES: Dict[str, List[Dict[str, Any]]] = {
+    "users": [
+        # Login, registration and password reset look users up by email
+        {"name": "email_1", "keys": [("email", ASC)]},
+        {"name": "role_1", "keys": [("role", ASC)]},
+    ],
+    "pending_users": [
+        {"name": "email_1", "keys": [("email", ASC)]},
+        # Unverified registrations expire after 15 minutes
+        {"name": "created_at_1", "keys": [("created_at", ASC)], "expireAfterSeconds": 900},
+    ],
+    "reset_tokens": [
+        {"name": "token_1", "keys": [("token", ASC)]},
+        {"name": "email_1", "keys": [("email", ASC)]},
+        # Removed as soon as expires_at passes
+        {"name": "expires_at_1", "keys": [("expires_at", ASC)], "expireAfterSeconds": 0},
+    ],
+    "resumes": [
+        # /api/resume/my pages, latest resume lookup and per-user counts
+        {"name": "user_created", "keys": [("user_id", ASC), ("created_at", DESC), ("_id", DESC)]},
+    ],
+    "interviews": [
+        {"name": "session_id_1", "keys": [("session_id", ASC)], "unique": True},
+        # /api/interview/history pages
+        {"name": "user_created", "keys": [("user_id", ASC), ("created_at", DESC), ("_id", DESC)]},
+        # Idle session reaper; only open sessions are indexed
+        {"name": "open_last_activity", "keys": [("last_activity_at", ASC)],
+         "partialFilterExpression": {"ended_at": {"$type": "null"}}},
+    ],
+    "interview_turns": [
+        {"name": "session_seq", "keys": [("session_id", ASC), ("seq", ASC)], "unique": True},
+    ],
+    "audit_logs": [
+        {"name": "timestamp_-1", "keys": [("timestamp", DESC)]},
+        # Guardrail training reads recent events of one type
+        {"name": "event_timestamp", "keys": [("event_type", ASC), ("timestamp", DESC)]},
+    ],
+}
+
+
+def find_index(collection: str, equality: Sequence[str] = (), sort: Sequence[Tuple[str, int]] = (),
+               partial: Optional[Dict[str, Any]] = None,
+               registry: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> Optional[str]:
+    """
+    Name of a registered index that serves a query with equality filters on `equality`
+    followed by `sort` (or by a range on the first sort field), or None when the query
+    would need a collection scan or an in-memory sort. Follows the planner's prefix rule:
+    equality fields in any order first, then the sort fields in index order or fully reversed.
+    Partial indexes only count for queries that include their filter, passed as `partial`.
+    """
+    registry = INDEXES if registry is None else registry
+    want = set(equality)
+    for spec in registry.get(collection, []):
+        if spec.get("partialFilterExpression") not in (None, partial):
+            continue
+        keys = list(spec["keys"])
+        head = {field for field, _ in keys[:len(want)]}
+        if head != want:
+            continue
+        rest = keys[len(want):len(want) + len(sort)]
+        if len(rest) < len(sort):
+            continue
+        forward = all(f == sf and d == sd for (f, d), (sf, sd) in zip(rest, sort))
+        backward = all(f == sf and d == -sd for (f, d), (sf, sd) in zip(rest, sort))
+        if forward or backward:
+            return spec["name"]
+    return None
@@ -40,8 +40,12 @@ from .controllers.admin_routes import router as admin_router
 from .controllers.job_routes import router as job_router
 from .controllers.assist_routes import router as assist_router
 from .services.rag_engine import rag_engine
+from .services.telemetry import audit_writer
+from .services.db_maintenance import run_db_maintenance
+from .services.session_reaper import session_reaper
 from .services.utils import get_malaysia_time
-from .core.db import interviews, pending_users, reset_tokens, client
+from .core.db import client
+from .core.config import RAG_WATCH_INTERVAL
 import os
 import logging
 
@@ -119,6 +123,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cursor of the next page on paginated list endpoints
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(auth_router)
@@ -167,26 +173,29 @@ async def startup():
     except Exception as e:
         print(f"CRITICAL: Failed to connect to MongoDB: {e}")
 
-    # Create TTL index for pending_users (expires after 15 minutes)
-    try:
-        await pending_users.create_index("created_at", expireAfterSeconds=900)
-    except Exception as e:
-        print(f"Error creating TTL index for pending_users: {e}")
+    # Declared indexes (including the TTL ones) and pending data migrations, off the boot path
+    app.state.db_maintenance = asyncio.create_task(run_db_maintenance())
 
-    # Create TTL index for reset_tokens (expires at the specific time in expires_at)
-    try:
-        await reset_tokens.create_index("expires_at", expireAfterSeconds=0)
-    except Exception as e:
-        print(f"Error creating TTL index for reset_tokens: {e}")
+    # Batch audit log writes in the background instead of one insert per event
+    audit_writer.start()
 
     # Initialize RAG Engine during startup
     rag_engine.initialize()
-    try:
-        await interviews.update_many({"ended_at": None}, {"$set": {"ended_at": get_malaysia_time()}})
-    except Exception:
-        pass
+    # Fit the local input guardrail on logged validations without delaying startup
+    app.state.guardrail_training = asyncio.create_task(rag_engine.train_guardrail())
+    if RAG_WATCH_INTERVAL > 0:
+        # Hot-reload the corpus when files in the docs directory change
+        app.state.rag_watcher = asyncio.create_task(rag_engine.watch_corpus(RAG_WATCH_INTERVAL))
+    # Close sessions abandoned mid-interview; active ones survive restarts
+    session_reaper.start()
     app.state.startup_id = str(get_malaysia_time().timestamp())
 
+@app.on_event("shutdown")
+async def shutdown():
+    await session_reaper.stop()
+    # Write out any audit events still waiting in the queue
+    await audit_writer.stop()
+
 @app.get("/api/meta/startup_id")
 async def startup_id():
     return {"startup_id": getattr(app.state, "startup_id", "")}
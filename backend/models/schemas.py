@@ -74,6 +74,7 @@ class ResumeRecord(BaseModel):
     created_at: datetime
 
 class InterviewTurn(BaseModel):
+    seq: int
     role: str
     text: str
     at: datetime
@@ -83,7 +84,8 @@ class InterviewSession(BaseModel):
     user_id: str
     questions_limit: int
     asked_count: int
-    transcript: List[InterviewTurn]
+    # Entries are stored separately as InterviewTurn documents
+    turn_count: int = 0
     created_at: datetime
     ended_at: Optional[datetime] = None
 
@@ -0,0 +1,100 @@
+"""
+IVF (inverted file) approximate nearest-neighbour index in NumPy.
+
+Chunk embeddings are grouped into `n_lists` clusters with spherical k-means at
+build time. A query is compared against the centroids only, and exact scores
+are then computed for the rows of the `n_probe` closest clusters. `n_probe` is
+the recall/latency knob: n_probe == n_lists is an exact search, small values
+scan a fraction of the corpus.
+
+The index is persisted next to the embedding store and tagged with the corpus
+version, so a stale index is rebuilt instead of being served.
+"""
+import os
+from typing import Optional
+
+import numpy as np
+
+INDEX_FILE = "ivf_index.npz"
+
+
+class IVFIndex:
+    def __init__(self, centroids: np.ndarray, list_offsets: np.ndarray, list_rows: np.ndarray):
+        # Rows are stored grouped by cluster (CSR layout):
+        # rows of cluster c are list_rows[list_offsets[c]:list_offsets[c + 1]]
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_rows = list_rows
+
+    @property
+    def n_lists(self) -> int:
+        return self.centroids.shape[0]
+
+    @classmethod
+    def build(cls, matrix: np.ndarray, n_lists: int = 0, n_iter: int = 10, seed: int = 0) -> "IVFIndex":
+        """Clusters unit-length rows with spherical k-means. n_lists=0 picks ~sqrt(n)."""
+        n = matrix.shape[0]
+        if n_lists <= 0:
+            n_lists = int(np.sqrt(n))
+        n_lists = max(1, min(n_lists, n))
+
+        rng = np.random.default_rng(seed)
+        centroids = np.array(matrix[rng.choice(n, n_lists, replace=False)], dtype=np.float32)
+        assign = np.zeros(n, dtype=np.int64)
+        for _ in range(n_iter):
+            assign = np.argmax(matrix @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, matrix)
+            counts = np.bincount(assign, minlength=n_lists)
+            empty = counts == 0
+            if empty.any():
+                # Re-seed empty clusters from random rows so every list stays useful
+                sums[empty] = matrix[rng.choice(n, int(empty.sum()), replace=False)]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+        assign = np.argmax(matrix @ centroids.T, axis=1)
+
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=n_lists)
+        offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(centroids, offsets, order.astype(np.int64))
+
+    def candidates(self, query: np.ndarray, n_probe: int) -> np.ndarray:
+        """Row ids in the n_probe clusters whose centroids are closest to the query."""
+        n_probe = max(1, min(n_probe, self.n_lists))
+        centroid_scores = self.centroids @ query
+        if n_probe < self.n_lists:
+            probe = np.argpartition(centroid_scores, -n_probe)[-n_probe:]
+        else:
+            probe = np.arange(self.n_lists)
+        return np.concatenate(
+            [self.list_rows[self.list_offsets[c]:self.list_offsets[c + 1]] for c in probe]
+        )
+
+    def save(self, store_dir: str, corpus_version: str):
+        os.makedirs(store_dir, exist_ok=True)
+        tmp = os.path.join(store_dir, INDEX_FILE + ".tmp.npz")
+        np.savez(
+            tmp,
+            centroids=self.centroids,
+            list_offsets=self.list_offsets,
+            list_rows=self.list_rows,
+            corpus_version=np.array(corpus_version),
+        )
+        os.replace(tmp, os.path.join(store_dir, INDEX_FILE))
+
+    @classmethod
+    def load(cls, store_dir: str, corpus_version: str, n_lists: int = 0) -> Optional["IVFIndex"]:
+        """Returns the persisted index if it was built for this corpus (and list count), else None."""
+        try:
+            with np.load(os.path.join(store_dir, INDEX_FILE)) as data:
+                if str(data["corpus_version"]) != corpus_version:
+                    return None
+                index = cls(data["centroids"], data["list_offsets"], data["list_rows"])
+        except (OSError, KeyError, ValueError):
+            return None
+        if n_lists > 0 and index.n_lists != n_lists:
+            return None
+        return index
@@ -4,6 +4,7 @@ from ..core.db import audit_logs, users
 from ..core.config import ADMIN_ALLOWLIST
 from .email_service import send_admin_alert
 from .utils import get_malaysia_time
+from .telemetry import audit_writer
 import logging
 
 # Configure logging for console alerts
@@ -28,7 +29,9 @@ async def log_event(
         "details": details or {},
         "timestamp": get_malaysia_time()
     }
-    await audit_logs.insert_one(log_doc)
+    # Queued for a batched write; direct insert when the writer is not running
+    if not audit_writer.submit(log_doc):
+        await audit_logs.insert_one(log_doc)
     
     if status == "failure":
         logger.warning(f"SECURITY ALERT: {event_type} failed for {email} from IP {ip_address}")
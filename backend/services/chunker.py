@@ -0,0 +1,241 @@
+"""
+Structure-aware, token-bounded chunker for the RAG corpus.
+
+Documents are first split into sections at headings (Markdown `#` lines,
+short ALL-CAPS lines, short lines ending in a colon, or lines underlined with
+`===`/`---`). Within a section, paragraphs are packed greedily up to a token
+budget; a paragraph that is too large on its own is split into sentences, and a
+sentence that is still too large into word windows. Consecutive chunks of the
+same section share a small overlap (trailing units, or the last sentences or
+words of a unit too large to carry whole), and every chunk is prefixed with its
+section heading so it stays self-describing.
+
+Chunk metadata (source file, character offsets, token count) is kept in
+parallel NumPy arrays aligned with the chunk list rather than per-chunk dicts.
+"""
+import re
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Rough sub-word proxy: every word and every punctuation mark counts as a token
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_PARAGRAPH_RE = re.compile(r"[^\n]*\S[^\n]*(?:\n[^\n]*\S[^\n]*)*")
+_SENTENCE_RE = re.compile(r"[^.!?\n]+(?:[.!?]+[\"')\]]*|(?=\n)|$)|[.!?]+")
+_WORD_RE = re.compile(r"\S+")
+_UNDERLINE_RE = re.compile(r"^\s*(=+|-+)\s*$")
+
+Span = Tuple[int, int]
+
+
+def count_tokens(text: str) -> int:
+    """Approximate token count used for chunk budgets."""
+    return len(_TOKEN_RE.findall(text))
+
+
+def _is_heading(line: str) -> bool:
+    stripped = line.strip()
+    if not stripped or len(stripped) > 80:
+        return False
+    if stripped.startswith("#"):
+        return True
+    if stripped[0] in "-*•":
+        # Bullet items ("- Tip:") belong to their list, not a new section
+        return False
+    letters = [c for c in stripped if c.isalpha()]
+    if len(letters) >= 3 and all(c.isupper() for c in letters) and not stripped.endswith("."):
+        return True
+    return stripped.endswith(":") and len(stripped.split()) <= 8
+
+
+def _heading_text(line: str) -> str:
+    return line.strip().lstrip("#").strip().rstrip(":").strip()
+
+
+class ChunkSet:
+    """Chunk texts plus metadata as parallel arrays (row i describes chunk i)."""
+
+    def __init__(
+        self,
+        texts: List[str],
+        sources: List[str],
+        source_ids: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        token_counts: np.ndarray,
+    ):
+        self.texts = texts
+        # File names; source_ids index into this list
+        self.sources = sources
+        self.source_ids = source_ids
+        # Character offsets of the chunk body within its source file
+        self.starts = starts
+        self.ends = ends
+        self.token_counts = token_counts
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def source_of(self, i: int) -> str:
+        return self.sources[int(self.source_ids[i])]
+
+
+class Chunker:
+    def __init__(self, max_tokens: int = 200, overlap_tokens: int = 30, min_tokens: int = 10):
+        self.max_tokens = max(16, max_tokens)
+        # Overlap must leave room for new content in every chunk
+        self.overlap_tokens = max(0, min(overlap_tokens, self.max_tokens // 2))
+        self.min_tokens = max(1, min_tokens)
+
+    def chunk_documents(self, documents: List[Tuple[str, str]]) -> ChunkSet:
+        """Chunks [(source name, text), ...] into one ChunkSet."""
+        texts: List[str] = []
+        source_ids: List[int] = []
+        starts: List[int] = []
+        ends: List[int] = []
+        tokens: List[int] = []
+        sources = [name for name, _ in documents]
+
+        for source_id, (_, text) in enumerate(documents):
+            for chunk_text, (start, end), n_tokens in self._chunk_text(text):
+                texts.append(chunk_text)
+                source_ids.append(source_id)
+                starts.append(start)
+                ends.append(end)
+                tokens.append(n_tokens)
+
+        return ChunkSet(
+            texts,
+            sources,
+            np.asarray(source_ids, dtype=np.int32),
+            np.asarray(starts, dtype=np.int64),
+            np.asarray(ends, dtype=np.int64),
+            np.asarray(tokens, dtype=np.int32),
+        )
+
+    def _chunk_text(self, text: str) -> List[Tuple[str, Span, int]]:
+        chunks = []
+        for heading, body_start, body_end in self._sections(text):
+            heading_tokens = count_tokens(heading) if heading else 0
+            budget = max(8, self.max_tokens - heading_tokens)
+            units = self._units(text, body_start, body_end, budget)
+            for start, end in self._pack(text, units, budget):
+                body = text[start:end]
+                n_tokens = count_tokens(body)
+                if n_tokens < self.min_tokens:
+                    continue
+                chunk_text = f"{heading}\n{body}" if heading else body
+                chunks.append((chunk_text, (start, end), n_tokens + heading_tokens))
+        return chunks
+
+    def _sections(self, text: str) -> List[Tuple[Optional[str], int, int]]:
+        """[(heading, body start, body end)] in document order."""
+        sections = []
+        heading: Optional[str] = None
+        body_start = 0
+        lines = text.splitlines(keepends=True)
+        offset = 0
+        for i, line in enumerate(lines):
+            next_line = lines[i + 1] if i + 1 < len(lines) else ""
+            underlined = bool(line.strip()) and bool(_UNDERLINE_RE.match(next_line))
+            if underlined or (_is_heading(line) and not _UNDERLINE_RE.match(line)):
+                sections.append((heading, body_start, offset))
+                heading = _heading_text(line)
+                body_start = offset + len(line)
+                if underlined:
+                    body_start += len(next_line)
+            offset += len(line)
+        sections.append((heading, body_start, len(text)))
+        return [s for s in sections if s[2] > s[1] and text[s[1]:s[2]].strip()]
+
+    def _units(self, text: str, start: int, end: int, budget: int) -> List[Tuple[Span, int]]:
+        """Paragraph spans, split further into sentences/word windows when over budget."""
+        units = []
+        for para in _PARAGRAPH_RE.finditer(text, start, end):
+            if _UNDERLINE_RE.match(para.group()):
+                continue
+            span = (para.start(), para.end())
+            n = count_tokens(para.group())
+            if n <= budget:
+                units.append((span, n))
+                continue
+            for sent in _SENTENCE_RE.finditer(text, *span):
+                if not sent.group().strip():
+                    continue
+                s_span = (sent.start() + len(sent.group()) - len(sent.group().lstrip()), sent.end())
+                s_n = count_tokens(sent.group())
+                if s_n <= budget:
+                    units.append((s_span, s_n))
+                else:
+                    units.extend(self._word_windows(text, s_span, budget))
+        return units
+
+    def _word_windows(self, text: str, span: Span, budget: int) -> List[Tuple[Span, int]]:
+        windows = []
+        words = list(_WORD_RE.finditer(text, *span))
+        i = 0
+        while i < len(words):
+            n = 0
+            j = i
+            while j < len(words):
+                w = count_tokens(words[j].group())
+                if n and n + w > budget:
+                    break
+                n += w
+                j += 1
+            windows.append(((words[i].start(), words[j - 1].end()), n))
+            i = j
+        return windows
+
+    def _pack(self, text: str, units: List[Tuple[Span, int]], budget: int) -> List[Span]:
+        """Greedy packing of consecutive units, carrying a token overlap between chunks."""
+        spans = []
+        current: List[Tuple[Span, int]] = []
+        size = 0
+        for unit in units:
+            if current and size + unit[1] > budget:
+                spans.append((current[0][0][0], current[-1][0][1]))
+                # Carry the tail of the chunk that fits in the overlap budget and next to `unit`
+                allowance = min(self.overlap_tokens, budget - unit[1])
+                carried: List[Tuple[Span, int]] = []
+                carried_size = 0
+                for i in range(len(current) - 1, -1, -1):
+                    prev = current[i]
+                    if i > 0 and carried_size + prev[1] <= allowance:
+                        carried.insert(0, prev)
+                        carried_size += prev[1]
+                        continue
+                    # Too large to carry whole (e.g. a long paragraph): carry its last sentences or words
+                    tail = self._tail(text, prev[0], allowance - carried_size)
+                    if tail is not None:
+                        carried.insert(0, tail)
+                        carried_size += tail[1]
+                    break
+                current, size = carried, carried_size
+            current.append(unit)
+            size += unit[1]
+        if current:
+            spans.append((current[0][0][0], current[-1][0][1]))
+        return spans
+
+    def _tail(self, text: str, span: Span, max_tokens: int) -> Optional[Tuple[Span, int]]:
+        """Longest proper suffix of `span` within `max_tokens`: whole sentences, else whole words."""
+        if max_tokens <= 0:
+            return None
+        start, n = span[1], 0
+        for sent in reversed([m for m in _SENTENCE_RE.finditer(text, *span) if m.group().strip()]):
+            s_n = count_tokens(sent.group())
+            if n + s_n > max_tokens:
+                break
+            start = sent.start() + len(sent.group()) - len(sent.group().lstrip())
+            n += s_n
+        if n == 0:
+            for word in reversed(list(_WORD_RE.finditer(text, *span))):
+                w = count_tokens(word.group())
+                if n + w > max_tokens:
+                    break
+                start = word.start()
+                n += w
+        if n == 0 or start <= span[0]:
+            return None
+        return (start, span[1]), n
@@ -0,0 +1,162 @@
+"""
+Startup database maintenance: index registry and one-off data migrations.
+
+Runs as a background task after boot, so neither step delays serving requests:
+1. apply_indexes creates every index declared in core/indexes.py that is missing
+   and reports drift (same name, different keys or options) and unmanaged indexes.
+   Drifted indexes are never dropped automatically; that is left to an operator.
+2. run_migrations applies each registered migration once across all workers.
+   A migration is claimed by inserting its name into the `migrations` collection;
+   a claim left "running" longer than MIGRATION_STALE_AFTER is taken over, a failed
+   one is released so the next boot retries it. Requests do not wait for them:
+   interview routes migrate a legacy session themselves on first use (see
+   migrated_session in controllers/interview_routes.py).
+"""
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+from pymongo.errors import DuplicateKeyError
+from ..core.db import db, migrations
+from ..core.indexes import INDEXES
+from .transcript_store import transcript_store
+from .utils import get_malaysia_time
+
+INDEX_OPTIONS = ("unique", "expireAfterSeconds", "partialFilterExpression")
+MIGRATION_STALE_AFTER = timedelta(hours=1)
+
+
+def _keys(keys) -> List[Tuple[str, int]]:
+    # index_information() reports directions as floats
+    return [(field, int(direction)) for field, direction in keys]
+
+
+def index_drift(existing: Dict[str, Any], spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Differences between an index as reported by index_information() and its declaration."""
+    diff = {}
+    if _keys(existing.get("key", [])) != _keys(spec["keys"]):
+        diff["keys"] = {"declared": _keys(spec["keys"]), "actual": _keys(existing.get("key", []))}
+    for opt in INDEX_OPTIONS:
+        declared, actual = spec.get(opt), existing.get(opt)
+        if opt == "unique":
+            declared, actual = bool(declared), bool(actual)
+        if declared != actual:
+            diff[opt] = {"declared": declared, "actual": actual}
+    return diff
+
+
+async def apply_indexes(database=db, registry=INDEXES) -> Dict[str, Any]:
+    """Creates missing indexes; returns created / drift / unmanaged / errors."""
+    report: Dict[str, Any] = {"created": [], "drift": [], "unmanaged": [], "errors": []}
+    for coll_name, specs in registry.items():
+        col = database[coll_name]
+        try:
+            existing = await col.index_information()
+        except Exception as e:
+            report["errors"].append({"index": coll_name, "error": str(e)})
+            continue
+        for spec in specs:
+            label = f"{coll_name}.{spec['name']}"
+            current = existing.get(spec["name"])
+            if current is not None:
+                diff = index_drift(current, spec)
+                if diff:
+                    report["drift"].append({"index": label, "diff": diff})
+                continue
+            options = {opt: spec[opt] for opt in INDEX_OPTIONS if opt in spec}
+            try:
+                await col.create_index(spec["keys"], name=spec["name"], **options)
+                report["created"].append(label)
+            except Exception as e:
+                # Typically the same keys already indexed under another name
+                report["errors"].append({"index": label, "error": str(e)})
+        declared = {spec["name"] for spec in specs}
+        report["unmanaged"].extend(
+            f"{coll_name}.{name}" for name in existing if name != "_id_" and name not in declared
+        )
+    return report
+
+
+async def _move_embedded_transcripts():
+    return {"sessions": await transcript_store.migrate_embedded(db["interviews"])}
+
+
+async def _backfill_last_activity():
+    # Sessions opened before last_activity_at existed count as active since creation
+    res = await db["interviews"].update_many(
+        {"ended_at": {"$type": "null"}, "last_activity_at": {"$exists": False}},
+        [{"$set": {"last_activity_at": "$created_at"}}],
+    )
+    return {"sessions": res.modified_count}
+
+
+# Applied in order, each exactly once; never rename or reorder an entry once released
+MIGRATIONS: List[Tuple[str, Callable[[], Awaitable[Any]]]] = [
+    ("0001_interview_turns", _move_embedded_transcripts),
+    ("0002_interview_last_activity", _backfill_last_activity),
+]
+
+
+async def _claim(collection, name: str) -> bool:
+    now = get_malaysia_time()
+    try:
+        await collection.insert_one({"_id": name, "status": "running", "started_at": now})
+        return True
+    except DuplicateKeyError:
+        pass
+    # Applied already, running elsewhere, or abandoned by a worker that died mid-run
+    taken = await collection.find_one_and_update(
+        {"_id": name, "status": "running", "started_at": {"$lt": now - MIGRATION_STALE_AFTER}},
+        {"$set": {"started_at": now}},
+    )
+    return taken is not None
+
+
+async def run_migrations(collection=migrations, registry=MIGRATIONS) -> Dict[str, Any]:
+    """Runs pending migrations in order; stops at the first failure since later ones may depend on it."""
+    report: Dict[str, Any] = {"applied": [], "skipped": [], "failed": None}
+    for name, fn in registry:
+        if not await _claim(collection, name):
+            report["skipped"].append(name)
+            continue
+        try:
+            result = await fn()
+        except Exception as e:
+            await collection.delete_one({"_id": name, "status": "running"})
+            report["failed"] = {"migration": name, "error": str(e)}
+            break
+        await collection.update_one(
+            {"_id": name},
+            {"$set": {"status": "done", "finished_at": get_malaysia_time(), "result": result}},
+        )
+        report["applied"].append(name)
+    return report
+
+
+_last_report: Dict[str, Any] = {"status": "pending"}
+
+
+async def run_db_maintenance() -> Dict[str, Any]:
+    """Indexes first (migrations rely on the unique ones), then migrations."""
+    global _last_report
+    _last_report = {"status": "running", "started_at": get_malaysia_time()}
+    try:
+        indexes = await apply_indexes()
+        applied = await run_migrations()
+    except Exception as e:
+        print(f"Database maintenance failed: {e}")
+        _last_report = {"status": "failed", "error": str(e)}
+        return _last_report
+    _last_report = {"status": "done", "finished_at": get_malaysia_time(), "indexes": indexes, "migrations": applied}
+    if indexes["created"]:
+        print(f"Created indexes: {', '.join(indexes['created'])}")
+    for item in indexes["drift"]:
+        print(f"INDEX DRIFT: {item['index']} differs from its declaration: {item['diff']}")
+    for item in indexes["errors"]:
+        print(f"Index error on {item['index']}: {item['error']}")
+    if applied["failed"]:
+        print(f"Migration {applied['failed']['migration']} failed: {applied['failed']['error']}")
+    return _last_report
+
+
+def get_stats() -> Dict[str, Any]:
+    """Outcome of the last maintenance run."""
+    return _last_report
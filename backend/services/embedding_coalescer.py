@@ -0,0 +1,88 @@
+"""
+Micro-batching coalescer for query embeddings.
+
+Concurrent callers that ask for an embedding within a short window (a few
+milliseconds) are grouped into one `embeddings.create(inputs=[...])` request,
+up to a maximum batch size, and each caller gets its own row back. Under
+burst load this turns N single-input API calls into a handful of batched ones.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+class EmbeddingCoalescer:
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], Awaitable[np.ndarray]],
+        window_ms: float = 5.0,
+        max_batch: int = 32,
+    ):
+        self.embed_batch = embed_batch
+        self.window = max(0.0, window_ms) / 1000.0
+        self.max_batch = max(1, max_batch)
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats = {"requests": 0, "batches": 0, "largest_batch": 0}
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Queues `text` for the next batch and waits for its embedding row."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A new event loop (e.g. worker restart in tests): nothing pending carries over
+            self._pending = []
+            self._timer = None
+            self._loop = loop
+
+        fut = loop.create_future()
+        self._pending.append((text, fut))
+        self.stats["requests"] += 1
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await fut
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = self._loop.create_task(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]):
+        # Identical texts in the same window share one input slot
+        slots: Dict[str, int] = {}
+        for text, _ in batch:
+            slots.setdefault(text, len(slots))
+
+        self.stats["batches"] += 1
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(slots))
+        try:
+            vectors = await self.embed_batch(list(slots))
+            if len(vectors) != len(slots):
+                raise RuntimeError(f"Embedding batch returned {len(vectors)} rows for {len(slots)} inputs")
+            for text, fut in batch:
+                if not fut.done():
+                    fut.set_result(vectors[slots[text]])
+        except asyncio.CancelledError:
+            for _, fut in batch:
+                fut.cancel()
+            raise
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+        finally:
+            # No caller is ever left waiting, whatever interrupted the fan-out
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(RuntimeError("Embedding batch was interrupted"))
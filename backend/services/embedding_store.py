@@ -0,0 +1,100 @@
+"""
+Persistent, content-addressed embedding store for the RAG engine.
+
+Chunk embeddings are kept on disk as a float32 `.npy` matrix next to a JSON
+manifest that lists the content hash of the chunk in each row. On start-up the
+matrix is memory-mapped and rows are looked up by hash, so unchanged chunks
+cost zero embedding calls; only new or edited chunks are sent to the API.
+"""
+import hashlib
+import json
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+MANIFEST_FILE = "manifest.json"
+MATRIX_FILE = "embeddings.npy"
+
+
+def content_hash(chunk: str) -> str:
+    """Stable identifier of a chunk's text."""
+    return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    def __init__(self, store_dir: str, model: str):
+        self.store_dir = store_dir
+        self.model = model
+        self.manifest_path = os.path.join(store_dir, MANIFEST_FILE)
+        self.matrix_path = os.path.join(store_dir, MATRIX_FILE)
+        # Counters from the last resolve() call
+        self.last_reused = 0
+        self.last_embedded = 0
+
+    def load(self) -> Tuple[Dict[str, int], Optional[np.ndarray]]:
+        """Returns ({hash: row}, memory-mapped matrix) or ({}, None) when nothing usable is stored."""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("model") != self.model:
+                return {}, None
+            matrix = np.load(self.matrix_path, mmap_mode="r")
+            hashes = manifest.get("hashes", [])
+            if matrix.ndim != 2 or matrix.shape[0] != len(hashes):
+                return {}, None
+            return {h: row for row, h in enumerate(hashes)}, matrix
+        except (OSError, ValueError):
+            return {}, None
+
+    def save(self, hashes: List[str], matrix: np.ndarray):
+        """Writes matrix + manifest atomically (temp file, then rename)."""
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp_matrix = self.matrix_path + ".tmp.npy"
+        tmp_manifest = self.manifest_path + ".tmp"
+        np.save(tmp_matrix, np.ascontiguousarray(matrix, dtype=np.float32))
+        with open(tmp_manifest, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model, "dim": int(matrix.shape[1]), "hashes": hashes}, f)
+        os.replace(tmp_matrix, self.matrix_path)
+        os.replace(tmp_manifest, self.manifest_path)
+
+    def resolve(
+        self,
+        chunks: List[str],
+        embed_fn: Callable[[List[str]], np.ndarray],
+        batch_size: int = 32,
+    ) -> np.ndarray:
+        """
+        Returns the embedding matrix for `chunks` (row i = chunk i).
+        Stored rows are reused by content hash; only missing chunks go through
+        `embed_fn`, in batches. If the store already matches the chunk list
+        exactly, the memory-mapped matrix is returned as-is.
+        """
+        hashes = [content_hash(c) for c in chunks]
+        row_of, stored = self.load()
+
+        missing = [i for i, h in enumerate(hashes) if h not in row_of]
+        self.last_reused = len(chunks) - len(missing)
+        self.last_embedded = len(missing)
+
+        if stored is not None and not missing and [row_of[h] for h in hashes] == list(range(stored.shape[0])):
+            return stored
+
+        fresh: Dict[str, np.ndarray] = {}
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            vectors = embed_fn([chunks[i] for i in batch])
+            for i, vec in zip(batch, vectors):
+                fresh[hashes[i]] = vec
+
+        dim = stored.shape[1] if stored is not None else len(next(iter(fresh.values())))
+        matrix = np.empty((len(chunks), dim), dtype=np.float32)
+        for i, h in enumerate(hashes):
+            matrix[i] = fresh[h] if h in fresh else stored[row_of[h]]
+        del stored
+
+        try:
+            self.save(hashes, matrix)
+        except OSError as e:
+            print(f"Warning: Could not persist RAG embeddings to {self.store_dir}: {e}")
+        return matrix
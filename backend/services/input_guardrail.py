@@ -0,0 +1,161 @@
+"""
+Local first-pass input guardrail.
+
+Runs before the LLM guardrail in `RAGEngine.validate_input` and answers in
+microseconds for the clear cases:
+- injection phrases ("ignore previous instructions", "you are now", ...) are
+  rejected locally;
+- once the model is trained, inputs with no risk signal that look like a
+  career/interview answer are accepted locally: several distinct career terms,
+  not one keyword that is easy to slip into an off-topic request, and a
+  confident model;
+- everything else (misuse or abuse hints, code, very long or ambiguous text,
+  any input before the model is trained) returns None and goes to the LLM
+  guardrail.
+
+The model is a hashed word n-gram logistic regression fitted on labelled
+`rag_input_validation` events from audit_logs once enough of them exist.
+"""
+import re
+import zlib
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+INJECTION_PATTERNS = [
+    r"\bignore (all |any |the )?(previous|prior|above|earlier) (instructions|rules|prompts?)",
+    r"\bdisregard (all |any |the )?(previous|prior|above|your) (instructions|rules)",
+    r"\bsystem prompt\b",
+    r"\byou are now\b",
+    r"\bjailbreak",
+    r"\bdan mode\b",
+    r"\bdeveloper mode\b",
+    r"\b(reveal|show|print) (me )?(your|the) (instructions|prompt|rules)",
+    r"\bpretend (to be|you are)\b",
+    r"\bact as (an? )?(unrestricted|unfiltered|different)",
+]
+
+# Hints of misuse or abuse: never decided locally, always escalated to the LLM
+ESCALATION_PATTERNS = [
+    r"\b(solve|calculate|integrate|differentiate)\b.*\d",
+    r"\bhomework\b",
+    r"\bassignment\b",
+    r"\bwrite (me )?(an? )?(essay|poem|story|song|novel)",
+    # Requests addressed to the assistant rather than answers to a question
+    r"^\W*(please\s+)?((can|could|would) you\s+)?(write|generate|create|give|tell|explain|translate|summari[sz]e|list)\b",
+    r"\b(kill|murder|bomb|weapon|suicide|terroris\w*)\b",
+    r"\b(hack|hacking) into\b",
+    r"\bf+u+c+k|\bshit\b|\bbitch\b",
+    r"```|\bdef \w+\(|\bfunction\s*\w*\(|#include|<script",
+]
+
+CAREER_TERMS = frozenset("""
+    experience experiences worked work working job role roles team teams project projects
+    company companies client clients customer customers manager managed managing lead led
+    leading developed develop built build designed design implemented improve improved
+    responsible responsibility skills skill strength strengths weakness weaknesses challenge
+    challenges goal goals career internship intern university degree graduated studied
+    course certification resume cv interview position stakeholder stakeholders deadline
+    deadlines delivered collaborate collaborated communication learned learn achievement
+    achieved result results situation task action
+""".split())
+
+_INJECTION_RE = re.compile("|".join(INJECTION_PATTERNS), re.IGNORECASE)
+_ESCALATION_RE = re.compile("|".join(ESCALATION_PATTERNS), re.IGNORECASE)
+
+
+def _features(text: str, n_features: int) -> np.ndarray:
+    """Hashed word unigram + bigram ids (deduplicated)."""
+    words = _WORD_RE.findall(text.lower())
+    grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    return np.unique(np.fromiter(
+        (zlib.crc32(g.encode("utf-8")) % n_features for g in grams), dtype=np.int64, count=len(grams)
+    ))
+
+
+class LocalGuardrail:
+    def __init__(self, safe_threshold: float = 0.1, n_features: int = 1 << 16, max_chars: int = 1500,
+                 min_career_terms: int = 2, min_career_density: float = 0.05):
+        # Highest predicted P(unsafe) that is still accepted without the LLM
+        self.safe_threshold = safe_threshold
+        # Distinct career terms needed, in absolute terms and per word of input
+        self.min_career_terms = min_career_terms
+        self.min_career_density = min_career_density
+        self.n_features = n_features
+        self.max_chars = max_chars
+        self.weights: Optional[np.ndarray] = None
+        self.bias = 0.0
+        self.trained_on = 0
+
+    def classify(self, text: str) -> Optional[Dict[str, object]]:
+        """A guardrail verdict for clear-cut inputs, or None to escalate to the LLM."""
+        if _INJECTION_RE.search(text):
+            return {
+                "safe": False,
+                "reason": "Restricted system instructions detected.",
+                "category": "injection",
+                "source": "local",
+            }
+        if len(text) > self.max_chars or _ESCALATION_RE.search(text):
+            return None
+
+        words = _WORD_RE.findall(text.lower())
+        hits = len(CAREER_TERMS.intersection(words))
+        if hits < self.min_career_terms or hits < self.min_career_density * len(words):
+            return None
+        # Never accepted on vocabulary alone: an untrained guardrail always escalates
+        if self.weights is None or self.unsafe_probability(text) > self.safe_threshold:
+            return None
+
+        return {"safe": True, "reason": "Local first-pass check", "category": "relevant", "source": "local"}
+
+    def unsafe_probability(self, text: str) -> float:
+        idx = _features(text, self.n_features)
+        if self.weights is None or len(idx) == 0:
+            return 0.5
+        z = self.weights[idx].sum() / np.sqrt(len(idx)) + self.bias
+        return float(1.0 / (1.0 + np.exp(-z)))
+
+    def fit(
+        self,
+        texts: Sequence[str],
+        unsafe: Sequence[bool],
+        epochs: int = 200,
+        lr: float = 0.5,
+        l2: float = 1e-4,
+        min_examples: int = 50,
+    ) -> bool:
+        """
+        Trains the logistic model on labelled inputs (full-batch gradient descent,
+        balanced class weights). Needs both classes and `min_examples` rows;
+        returns False and leaves the current model in place otherwise.
+        """
+        y = np.asarray(unsafe, dtype=np.float32)
+        if len(texts) < min_examples or y.min() == y.max():
+            return False
+
+        rows: List[np.ndarray] = [_features(t, self.n_features) for t in texts]
+        lengths = np.array([len(r) for r in rows])
+        cols = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        owner = np.repeat(np.arange(len(rows)), lengths)
+        # Each example's features are scaled to unit length
+        vals = (1.0 / np.sqrt(np.maximum(lengths, 1)))[owner].astype(np.float32)
+
+        pos = y.mean()
+        sample_w = np.where(y == 1, 0.5 / pos, 0.5 / (1.0 - pos)).astype(np.float32)
+
+        w = np.zeros(self.n_features, dtype=np.float32)
+        b = 0.0
+        n = len(rows)
+        for _ in range(epochs):
+            z = np.bincount(owner, weights=w[cols] * vals, minlength=n) + b
+            p = 1.0 / (1.0 + np.exp(-z))
+            g = (p - y) * sample_w
+            grad = np.bincount(cols, weights=g[owner] * vals, minlength=self.n_features)
+            w -= (lr * (grad / n + l2 * w)).astype(np.float32)
+            b -= lr * float(g.mean())
+
+        self.weights, self.bias, self.trained_on = w, b, n
+        return True
@@ -0,0 +1,156 @@
+"""
+Bounded transcript context for long interviews.
+
+Only the last `recent_messages` transcript entries are replayed to the model
+verbatim. Everything before them is folded into a rolling summary stored on the
+session document (the entries themselves live in the turn store, see transcript_store.py):
+- `context_summary`: plain-text summary of transcript[:context_summary_upto]
+- `context_summary_upto`: number of transcript entries the summary covers
+
+Folding is incremental: once `fold_every` more entries have left the verbatim
+window, only those entries and the previous summary are sent to the summarizer.
+It runs after the turn has been answered, so a reply never waits for it; until
+it lands, the reply simply replays a few more verbatim messages.
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+try:
+    from mistralai import Mistral
+except (ImportError, AttributeError):
+    try:
+        from mistralai.client import Mistral
+    except ImportError:
+        from mistralai import MistralClient as Mistral
+from ..core.config import (
+    MISTRAL_API_KEY,
+    INTERVIEW_CONTEXT_RECENT_MESSAGES,
+    INTERVIEW_CONTEXT_FOLD_EVERY,
+    INTERVIEW_SUMMARY_MAX_CHARS,
+)
+from .interview_engine import interview_limiter
+from .mistral_retry import mistral_call_async
+
+SUMMARY_PROMPT = (
+    "You maintain the running notes of a job interview for the interviewer. "
+    "Update the notes with the new exchanges below. For every question, keep its topic and type "
+    "and a one-line assessment of the candidate's answer (specific facts, strengths, gaps). "
+    "Keep the candidate's self-introduction facts. Plain text, no markdown, at most {max_words} words.\n\n"
+    "CURRENT NOTES:\n{summary}\n\n"
+    "NEW EXCHANGES:\n{exchanges}\n\n"
+    "Return only the updated notes."
+)
+
+
+def _line(entry: Dict[str, Any], limit: int = 240) -> str:
+    speaker = "Interviewer" if entry.get("role") == "assistant" else "Candidate"
+    text = " ".join(str(entry.get("text", "")).split())
+    if len(text) > limit:
+        text = text[:limit].rstrip() + "..."
+    return f"{speaker}: {text}"
+
+
+class TranscriptContext:
+    def __init__(self, recent_messages: int = 12, fold_every: int = 6, max_summary_chars: int = 2000):
+        self.recent_messages = max(2, recent_messages)
+        self.fold_every = max(2, fold_every)
+        self.max_summary_chars = max(200, max_summary_chars)
+
+    def fold_range(self, transcript: List[Dict[str, Any]], upto: int) -> Optional[Tuple[int, int]]:
+        """(start, end) of the entries to fold next, or None while the backlog is below `fold_every`."""
+        end = len(transcript) - self.recent_messages
+        if end - upto < self.fold_every:
+            return None
+        # Keep the verbatim window starting on an interviewer message
+        if end > upto and transcript[end].get("role") == "user":
+            end -= 1
+        return (upto, end) if end > upto else None
+
+    def build_history(self, transcript: List[Dict[str, Any]], upto: int = 0) -> List[Dict[str, str]]:
+        """Chat messages for the entries not covered by the summary."""
+        upto = max(0, min(upto, len(transcript)))
+        return [{"role": t["role"], "content": t["text"]} for t in transcript[upto:]]
+
+    def digest(self, summary: str, entries: List[Dict[str, Any]]) -> str:
+        """Extractive fallback: one line per entry appended to the summary, oldest lines dropped past the cap."""
+        lines = [l for l in (summary or "").split("\n") if l.strip()]
+        lines.extend(_line(e, 160) for e in entries)
+        out = "\n".join(lines)
+        while len(out) > self.max_summary_chars and len(lines) > 1:
+            lines.pop(0)
+            out = "\n".join(lines)
+        return out[-self.max_summary_chars:]
+
+    async def summarize(self, summary: str, entries: List[Dict[str, Any]]) -> str:
+        """Rolling LLM summary of `summary` + `entries`, or the extractive digest without an API key / on error."""
+        if not MISTRAL_API_KEY:
+            return self.digest(summary, entries)
+        prompt = SUMMARY_PROMPT.format(
+            max_words=self.max_summary_chars // 7,
+            summary=summary or "(none yet)",
+            exchanges="\n".join(_line(e) for e in entries),
+        )
+        try:
+            client = Mistral(api_key=MISTRAL_API_KEY)
+            # Shares the reply path's concurrency cap and retry/backoff
+            resp = await mistral_call_async(lambda: client.chat.complete_async(
+                model="mistral-small-latest",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.0
+            ), limiter=interview_limiter)
+            content = resp.choices[0].message.content
+            if not isinstance(content, str) or not content.strip():
+                raise ValueError("empty summary")
+            return content.strip()[:self.max_summary_chars]
+        except Exception as e:
+            print(f"Interview summary fallback to digest: {e}")
+            return self.digest(summary, entries)
+
+    async def refresh(self, collection, session_id: str, store) -> bool:
+        """
+        Folds the next range of the session transcript into its summary. Only the entries
+        after `context_summary_upto` are read from the turn store. The write is conditional
+        on `context_summary_upto` being unchanged, so concurrent folds of the same session
+        cannot overwrite each other. Returns True when the summary advanced.
+        """
+        s = await collection.find_one(
+            {"session_id": session_id},
+            {"context_summary": 1, "context_summary_upto": 1},
+        )
+        if not s:
+            return False
+        upto = int(s.get("context_summary_upto", 0) or 0)
+        tail = await store.read(session_id, start=upto)
+        rng = self.fold_range(tail, 0)
+        if rng is None:
+            return False
+        start, end = rng
+        summary = await self.summarize(s.get("context_summary", ""), tail[start:end])
+        res = await collection.update_one(
+            {"session_id": session_id, "context_summary_upto": upto if upto else {"$in": [None, 0]}},
+            {"$set": {"context_summary": summary, "context_summary_upto": upto + end}},
+        )
+        return bool(getattr(res, "modified_count", 0))
+
+
+transcript_context = TranscriptContext(
+    INTERVIEW_CONTEXT_RECENT_MESSAGES, INTERVIEW_CONTEXT_FOLD_EVERY, INTERVIEW_SUMMARY_MAX_CHARS
+)
+
+# Strong references to in-flight folds (the event loop only keeps weak ones)
+_pending: Set[asyncio.Task] = set()
+
+
+async def _refresh_quietly(collection, session_id: str, store):
+    try:
+        await transcript_context.refresh(collection, session_id, store)
+    except Exception as e:
+        print(f"Error refreshing interview summary for {session_id}: {e}")
+
+
+def schedule_refresh(collection, session_id: str, transcript_len: int, upto: int, *, store):
+    """Starts a background fold when the transcript has outgrown the verbatim window."""
+    if transcript_len - transcript_context.recent_messages - upto < transcript_context.fold_every:
+        return
+    task = asyncio.create_task(_refresh_quietly(collection, session_id, store))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
@@ -1,5 +1,8 @@
+import json
+import re
 from datetime import datetime
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, AsyncIterator, Optional, Tuple, Union
 try:
     from mistralai import Mistral
 except (ImportError, AttributeError):
@@ -7,9 +10,15 @@ except (ImportError, AttributeError):
         from mistralai.client import Mistral
     except ImportError:
         from mistralai import MistralClient as Mistral
-from ..core.config import MISTRAL_API_KEY
-from .cache_manager import memoize
-from .mistral_retry import mistral_call
+from ..core.config import (
+    MISTRAL_API_KEY,
+    INTERVIEW_MAX_CONCURRENCY,
+    INTERVIEW_PROFILE_MAX_CHARS,
+    INTERVIEW_RESPONSE_CACHE_SIZE,
+    INTERVIEW_RESPONSE_CACHE_TTL,
+)
+from .response_cache import ResponseCache
+from .mistral_retry import ConcurrencyLimiter, mistral_call_async
 
 SYSTEM_PROMPT = (
     "You are a professional interviewer. Use plain text only. No bold, no emojis. "
@@ -43,8 +52,7 @@ SYSTEM_PROMPT = (
     "Do not ask about other roles or general questions unless they relate to this specific target role. "
     "At the end of the interview, provide a summary of the candidate's performance. "
     "In your final feedback explanation, DO NOT mention the numerical score (e.g., don't say 'You got 85/100' or 'Your score is 85'), as the user will see it in a dedicated circular display. Focus only on constructive feedback. "
-    "After your feedback text, on a new line, provide the score in this exact format: 'Interview Readiness Score: XX/100'. "
-    "Immediately after the score line, on a new line, provide the breakdown in this exact format: 'Breakdown: Technical: XX, Communication: XX, Alignment: XX, Relevance: XX'. "
+    "Report the score only in the 'score' and 'breakdown' fields of your JSON output, never inside 'message'. "
     "STRICT SCORE LIMITS (MUST NOT EXCEED): "
     "1. Technical: 0-30 (Correctness and relevance of technical knowledge)\n"
     "2. Communication: 0-30 (Clarity of speech, use of industry terminology, and detailed explanations)\n"
@@ -55,21 +63,24 @@ SYSTEM_PROMPT = (
     "Then follow the specific question weighting provided in the 'QUESTION MIX' context below. "
     "You MUST ask exactly the number of questions specified in the 'Interview Length' context. "
     "Do not count the questions yourself; instead, rely strictly on the 'PROGRESS TRACKING' information provided in the context below. "
-    "NEVER provide the final feedback summary or the [FINISH] tag until the 'PROGRESS TRACKING' indicates that all questions have been asked. "
+    "NEVER provide the final feedback summary or set 'finished' to true until the 'PROGRESS TRACKING' indicates that all questions have been asked. "
     "After the candidate provides their answer to the final question (the Nth question, where N is the Interview Length), do not ask any more interview questions. "
-    "Instead, your very next response must be a final closing message formatted EXACTLY as follows: "
+    "Instead, your very next 'message' must be a final closing message formatted EXACTLY as follows: "
     "1. Start with a warm thank you to the user (e.g., 'Thank you for completing the interview!'). This MUST be exactly one paragraph. "
     "2. Follow with EXACTLY two newlines (\\n\\n). "
     "3. Then provide a brief, light explanation of their performance (the feedback summary). This MUST be exactly one paragraph. "
-    "4. Finally, provide the score line: 'Interview Readiness Score: XX/100'. "
-    "5. Provide the breakdown line: 'Breakdown: Technical: XX, Communication: XX, Alignment: XX, Relevance: XX'. "
-    "6. Append [FINISH] at the very end. "
-    "EXAMPLE FINAL MESSAGE:\n"
-    "Thank you for your time today! It was a pleasure speaking with you.\n\n"
-    "You demonstrated strong technical knowledge in Python and databases, though you could improve on system design. Good luck!\n"
-    "Interview Readiness Score: 85/100\n"
-    "Breakdown: Technical: 25, Communication: 25, Alignment: 15, Relevance: 20\n"
-    "[FINISH]"
+    "Set 'finished' to true and fill in 'score' and 'breakdown'.\n"
+    "OUTPUT FORMAT: Respond ONLY with a JSON object with exactly these keys:\n"
+    "- \"message\": the text the candidate sees (plain text, no score lines, no tags).\n"
+    "- \"asks_question\": true if the message asks the candidate a question, otherwise false.\n"
+    "- \"finished\": true only for the final closing message (or when the session was ended manually), otherwise false.\n"
+    "- \"score\": the Interview Readiness Score (0-100) in the final closing message, otherwise null.\n"
+    "- \"breakdown\": {\"technical\": XX, \"communication\": XX, \"alignment\": XX, \"relevance\": XX} in the final closing message, otherwise null.\n"
+    "EXAMPLE QUESTION TURN:\n"
+    "{\"message\": \"Thanks for sharing. How would you design a rate limiter for a public API?\", \"asks_question\": true, \"finished\": false, \"score\": null, \"breakdown\": null}\n"
+    "EXAMPLE FINAL TURN:\n"
+    "{\"message\": \"Thank you for your time today! It was a pleasure speaking with you.\\n\\nYou demonstrated strong technical knowledge in Python and databases, though you could improve on system design. Good luck!\", "
+    "\"asks_question\": false, \"finished\": true, \"score\": 85, \"breakdown\": {\"technical\": 25, \"communication\": 25, \"alignment\": 15, \"relevance\": 20}}"
 )
 
 def is_technical_role(job_title: str) -> bool:
@@ -82,18 +93,13 @@ def is_technical_role(job_title: str) -> bool:
     title_lower = job_title.lower()
     return any(kw in title_lower for kw in tech_keywords)
 
-@memoize(expire=1800) # Cache for 30 minutes
-def interview_reply(history: List[Dict[str, str]], job_title: str = "", resume_feedback: Dict[str, Any] = None, questions_limit: int = 10, difficulty: str = "Beginner", current_asked_count: int = 0, force_end: bool = False) -> str:
-    if not MISTRAL_API_KEY:
-        if current_asked_count == 0:
-            prefix = f"Starting your {difficulty} level interview for the {job_title} role. " if job_title else ""
-            return prefix + "Hi, thank you for joining us today. To start things off, could you please introduce yourself and explain what interests you about this specific role?"
-        return f"Thank you for sharing that. Now, let's dive into our first {difficulty} level question..."
-    
-    client = Mistral(api_key=MISTRAL_API_KEY)
-    
-    is_tech = is_technical_role(job_title)
-    
+@lru_cache(maxsize=256)
+def static_system_prefix(job_title: str, difficulty: str, is_tech: bool) -> str:
+    """
+    Persona, role, difficulty and question-mix instructions. Identical for every turn
+    of every session with the same key, so it is built once per process and forms a
+    byte-stable prompt prefix for provider-side caching.
+    """
     # Define the mix based on role
     if is_tech:
         mix_instruction = (
@@ -113,36 +119,95 @@ def interview_reply(history: List[Dict[str, str]], job_title: str = "", resume_f
         )
 
     custom_system = SYSTEM_PROMPT
-    if job_title or resume_feedback or questions_limit or difficulty:
-        custom_system += "\n\nCANDIDATE CONTEXT:\n"
-        if job_title:
-            custom_system += f"- Target Job Title: {job_title}\n"
-            custom_system += f"  (CRITICAL: Always reference this role and ensure all questions are highly specific to a {job_title} professional.)\n"
-        if resume_feedback:
-            custom_system += f"- Resume Analysis: {resume_feedback}\n"
-        if questions_limit:
-            custom_system += f"- Interview Length: {questions_limit} questions.\n"
-        if difficulty:
-            custom_system += f"- Difficulty Level: {difficulty}\n"
-            if difficulty == "Beginner":
-                custom_system += "  (Focus on foundational knowledge and basic skills of the role.)\n"
-            elif difficulty == "Intermediate":
-                custom_system += "  (Focus on practical applications and real-world scenarios.)\n"
-            elif difficulty == "Advanced":
-                custom_system += "  (Focus on deep expertise, architecture, and complex problem-solving.)\n"
-        
-        custom_system += f"\n\n{mix_instruction}"
-        
+    custom_system += "\n\nCANDIDATE CONTEXT:\n"
+    if job_title:
+        custom_system += f"- Target Job Title: {job_title}\n"
+        custom_system += f"  (CRITICAL: Always reference this role and ensure all questions are highly specific to a {job_title} professional.)\n"
+    if difficulty:
+        custom_system += f"- Difficulty Level: {difficulty}\n"
+        if difficulty == "Beginner":
+            custom_system += "  (Focus on foundational knowledge and basic skills of the role.)\n"
+        elif difficulty == "Intermediate":
+            custom_system += "  (Focus on practical applications and real-world scenarios.)\n"
+        elif difficulty == "Advanced":
+            custom_system += "  (Focus on deep expertise, architecture, and complex problem-solving.)\n"
+
+    custom_system += f"\n\n{mix_instruction}"
+    return custom_system
+
+def _clip(text: Any, limit: int) -> str:
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= limit else text[:limit].rstrip() + "..."
+
+def _as_list(value: Any) -> List[str]:
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, list):
+        return []
+    return [str(v).strip() for v in value if str(v).strip()]
+
+def build_candidate_profile(resume_feedback: Dict[str, Any], max_chars: int = INTERVIEW_PROFILE_MAX_CHARS) -> str:
+    """
+    Compact, prompt-ready digest of a resume analysis: detected title, score, keywords,
+    top strengths and gaps. Derived once when the session starts and replayed every
+    turn instead of the full analysis dict. Lines past `max_chars` are dropped.
+    """
+    if not isinstance(resume_feedback, dict) or not resume_feedback:
+        return ""
+    lines = []
+    title = _clip(resume_feedback.get("DetectedJobTitle"), 80)
+    if title:
+        lines.append(f"Detected Title: {title}")
+    score = resume_feedback.get("Score")
+    if isinstance(score, (int, float)):
+        lines.append(f"Resume Score: {int(score)}/100")
+    keywords = _as_list(resume_feedback.get("Keywords"))[:15]
+    if not keywords:
+        keywords = _as_list(resume_feedback.get("SkillsTech"))[:15]
+    if keywords:
+        lines.append("Keywords: " + ", ".join(_clip(k, 40) for k in keywords))
+    for label, key in (("Strength", "Advantages"), ("Gap", "Disadvantages")):
+        for item in _as_list(resume_feedback.get(key))[:3]:
+            lines.append(f"{label}: {_clip(item, 160)}")
+
+    out = "\n".join(lines)
+    while len(out) > max_chars and len(lines) > 1:
+        lines.pop()
+        out = "\n".join(lines)
+    return out[:max_chars]
+
+def _session_block(resume_feedback: Union[Dict[str, Any], str], questions_limit: int) -> str:
+    """
+    Per-session context: fixed for the whole interview, placed after the static prefix.
+    `resume_feedback` is either the stored candidate profile or a raw analysis dict.
+    """
+    block = ""
+    if questions_limit:
+        block += f"- Interview Length: {questions_limit} questions.\n"
+    profile = resume_feedback if isinstance(resume_feedback, str) else build_candidate_profile(resume_feedback)
+    if profile:
+        block += "- Candidate Profile (from resume analysis):\n"
+        block += "".join(f"  {line}\n" for line in profile.split("\n"))
+    return f"\n\nSESSION CONTEXT:\n{block}" if block else ""
+
+def _summary_block(context_summary: str) -> str:
+    """Rolling summary of the transcript entries no longer replayed verbatim."""
+    if not context_summary:
+        return ""
+    return f"\n\nEARLIER IN THIS INTERVIEW (summary of the turns before the messages below):\n{context_summary}\n"
+
+def _progress_block(job_title: str, questions_limit: int, difficulty: str, current_asked_count: int, force_end: bool) -> str:
+    """Per-turn counters and flow rules; the only part of the system prompt that changes every turn."""
     # Add explicit progress tracking
     remaining = questions_limit - current_asked_count
-    custom_system += f"\n\nCRITICAL PROGRESS TRACKING:\n"
+    custom_system = f"\n\nCRITICAL PROGRESS TRACKING:\n"
     custom_system += f"- Total Questions Required: {questions_limit}\n"
     custom_system += f"- Questions Asked So Far: {current_asked_count}\n"
     custom_system += f"- Questions Remaining: {remaining}\n"
     
     # Session flow control
     if force_end:
-        custom_system += f"\nSTRICT RULE: The user has manually ended the session. You MUST acknowledge this and provide a brief closing message. Explain that since the interview was not completed, no Readiness Score can be generated. Do NOT provide a score line. Append [FINISH] at the end."
+        custom_system += f"\nSTRICT RULE: The user has manually ended the session. You MUST acknowledge this and provide a brief closing message. Explain that since the interview was not completed, no Readiness Score can be generated. Set 'finished' to true and leave 'score' and 'breakdown' null."
     elif current_asked_count < questions_limit:
         if current_asked_count == 0:
             custom_system += f"\nSTRICT RULE: This is the VERY BEGINNING of the interview. You MUST greet the user and ask them to introduce themselves and confirm their interest in the {job_title} role. "
@@ -158,50 +223,445 @@ def interview_reply(history: List[Dict[str, str]], job_title: str = "", resume_f
             custom_system += f"\nYou MUST ask a high-quality, {difficulty}-level interview question now. You are NOT allowed to end the interview or provide scores."
             custom_system += f"\nNEVER use the word 'final' or 'last' in your response. You have {questions_limit - current_asked_count - 1} more questions to ask after this one. Focus directly on the question without labeling its type."
         
-        custom_system += f"\nDO NOT say goodbye, DO NOT provide a feedback summary, and DO NOT use the [FINISH] tag. If you try to end now, you are failing your task."
+        custom_system += f"\nDO NOT say goodbye, DO NOT provide a feedback summary, and DO NOT set 'finished' to true. If you try to end now, you are failing your task."
         custom_system += "\nWait for the user's answer before asking the next question."
     else:
         custom_system += f"\nSTRICT RULE: All {questions_limit} questions are done. The user has just answered the final question #{questions_limit}."
-        custom_system += f"\nYou MUST now provide the final wrap-up: Thank you message, then feedback summary, then the score line, then [FINISH]."
+        custom_system += f"\nYou MUST now provide the final wrap-up: Thank you message, then feedback summary, with 'finished' true and the 'score' and 'breakdown' fields filled in."
         custom_system += "\nDo NOT ask any more questions."
 
     custom_system += "\n\nEnsure you follow the question count strictly. Do not hallucinate that the interview is over until the count reaches the limit."
 
+    return custom_system
+
+# In-flight interview completions per process; further requests wait for a free slot
+interview_limiter = ConcurrencyLimiter(INTERVIEW_MAX_CONCURRENCY)
+
+# Opening greetings and force-end messages; mid-session turns are never cached
+response_cache = ResponseCache(INTERVIEW_RESPONSE_CACHE_SIZE, INTERVIEW_RESPONSE_CACHE_TTL)
+
+# Per-turn prompt size counters (process-wide)
+_prompt_stats = {
+    "turns": 0, "prompt_bytes": 0, "static_prefix_bytes": 0, "usage_reports": 0, "prompt_tokens": 0,
+    # JSON turn contract: parsed turns, non-JSON completions, correction re-prompts
+    "structured_turns": 0, "parse_failures": 0, "corrections": 0,
+}
+
+def build_interview_messages(history: List[Dict[str, str]], job_title: str = "", resume_feedback: Union[Dict[str, Any], str] = None, questions_limit: int = 10, difficulty: str = "Beginner", current_asked_count: int = 0, force_end: bool = False, context_summary: str = "") -> List[Dict[str, str]]:
+    """
+    System prompt for the current interview state followed by the conversation history.
+    Ordered from most to least stable: static prefix, session context, transcript summary,
+    progress block.
+    """
+    prefix = static_system_prefix(job_title or "", difficulty or "", is_technical_role(job_title or ""))
+    custom_system = prefix + _session_block(resume_feedback, questions_limit) + _summary_block(context_summary) + _progress_block(
+        job_title, questions_limit, difficulty, current_asked_count, force_end
+    )
     msgs = [{"role": "system", "content": custom_system}] + history
-    completion = mistral_call(lambda: client.chat.complete(
+
+    _prompt_stats["turns"] += 1
+    _prompt_stats["static_prefix_bytes"] += len(prefix.encode("utf-8"))
+    _prompt_stats["prompt_bytes"] += sum(len(m["content"].encode("utf-8")) for m in msgs)
+    return msgs
+
+def record_prompt_usage(response: Any):
+    """Adds the provider-reported prompt token count of a completion to the prompt stats."""
+    tokens = getattr(getattr(response, "usage", None), "prompt_tokens", None)
+    if isinstance(tokens, int):
+        _prompt_stats["usage_reports"] += 1
+        _prompt_stats["prompt_tokens"] += tokens
+
+def get_prompt_stats() -> Dict[str, Any]:
+    """Average prompt bytes/tokens per turn, static-prefix share, prefix memo hits and turn correction rate."""
+    stats = dict(_prompt_stats)
+    turns = stats["turns"]
+    stats["avg_prompt_bytes"] = round(stats["prompt_bytes"] / turns) if turns else 0
+    stats["static_prefix_share"] = round(stats["static_prefix_bytes"] / stats["prompt_bytes"], 3) if stats["prompt_bytes"] else 0.0
+    stats["avg_prompt_tokens"] = round(stats["prompt_tokens"] / stats["usage_reports"]) if stats["usage_reports"] else 0
+    completions = stats["structured_turns"] + stats["parse_failures"]
+    stats["correction_rate"] = round(stats["corrections"] / completions, 3) if completions else 0.0
+    info = static_system_prefix.cache_info()
+    stats["prefix_cache"] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+    stats["response_cache"] = response_cache.get_stats()
+    return stats
+
+# Readiness breakdown: stored key, key in the model's JSON output, maximum points
+BREAKDOWN_FIELDS = (
+    ("TechnicalScore", "technical", 30),
+    ("CommunicationScore", "communication", 30),
+    ("AlignmentScore", "alignment", 20),
+    ("RelevanceScore", "relevance", 20),
+)
+
+def _turn(message: str, asks_question: bool = True, finished: bool = False, score: Optional[int] = None, breakdown: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return {"message": message, "asks_question": asks_question, "finished": finished, "score": score, "breakdown": breakdown}
+
+def _offline_reply(job_title: str, difficulty: str, current_asked_count: int) -> Dict[str, Any]:
+    """Canned turn used when no Mistral API key is configured."""
+    if current_asked_count == 0:
+        prefix = f"Starting your {difficulty} level interview for the {job_title} role. " if job_title else ""
+        return _turn(prefix + "Hi, thank you for joining us today. To start things off, could you please introduce yourself and explain what interests you about this specific role?")
+    return _turn(f"Thank you for sharing that. Now, let's dive into our first {difficulty} level question...")
+
+def _as_int(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def parse_turn(raw: Any) -> Optional[Dict[str, Any]]:
+    """Turn dict from the model's JSON output, or None when it is not a JSON object with a message."""
+    if not isinstance(raw, str):
+        return None
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("message"), str):
+        return None
+    message = data["message"].strip()
+    asks = data.get("asks_question")
+    breakdown = data.get("breakdown")
+    return _turn(
+        message,
+        asks_question=asks if isinstance(asks, bool) else "?" in message,
+        finished=data.get("finished") is True,
+        score=_as_int(data.get("score")),
+        breakdown=breakdown if isinstance(breakdown, dict) else None,
+    )
+
+def normalize_score(score: Optional[int], breakdown: Optional[Dict[str, Any]]) -> Tuple[Optional[int], Dict[str, int]]:
+    """
+    Clamps each breakdown component to its limit and rescales the breakdown to sum to
+    the score. Without a breakdown the score is split 30/30/20/20; without either, the
+    breakdown is all zeros. Accepts the model's keys ("technical") or stored ones.
+    """
+    if breakdown:
+        values = []
+        for stored, short, limit in BREAKDOWN_FIELDS:
+            v = _as_int(breakdown.get(short, breakdown.get(stored))) or 0
+            values.append(max(0, min(limit, v)))
+        total = sum(values)
+        if score is None:
+            score = total
+        elif total != score:
+            # If total doesn't match score, adjust
+            ratio = score / total if total != 0 else 1
+            values = [int(v * ratio) for v in values[:3]]
+            values.append(score - sum(values))
+            # Re-clamp after adjustment
+            values = [max(0, min(limit, v)) for v, (_, _, limit) in zip(values, BREAKDOWN_FIELDS)]
+    elif score is not None:
+        # Distribute score proportionally
+        values = [int(score * 0.3), int(score * 0.3), int(score * 0.2)]
+        values.append(score - sum(values))
+    else:
+        values = [0, 0, 0, 0]
+    return score, {stored: v for v, (stored, _, _) in zip(values, BREAKDOWN_FIELDS)}
+
+def _strip_premature(content: str, force_end: bool) -> str:
+    """VETO: hard-strip scores, [FINISH] and feedback headers the model produced before the limit."""
+    content = re.sub(r"Interview Readiness Score:.*", "", content, flags=re.IGNORECASE).strip()
+    if not force_end:
+        content = content.replace("[FINISH]", "").strip()
+        # Also strip "Performance Feedback" or similar headers if they appear prematurely
+        content = re.sub(r"(Performance Feedback|Summary of Performance|Overall Feedback):.*", "", content, flags=re.IGNORECASE | re.DOTALL).strip()
+    return content
+
+def validate_turn(turn: Dict[str, Any], premature: bool, force_end: bool) -> bool:
+    """
+    Enforces the session rules on a parsed turn, in place. Before the question limit the
+    turn can neither finish nor carry a score; on a forced end it always finishes without
+    a score. Returns True when the turn is unusable and needs the correction re-prompt:
+    before the limit, a reply that does not ask the candidate anything.
+    """
+    message = turn["message"].replace("[FINISH]", "").strip()
+    if force_end:
+        turn.update(message=_strip_premature(message, force_end=True), finished=True, score=None, breakdown=None)
+        return False
+    if premature:
+        message = _strip_premature(message, force_end=False)
+        turn.update(message=message, finished=False, score=None, breakdown=None)
+        return not message or not (turn["asks_question"] or "?" in message)
+    turn["message"] = message
+    return False
+
+# Plain-text closing format used before structured output:
+# "Interview Readiness Score: XX/100" and "Breakdown: Technical: XX, Communication: XX, Alignment: XX, Relevance: XX"
+_SCORE_RE = re.compile(r"Interview Readiness Score:\s*(\d+)/100", re.IGNORECASE)
+_BREAKDOWN_RE = re.compile(r"Breakdown:\s*Technical:\s*(\d+),\s*Communication:\s*(\d+),\s*Alignment:\s*(\d+),\s*Relevance:\s*(\d+)", re.IGNORECASE)
+
+def _read_plain_turn(text: str) -> Dict[str, Any]:
+    """Turn from plain-text output; the score and breakdown lines are extracted and removed from the message."""
+    score_match = _SCORE_RE.search(text)
+    breakdown_match = _BREAKDOWN_RE.search(text)
+    breakdown = None
+    if breakdown_match:
+        breakdown = {short: int(v) for (_, short, _), v in zip(BREAKDOWN_FIELDS, breakdown_match.groups())}
+    finished = "[FINISH]" in text or score_match is not None
+    # Clean up the feedback text to remove the score and breakdown lines
+    message = _BREAKDOWN_RE.sub("", _SCORE_RE.sub("", text.replace("[FINISH]", ""))).strip()
+    return _turn(
+        message,
+        asks_question="?" in message,
+        finished=finished,
+        score=int(score_match.group(1)) if score_match else None,
+        breakdown=breakdown,
+    )
+
+def _read_turn(raw: Any) -> Dict[str, Any]:
+    """Parses a completion into a turn; plain-text output falls back to the old text format and is counted."""
+    turn = parse_turn(raw)
+    if turn is not None:
+        _prompt_stats["structured_turns"] += 1
+        return turn
+    _prompt_stats["parse_failures"] += 1
+    return _read_plain_turn(raw.strip() if isinstance(raw, str) else "")
+
+def _correction_messages(msgs: List[Dict[str, str]], content: str, job_title: str, questions_limit: int, difficulty: str, current_asked_count: int) -> List[Dict[str, str]]:
+    correction_msgs = msgs + [{"role": "assistant", "content": content}]
+    correction_msgs.append({
+        "role": "user", 
+        "content": f"[SYSTEM CORRECTION]: You tried to end the interview early or didn't ask a question. You have only asked {current_asked_count} questions out of {questions_limit}. You MUST continue. Please ask a high-quality, {difficulty}-level technical question about {job_title} now. Do NOT say goodbye. Respond with the JSON turn object."
+    })
+    return correction_msgs
+
+async def _complete_json(client, msgs: List[Dict[str, str]]):
+    return await mistral_call_async(lambda: client.chat.complete_async(
         model="mistral-small-latest",
         messages=msgs,
+        response_format={"type": "json_object"},
         temperature=0.3
-    ))
-    content = completion.choices[0].message.content
+    ), limiter=interview_limiter)
+
+async def _correct_turn(client, msgs: List[Dict[str, str]], raw: str, job_title: str, questions_limit: int, difficulty: str, current_asked_count: int) -> Dict[str, Any]:
+    """The rare second completion for a turn that failed validate_turn; counted in the prompt stats."""
+    _prompt_stats["corrections"] += 1
+    correction_msgs = _correction_messages(msgs, raw, job_title, questions_limit, difficulty, current_asked_count)
+    retry_completion = await _complete_json(client, correction_msgs)
+    turn = _read_turn(retry_completion.choices[0].message.content)
+    validate_turn(turn, premature=True, force_end=False)
+    return turn
+
+async def interview_reply(history: List[Dict[str, str]], job_title: str = "", resume_feedback: Union[Dict[str, Any], str] = None, questions_limit: int = 10, difficulty: str = "Beginner", current_asked_count: int = 0, force_end: bool = False, context_summary: str = "") -> Dict[str, Any]:
+    """
+    Next interviewer turn: {"message", "asks_question", "finished", "score", "breakdown"}.
+    The model answers in JSON and the session rules are checked locally; only a turn that
+    asks nothing before the question limit costs a correction re-prompt. `score` and
+    `breakdown` are the model's raw values (see normalize_score).
+    """
+    if not MISTRAL_API_KEY:
+        return _offline_reply(job_title, difficulty, current_asked_count)
+
+    cache_key = response_cache.key_for(history, job_title, resume_feedback, questions_limit, difficulty, current_asked_count, force_end)
+    if cache_key:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
     
-    # VETO: Hard-strip any premature scores if we haven't reached the limit
-    if current_asked_count < questions_limit or force_end:
-        import re
-        content = re.sub(r"Interview Readiness Score:.*", "", content, flags=re.IGNORECASE).strip()
-        if not force_end:
-            content = content.replace("[FINISH]", "").strip()
-        # Also strip "Performance Feedback" or similar headers if they appear prematurely
-        if not force_end:
-            content = re.sub(r"(Performance Feedback|Summary of Performance|Overall Feedback):.*", "", content, flags=re.IGNORECASE | re.DOTALL).strip()
-        
-        # RE-PROMPT if the AI tried to end early and gave us a useless message (only for non-force-end)
-        if not force_end and (not content or "?" not in content or "thank you" in content.lower() or "goodbye" in content.lower()):
-            # Add a correction message and try once more
-            correction_msgs = msgs + [{"role": "assistant", "content": content}]
-            correction_msgs.append({
-                "role": "user", 
-                "content": f"[SYSTEM CORRECTION]: You tried to end the interview early or didn't ask a question. You have only asked {current_asked_count} questions out of {questions_limit}. You MUST continue. Please ask a high-quality, {difficulty}-level technical question about {job_title} now. Do NOT say goodbye."
-            })
-            retry_completion = mistral_call(lambda: client.chat.complete(
-                model="mistral-small-latest",
-                messages=correction_msgs,
-                temperature=0.3
-            ))
-            content = retry_completion.choices[0].message.content
-            content = re.sub(r"Interview Readiness Score:.*", "", content, flags=re.IGNORECASE).strip()
-            content = content.replace("[FINISH]", "").strip()
-            content = re.sub(r"(Performance Feedback|Summary of Performance|Overall Feedback):.*", "", content, flags=re.IGNORECASE | re.DOTALL).strip()
+    client = Mistral(api_key=MISTRAL_API_KEY)
+    
+    msgs = build_interview_messages(history, job_title, resume_feedback, questions_limit, difficulty, current_asked_count, force_end, context_summary)
+    completion = await _complete_json(client, msgs)
+    record_prompt_usage(completion)
+    raw = completion.choices[0].message.content
+    turn = _read_turn(raw)
 
-    return content
+    premature = current_asked_count < questions_limit or force_end
+    if validate_turn(turn, premature, force_end):
+        turn = await _correct_turn(client, msgs, raw, job_title, questions_limit, difficulty, current_asked_count)
+
+    if cache_key:
+        response_cache.set(cache_key, turn)
+    return turn
+
+
+class JsonMessageStream:
+    """
+    Pulls the string value of the "message" key out of a JSON turn as it streams in,
+    decoding escapes. Text before the key and after the closing quote is discarded;
+    an escape split across chunks is held back until it is complete.
+    """
+    KEY = re.compile(r'"message"\s*:\s*"')
+
+    def __init__(self):
+        self._buf = ""
+        self._state = "seek"  # seek -> value -> done
+
+    def feed(self, delta: str) -> str:
+        if self._state == "done":
+            return ""
+        self._buf += delta
+        if self._state == "seek":
+            m = self.KEY.search(self._buf)
+            if not m:
+                # Keep enough for a key split across chunks
+                self._buf = self._buf[-32:]
+                return ""
+            self._buf = self._buf[m.end():]
+            self._state = "value"
+        i, n = 0, len(self._buf)
+        while i < n:
+            c = self._buf[i]
+            if c == '"':
+                self._state = "done"
+                break
+            if c == "\\":
+                width = 6 if self._buf[i + 1:i + 2] == "u" else 2
+                if i + width > n:
+                    break
+                i += width
+                continue
+            i += 1
+        raw, self._buf = self._buf[:i], self._buf[i:]
+        try:
+            return json.loads(f'"{raw}"', strict=False)
+        except ValueError:
+            return raw
+
+
+class ReplyStreamFilter:
+    """
+    Incremental version of the reply post-processing, applied to streamed tokens.
+    [FINISH] is never shown; before the question limit (or on a forced end) the
+    score line is dropped, and a premature feedback header cuts the rest of the
+    message. Text that could be the start of a marker is held back until the
+    next token decides it.
+    """
+    FINISH = "[finish]"
+    SCORE = "interview readiness score:"
+    HEADERS = ("performance feedback:", "summary of performance:", "overall feedback:")
+
+    def __init__(self, premature: bool, force_end: bool = False):
+        self.markers = [self.FINISH]
+        if premature:
+            self.markers.append(self.SCORE)
+            if not force_end:
+                self.markers.extend(self.HEADERS)
+        self._buf = ""
+        self._skip_line = False
+        self._cut = False
+        self._started = False
+
+    def feed(self, delta: str) -> str:
+        """Returns the part of the text so far that is safe to show."""
+        if self._cut:
+            return ""
+        self._buf += delta
+        return self._drain(final=False)
+
+    def close(self) -> str:
+        """Releases whatever was held back once the stream has ended."""
+        return self._drain(final=True)
+
+    def _drain(self, final: bool) -> str:
+        out = []
+        while self._buf and not self._cut:
+            if self._skip_line:
+                nl = self._buf.find("\n")
+                if nl < 0:
+                    self._buf = ""
+                    break
+                self._buf = self._buf[nl:]
+                self._skip_line = False
+                continue
+            low = self._buf.lower()
+            hit = None
+            for marker in self.markers:
+                i = low.find(marker)
+                if i >= 0 and (hit is None or i < hit[0]):
+                    hit = (i, marker)
+            if hit is not None:
+                i, marker = hit
+                out.append(self._buf[:i])
+                self._buf = self._buf[i + len(marker):]
+                if marker == self.SCORE:
+                    self._skip_line = True
+                elif marker != self.FINISH:
+                    self._cut = True
+                    self._buf = ""
+                continue
+            keep = 0 if final else self._partial_marker_len(low)
+            out.append(self._buf[:len(self._buf) - keep])
+            self._buf = self._buf[len(self._buf) - keep:]
+            break
+        text = "".join(out)
+        if not self._started:
+            text = text.lstrip()
+            self._started = bool(text)
+        return text
+
+    def _partial_marker_len(self, low: str) -> int:
+        """Length of the longest suffix of `low` that is a proper prefix of a marker."""
+        best = 0
+        for marker in self.markers:
+            for k in range(min(len(marker) - 1, len(low)), best, -1):
+                if marker.startswith(low[-k:]):
+                    best = k
+                    break
+        return best
+
+
+async def stream_interview_reply(history: List[Dict[str, str]], job_title: str = "", resume_feedback: Union[Dict[str, Any], str] = None, questions_limit: int = 10, difficulty: str = "Beginner", current_asked_count: int = 0, force_end: bool = False, context_summary: str = "") -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Streaming counterpart of interview_reply. Yields ("token", text) for every
+    displayable piece of the turn's message as it arrives, then ("final", turn) with
+    the turn dict validated exactly like interview_reply (correction re-prompt included).
+    """
+    if not MISTRAL_API_KEY:
+        turn = _offline_reply(job_title, difficulty, current_asked_count)
+        yield "token", turn["message"]
+        yield "final", turn
+        return
+
+    cache_key = response_cache.key_for(history, job_title, resume_feedback, questions_limit, difficulty, current_asked_count, force_end)
+    if cache_key:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            yield "token", cached["message"]
+            yield "final", dict(cached)
+            return
+
+    client = Mistral(api_key=MISTRAL_API_KEY)
+    msgs = build_interview_messages(history, job_title, resume_feedback, questions_limit, difficulty, current_asked_count, force_end, context_summary)
+    premature = current_asked_count < questions_limit or force_end
+    message_stream = JsonMessageStream()
+    stream_filter = ReplyStreamFilter(premature, force_end)
+
+    parts = []
+    streamed = False
+    # The slot covers opening the stream; reading it is paced by the client, not the API
+    stream = await mistral_call_async(lambda: client.chat.stream_async(
+        model="mistral-small-latest",
+        messages=msgs,
+        response_format={"type": "json_object"},
+        temperature=0.3
+    ), limiter=interview_limiter)
+    async for event in stream:
+        # The last chunk carries the usage block
+        record_prompt_usage(event.data)
+        delta = event.data.choices[0].delta.content if event.data.choices else None
+        if not isinstance(delta, str) or not delta:
+            continue
+        parts.append(delta)
+        visible = stream_filter.feed(message_stream.feed(delta))
+        if visible:
+            streamed = True
+            yield "token", visible
+    tail = stream_filter.close()
+    if tail:
+        streamed = True
+        yield "token", tail
 
+    raw = "".join(parts)
+    turn = _read_turn(raw)
+    if validate_turn(turn, premature, force_end):
+        turn = await _correct_turn(client, msgs, raw, job_title, questions_limit, difficulty, current_asked_count)
+    elif not streamed and turn["message"]:
+        # Output without a JSON "message" key: nothing was shown yet
+        yield "token", turn["message"]
+    if cache_key:
+        response_cache.set(cache_key, turn)
+    yield "final", turn
@@ -0,0 +1,75 @@
+"""
+BM25 keyword index for the RAG engine's hybrid search.
+
+The index is built once from the chunk list (vocabulary, postings lists and
+per-chunk lengths). A query only walks the postings of its own terms and
+returns a dense score vector aligned with the chunk order, so it can be fused
+with the semantic scores in a single vectorized step.
+"""
+import re
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens, same rule for chunks and queries."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class KeywordIndex:
+    """Inverted index with Okapi BM25 scoring."""
+
+    def __init__(self, chunks: List[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.n_docs = len(chunks)
+        self.vocab: Dict[str, int] = {}
+
+        postings_docs: List[List[int]] = []
+        postings_tfs: List[List[int]] = []
+        lengths = np.zeros(self.n_docs, dtype=np.float32)
+        for doc_id, chunk in enumerate(chunks):
+            tokens = tokenize(chunk)
+            lengths[doc_id] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                term_id = self.vocab.setdefault(term, len(self.vocab))
+                if term_id == len(postings_docs):
+                    postings_docs.append([])
+                    postings_tfs.append([])
+                postings_docs[term_id].append(doc_id)
+                postings_tfs[term_id].append(tf)
+
+        self.doc_lengths = lengths
+        self.avg_doc_length = float(lengths.mean()) if self.n_docs and lengths.any() else 1.0
+        self.postings_docs = [np.asarray(d, dtype=np.int32) for d in postings_docs]
+        self.postings_tfs = [np.asarray(t, dtype=np.float32) for t in postings_tfs]
+
+        doc_freq = np.asarray([len(d) for d in postings_docs], dtype=np.float32)
+        self.idf = np.log1p((self.n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+        # Length-normalisation part of the BM25 denominator, precomputed per chunk
+        self._length_norm = (k1 * (1.0 - b + b * lengths / self.avg_doc_length)).astype(np.float32)
+
+    def scores(self, query: str, normalize: bool = True) -> np.ndarray:
+        """
+        Dense BM25 score per chunk. Only chunks containing a query term are touched.
+        With normalize=True the vector is scaled to [0, 1] so it can be weighted
+        against cosine similarities.
+        """
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                continue
+            docs = self.postings_docs[term_id]
+            tfs = self.postings_tfs[term_id]
+            scores[docs] += self.idf[term_id] * tfs * (self.k1 + 1.0) / (tfs + self._length_norm[docs])
+
+        if normalize and self.n_docs:
+            top = scores.max()
+            if top > 0:
+                scores /= top
+        return scores
@@ -2,7 +2,8 @@
 Mistral API retry utility.
 
 Wraps any callable that hits the Mistral API with a simple fixed-wait retry
-on rate-limit (429) and transient server errors (5xx).
+on rate-limit (429) and transient server errors (5xx). `mistral_call` is for
+sync SDK calls, `mistral_call_async` for the SDK's async methods.
 
 Design decisions for FYP:
 - Max 2 retries  → total 3 attempts, predictable timing (~4s worst case)
@@ -14,8 +15,10 @@ Design decisions for FYP:
 """
 
 import time
+import asyncio
 import logging
-from typing import Callable, TypeVar, Any
+from contextvars import ContextVar
+from typing import Awaitable, Callable, TypeVar, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +39,44 @@ def _is_rate_limit(exc: Exception) -> bool:
                                   "upstream", "overloaded"))
 
 
+def _check_circuit():
+    """Raise immediately while the circuit breaker is open."""
+    now = time.time()
+    if _cb_open_until > now:
+        remaining = int(_cb_open_until - now)
+        raise RuntimeError(
+            f"AI_RATE_LIMIT: System is resting after repeated rate limits. "
+            f"Retrying automatically in ~{remaining}s."
+        )
+
+
+def _should_retry(exc: Exception, attempt: int, max_retries: int) -> bool:
+    """
+    Record a failed attempt. Returns True when the call should be retried after
+    the fixed wait; raises when the error is not retryable or the circuit opens.
+    """
+    global _cb_failure_count, _cb_open_until
+    if not _is_rate_limit(exc):
+        # Non-retryable error — raise immediately
+        raise exc
+    _cb_failure_count += 1
+    logger.warning(
+        "Mistral rate-limit hit (attempt %d/%d, cb_count=%d): %s",
+        attempt + 1, max_retries + 1, _cb_failure_count, exc
+    )
+    # Open circuit if threshold reached
+    if _cb_failure_count >= _CB_THRESHOLD:
+        _cb_open_until = time.time() + _CB_OPEN_SECONDS
+        logger.warning(
+            "Circuit breaker OPEN — cooling down for %.0fs", _CB_OPEN_SECONDS
+        )
+        raise RuntimeError(
+            f"AI_RATE_LIMIT: High demand detected. "
+            f"Please wait ~{int(_CB_OPEN_SECONDS)}s and try again."
+        ) from exc
+    return attempt < max_retries
+
+
 def mistral_call(fn: Callable[[], T], max_retries: int = 2, wait_seconds: float = 2.0) -> T:
     """
     Call `fn()` (a zero-argument lambda wrapping a Mistral API call).
@@ -45,16 +86,10 @@ def mistral_call(fn: Callable[[], T], max_retries: int = 2, wait_seconds: float
     Usage:
         result = mistral_call(lambda: client.chat.complete(...))
     """
-    global _cb_failure_count, _cb_open_until
+    global _cb_failure_count
 
     # ── Circuit breaker check ────────────────────────────────────────────────
-    now = time.time()
-    if _cb_open_until > now:
-        remaining = int(_cb_open_until - now)
-        raise RuntimeError(
-            f"AI_RATE_LIMIT: System is resting after repeated rate limits. "
-            f"Retrying automatically in ~{remaining}s."
-        )
+    _check_circuit()
 
     last_exc: Exception = RuntimeError("No attempt made")
     for attempt in range(max_retries + 1):
@@ -65,27 +100,84 @@ def mistral_call(fn: Callable[[], T], max_retries: int = 2, wait_seconds: float
             return result
         except Exception as exc:
             last_exc = exc
-            if _is_rate_limit(exc):
-                _cb_failure_count += 1
-                logger.warning(
-                    "Mistral rate-limit hit (attempt %d/%d, cb_count=%d): %s",
-                    attempt + 1, max_retries + 1, _cb_failure_count, exc
-                )
-                # Open circuit if threshold reached
-                if _cb_failure_count >= _CB_THRESHOLD:
-                    _cb_open_until = time.time() + _CB_OPEN_SECONDS
-                    logger.warning(
-                        "Circuit breaker OPEN — cooling down for %.0fs", _CB_OPEN_SECONDS
-                    )
-                    raise RuntimeError(
-                        f"AI_RATE_LIMIT: High demand detected. "
-                        f"Please wait ~{int(_CB_OPEN_SECONDS)}s and try again."
-                    ) from exc
-                if attempt < max_retries:
-                    logger.info("Waiting %.1fs before retry %d…", wait_seconds, attempt + 2)
-                    time.sleep(wait_seconds)
+            if _should_retry(exc, attempt, max_retries):
+                logger.info("Waiting %.1fs before retry %d…", wait_seconds, attempt + 2)
+                time.sleep(wait_seconds)
+
+    raise last_exc
+
+
+async def mistral_call_async(fn: Callable[[], Awaitable[T]], max_retries: int = 2, wait_seconds: float = 2.0,
+                             limiter: Optional["ConcurrencyLimiter"] = None) -> T:
+    """
+    Async counterpart of mistral_call: `fn()` returns an awaitable (e.g. a lambda
+    around client.chat.complete_async). The wait between attempts does not block
+    the event loop, and each attempt holds a `limiter` slot only while in flight.
+
+    Usage:
+        result = await mistral_call_async(lambda: client.chat.complete_async(...), limiter=limiter)
+    """
+    global _cb_failure_count
+
+    _check_circuit()
+
+    last_exc: Exception = RuntimeError("No attempt made")
+    for attempt in range(max_retries + 1):
+        try:
+            if limiter is not None:
+                async with limiter:
+                    result = await fn()
             else:
-                # Non-retryable error — raise immediately
-                raise
+                result = await fn()
+            _cb_failure_count = 0
+            return result
+        except Exception as exc:
+            last_exc = exc
+            if _should_retry(exc, attempt, max_retries):
+                logger.info("Waiting %.1fs before retry %d…", wait_seconds, attempt + 2)
+                await asyncio.sleep(wait_seconds)
 
     raise last_exc
+
+
+class ConcurrencyLimiter:
+    """
+    Caps the number of in-flight async Mistral calls.
+
+    An asyncio.Semaphore binds to the first event loop that waits on it, so the
+    semaphore is (re)created per running loop. Each holder releases the exact
+    semaphore it acquired, even if a new loop replaced it in the meantime.
+    The limiter bounds concurrency only: asyncio.Semaphore does not promise
+    FIFO hand-off, so a newly arriving call can take a freed slot ahead of one
+    that was already waiting.
+
+    Usage:
+        async with limiter:
+            resp = await client.chat.complete_async(...)
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Semaphores held by the current task, innermost last
+        self._held: ContextVar[Tuple[asyncio.Semaphore, ...]] = ContextVar(f"limiter_held_{id(self)}", default=())
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def __aenter__(self):
+        semaphore = self._get_semaphore()
+        await semaphore.acquire()
+        self._held.set(self._held.get() + (semaphore,))
+        return self
+
+    async def __aexit__(self, *exc):
+        held = self._held.get()
+        self._held.set(held[:-1])
+        held[-1].release()
+        return False
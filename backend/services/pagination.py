@@ -0,0 +1,46 @@
+"""
+Keyset pagination over `created_at` (newest first).
+
+A cursor is "<created_at ISO>|<_id>" of the last item of the previous page.
+Ties on created_at are broken by _id, so no item is skipped or repeated and
+every page is one indexed range scan regardless of how deep it is.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from bson import ObjectId
+
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(doc: Dict[str, Any]) -> Optional[str]:
+    created = doc.get("created_at")
+    if not isinstance(created, datetime):
+        return None
+    return f"{created.isoformat()}|{doc['_id']}"
+
+
+def cursor_filter(cursor: str) -> Dict[str, Any]:
+    """Query matching everything after `cursor`; ValueError when it is malformed."""
+    try:
+        created_iso, oid = cursor.rsplit("|", 1)
+        created = datetime.fromisoformat(created_iso)
+        _id = ObjectId(oid)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return {"$or": [
+        {"created_at": {"$lt": created}},
+        {"created_at": created, "_id": {"$lt": _id}},
+    ]}
+
+
+async def fetch_page(collection, query: Dict[str, Any], projection: Dict[str, Any],
+                     limit: int, before: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of `query` newest first, and the cursor of the next page (None on the last one)."""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if before:
+        query = {"$and": [query, cursor_filter(before)]}
+    cur = collection.find(query, projection).sort([("created_at", -1), ("_id", -1)]).limit(limit + 1)
+    docs = [d async for d in cur]
+    more = len(docs) > limit
+    docs = docs[:limit]
+    return docs, encode_cursor(docs[-1]) if more else None
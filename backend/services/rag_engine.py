@@ -1,12 +1,13 @@
 ﻿import os
 import time
 import json
+import asyncio
+import hashlib
 import numpy as np
-import re
 import certifi
 import httpx
 from typing import List, Dict, Any
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 try:
     from mistralai import Mistral
 except (ImportError, AttributeError):
@@ -19,13 +20,15 @@ except (ImportError, AttributeError):
 def _build_mistral_client(api_key: str) -> "Mistral":
     """
     Build a Mistral client with proper SSL handling.
-    The SDK 2.x uses 'client' (not 'http_client') for a custom httpx.Client.
+    The SDK 2.x uses 'client' (not 'http_client') for a custom httpx.Client and
+    'async_client' for the httpx.AsyncClient behind the *_async methods.
     Tries certifi CA bundle first; falls back to verify=False for local dev.
     """
     # First attempt: use certifi's trusted CA bundle
     try:
         http = httpx.Client(verify=certifi.where(), follow_redirects=True)
-        mistral = Mistral(api_key=api_key, client=http)
+        ahttp = httpx.AsyncClient(verify=certifi.where(), follow_redirects=True)
+        mistral = Mistral(api_key=api_key, client=http, async_client=ahttp)
         # Quick SSL probe
         mistral.embeddings.create(model="mistral-embed", inputs=["test"])
         return mistral
@@ -34,14 +37,57 @@ def _build_mistral_client(api_key: str) -> "Mistral":
         if "SSL" in err or "CERTIFICATE" in err or "certificate" in err:
             print(f"Warning: certifi SSL still failing ({err}). Falling back to verify=False for local dev.")
             http = httpx.Client(verify=False, follow_redirects=True)
-            return Mistral(api_key=api_key, client=http)
+            ahttp = httpx.AsyncClient(verify=False, follow_redirects=True)
+            return Mistral(api_key=api_key, client=http, async_client=ahttp)
         # Non-SSL error (e.g. auth error on probe) â€” return the certifi client anyway
         http = httpx.Client(verify=certifi.where(), follow_redirects=True)
-        return Mistral(api_key=api_key, client=http)
+        ahttp = httpx.AsyncClient(verify=certifi.where(), follow_redirects=True)
+        return Mistral(api_key=api_key, client=http, async_client=ahttp)
 
-from ..core.config import MISTRAL_API_KEY
+from ..core.config import (
+    MISTRAL_API_KEY, RAG_INDEX_DIR, RAG_MAX_CONCURRENCY,
+    RAG_EMBED_BATCH_WINDOW_MS, RAG_EMBED_MAX_BATCH,
+    RAG_INDEX_MODE, RAG_ANN_MIN_CHUNKS, RAG_IVF_LISTS, RAG_IVF_NPROBE,
+    RAG_CHUNK_TOKENS, RAG_CHUNK_OVERLAP, RAG_CRAG_CACHE_TTL, RAG_CRAG_SKIP_COSINE,
+    RAG_GUARDRAIL_SAFE_THRESHOLD,
+)
 from .cache_manager import cache
+from .keyword_index import KeywordIndex
+from .embedding_store import EmbeddingStore, content_hash
+from .mistral_retry import ConcurrencyLimiter
+from .embedding_coalescer import EmbeddingCoalescer
+from .ann_index import IVFIndex
+from .chunker import Chunker, ChunkSet
+from .input_guardrail import LocalGuardrail
 from ..core.db import audit_logs # For behavior monitoring
+from .telemetry import audit_writer
+
+class CorpusSnapshot:
+    """
+    Everything retrieval needs about the indexed corpus, built once and never
+    mutated. A retrieval reads one snapshot for its whole duration, so a
+    reload can swap in a new one while in-flight requests finish on the old.
+    """
+    def __init__(
+        self,
+        chunks: List[str],
+        embeddings: Optional[np.ndarray] = None,
+        keyword_index: Optional[KeywordIndex] = None,
+        ann_index: Optional[IVFIndex] = None,
+        corpus_version: str = "",
+        chunk_meta: Optional[ChunkSet] = None,
+    ):
+        self.chunks = chunks
+        # Row-normalised float32 matrix (n_chunks x dim); None = keyword-only mode
+        self.embeddings = embeddings
+        self.keyword_index = keyword_index
+        # Optional IVF index over `embeddings`; None = exact (brute-force) search
+        self.ann_index = ann_index
+        # Changes whenever the chunk set does; part of every retrieval cache key
+        self.corpus_version = corpus_version
+        # Source file / offsets / token counts as arrays aligned with `chunks`
+        self.chunk_meta = chunk_meta
+
 
 class RAGEngine:
     """
@@ -53,12 +99,37 @@ class RAGEngine:
     4. Input/Output Guardrails
     5. Behavior Monitoring
     """
-    def __init__(self, docs_dir: str = "backend/data/rag_docs"):
+    def __init__(self, docs_dir: str = "backend/data/rag_docs", index_dir: str = RAG_INDEX_DIR):
         self.docs_dir = docs_dir
-        self.chunks = []
-        self.embeddings = []
+        self.index_dir = index_dir
+        self.embedding_store = EmbeddingStore(index_dir, model="mistral-embed")
+        self.chunker = Chunker(RAG_CHUNK_TOKENS, RAG_CHUNK_OVERLAP)
+        # Swapped atomically (single reference assignment) by reload()
+        self.snapshot = CorpusSnapshot([])
+        self.ann_n_probe = RAG_IVF_NPROBE
         self._initialized = False
+        self._reloading = False
         self.mistral_client = None
+        # Request-path calls use the SDK's async methods; this bounds how many are in flight
+        self.llm_limiter = ConcurrencyLimiter(RAG_MAX_CONCURRENCY)
+        # Query embeddings arriving within a few ms share one embeddings request
+        self.embedding_coalescer = EmbeddingCoalescer(
+            self._embed_batch_async,
+            window_ms=RAG_EMBED_BATCH_WINDOW_MS,
+            max_batch=RAG_EMBED_MAX_BATCH,
+        )
+        self.cache_stats = {
+            "retrieval_hits": 0,
+            "retrieval_misses": 0,
+            "embedding_hits": 0,
+            "embedding_misses": 0,
+            "crag_hits": 0,
+            "crag_misses": 0,
+            "crag_skipped": 0,
+        }
+        # First-pass input check; only ambiguous inputs reach the LLM guardrail
+        self.input_guardrail = LocalGuardrail(RAG_GUARDRAIL_SAFE_THRESHOLD)
+        self.guardrail_stats = {"local_safe": 0, "local_blocked": 0, "llm": 0}
 
     def initialize(self):
         """Initializes the RAG Engine with Mistral SDK directly."""
@@ -75,47 +146,232 @@ class RAGEngine:
             # Initialize Mistral SDK client
             self.mistral_client = _build_mistral_client(MISTRAL_API_KEY)
 
-            if not os.path.exists(self.docs_dir):
-                print(f"Warning: RAG docs directory not found at {self.docs_dir}")
-                return
-
-            # Load and chunk documents
-            all_text = ""
-            if os.path.isdir(self.docs_dir):
-                for filename in os.listdir(self.docs_dir):
-                    if filename.endswith(".txt"):
-                        with open(os.path.join(self.docs_dir, filename), "r", encoding="utf-8") as f:
-                            all_text += f.read() + "\n\n"
-            
-            if not all_text.strip():
-                print(f"Warning: No text found in {self.docs_dir}")
-                return
+            snapshot = self._build_snapshot()
+            if snapshot is not None:
+                self.snapshot = snapshot
+                self._initialized = True
 
-            # Simple chunking by paragraph/section
-            self.chunks = [p.strip() for p in all_text.split("\n\n") if len(p.strip()) > 50]
-            
-            if not self.chunks:
-                print("Warning: No valid chunks found for RAG.")
-                return
+        except Exception as e:
+            print(f"Error during Advanced Lightweight RAG initialization: {e}")
+
+    def _docs_files(self) -> List[str]:
+        """Corpus files in a stable order, so the same content always gives the same corpus version."""
+        if not os.path.isdir(self.docs_dir):
+            return []
+        return sorted(f for f in os.listdir(self.docs_dir) if f.endswith(".txt"))
+
+    def _build_snapshot(self, previous: Optional[CorpusSnapshot] = None) -> Optional[CorpusSnapshot]:
+        """
+        Reads and chunks the docs directory and builds every index over it.
+        Returns `previous` unchanged if the corpus is identical, None if there is nothing to index.
+        """
+        if not os.path.exists(self.docs_dir):
+            print(f"Warning: RAG docs directory not found at {self.docs_dir}")
+            return None
 
-            # Batch embed chunks
-            print(f"Embedding {len(self.chunks)} chunks...")
+        # Load documents in a stable order and chunk them by structure and token budget
+        documents = []
+        for filename in self._docs_files():
+            with open(os.path.join(self.docs_dir, filename), "r", encoding="utf-8") as f:
+                documents.append((filename, f.read()))
+
+        if not any(text.strip() for _, text in documents):
+            print(f"Warning: No text found in {self.docs_dir}")
+            return None
+
+        chunk_meta = self.chunker.chunk_documents(documents)
+        chunks = chunk_meta.texts
+
+        if not chunks:
+            print("Warning: No valid chunks found for RAG.")
+            return None
+
+        corpus_version = content_hash("\n\n".join(chunks))[:16]
+        if previous is not None and previous.corpus_version == corpus_version:
+            return previous
+
+        # Build the BM25 keyword index once; queries only touch matching postings
+        keyword_index = KeywordIndex(chunks)
+
+        # Reuse persisted embeddings; only new or edited chunks hit the API
+        try:
+            embeddings = self.embedding_store.resolve(chunks, self._embed_texts)
+            ann_index = self._load_or_build_ann(embeddings, corpus_version)
+            print(
+                f"Advanced Lightweight RAG Engine ready with {len(chunks)} chunks "
+                f"({self.embedding_store.last_reused} from disk, {self.embedding_store.last_embedded} embedded)."
+            )
+        except Exception as e:
+            print(f"Warning: Failed to embed RAG chunks: {e}")
+            print("RAG Engine will operate in keyword-only mode.")
+            embeddings = None
+            ann_index = None
+
+        return CorpusSnapshot(chunks, embeddings, keyword_index, ann_index, corpus_version, chunk_meta)
+
+    async def reload(self) -> Dict[str, Any]:
+        """
+        Re-reads the corpus and swaps in a new snapshot without a restart.
+        Only new or edited chunks are embedded (content-hash store). The build
+        runs in a worker thread; retrievals already running keep the old snapshot.
+        """
+        if self._reloading:
+            return {"reloaded": False, "reason": "reload already in progress"}
+        # Held across both paths, so a first initialization never runs alongside a rebuild
+        self._reloading = True
+        try:
+            if not self._initialized:
+                await asyncio.to_thread(self.initialize)
+                return {"reloaded": self._initialized, "corpus_version": self.snapshot.corpus_version,
+                        "chunks": len(self.snapshot.chunks)}
+            previous = self.snapshot
+            snapshot = await asyncio.to_thread(self._build_snapshot, previous)
+        finally:
+            self._reloading = False
+
+        if snapshot is None or snapshot is previous:
+            return {"reloaded": False, "corpus_version": previous.corpus_version, "chunks": len(previous.chunks)}
+
+        self.snapshot = snapshot
+        result = {
+            "reloaded": True,
+            "corpus_version": snapshot.corpus_version,
+            "chunks": len(snapshot.chunks),
+            "embedded": self.embedding_store.last_embedded,
+            "reused": self.embedding_store.last_reused,
+        }
+        await self.log_behavior("corpus_reload", self.docs_dir, result)
+        return result
+
+    def _docs_signature(self) -> List[tuple]:
+        """(name, mtime, size) of every corpus file; cheap change detection for the watcher."""
+        signature = []
+        for filename in self._docs_files():
             try:
-                resp = self.mistral_client.embeddings.create(
-                    model="mistral-embed",
-                    inputs=self.chunks
-                )
-                self.embeddings = [e.embedding for e in resp.data]
-                self._initialized = True
-                print(f"Advanced Lightweight RAG Engine ready with {len(self.chunks)} chunks.")
+                st = os.stat(os.path.join(self.docs_dir, filename))
+                signature.append((filename, st.st_mtime_ns, st.st_size))
+            except OSError:
+                continue
+        return signature
+
+    async def watch_corpus(self, interval: float):
+        """Polls the docs directory and reloads when a file is added, removed or edited."""
+        last = await asyncio.to_thread(self._docs_signature)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                current = await asyncio.to_thread(self._docs_signature)
+                if current != last:
+                    last = current
+                    result = await self.reload()
+                    print(f"RAG corpus change detected: {result}")
             except Exception as e:
-                print(f"Warning: Failed to embed RAG chunks: {e}")
-                print("RAG Engine will operate in keyword-only mode.")
-                self.embeddings = []
-                self._initialized = True
+                print(f"Error watching RAG corpus: {e}")
 
-        except Exception as e:
-            print(f"Error during Advanced Lightweight RAG initialization: {e}")
+    def _load_or_build_ann(self, embeddings: np.ndarray, corpus_version: str) -> Optional[IVFIndex]:
+        """
+        Returns the IVF index when this deployment uses approximate search.
+        RAG_INDEX_MODE: 'exact' never, 'ivf' always, 'auto' once the corpus
+        reaches RAG_ANN_MIN_CHUNKS chunks.
+        """
+        n = embeddings.shape[0]
+        if RAG_INDEX_MODE == "exact" or (RAG_INDEX_MODE == "auto" and n < RAG_ANN_MIN_CHUNKS):
+            return None
+        index = IVFIndex.load(self.index_dir, corpus_version, n_lists=RAG_IVF_LISTS)
+        if index is None:
+            print(f"Building IVF index over {n} chunks...")
+            index = IVFIndex.build(np.asarray(embeddings), n_lists=RAG_IVF_LISTS)
+            try:
+                index.save(self.index_dir, corpus_version)
+            except OSError as e:
+                print(f"Warning: Could not persist IVF index: {e}")
+        return index
+
+    def _semantic_scores(self, snap: CorpusSnapshot, query_emb: np.ndarray, k_scores: np.ndarray) -> np.ndarray:
+        """
+        Cosine score per chunk. Exact search scores every row with one mat-vec
+        product. With an IVF index only the probed clusters plus the best
+        keyword matches are scored; every other row gets -inf.
+        """
+        if snap.ann_index is None:
+            return snap.embeddings @ query_emb
+        rows = snap.ann_index.candidates(query_emb, self.ann_n_probe)
+        keyword_rows = self._top_k_indices(k_scores, 10)
+        rows = np.union1d(rows, keyword_rows[k_scores[keyword_rows] > 0])
+        v_scores = np.full(len(snap.chunks), -np.inf, dtype=np.float32)
+        v_scores[rows] = snap.embeddings[rows] @ query_emb
+        return v_scores
+
+    @staticmethod
+    def _query_fingerprint(query: str) -> str:
+        """
+        Hash of the query lower-cased with whitespace collapsed, so case and spacing variants
+        share cache entries. Punctuation and symbols are kept: "C++", "C#" and "C" differ.
+        """
+        normalized = " ".join(query.lower().split())
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the retrieval, query-embedding and CRAG verdict caches."""
+        stats = dict(self.cache_stats)
+        for name in ("retrieval", "embedding", "crag"):
+            total = stats[f"{name}_hits"] + stats[f"{name}_misses"]
+            stats[f"{name}_hit_rate"] = round(stats[f"{name}_hits"] / total, 3) if total else 0.0
+        stats["corpus_version"] = self.snapshot.corpus_version
+        stats["embedding_batching"] = dict(self.embedding_coalescer.stats)
+        stats["input_guardrail"] = dict(self.guardrail_stats, model_trained_on=self.input_guardrail.trained_on)
+        return stats
+
+    async def _embed_query(self, query: str, fingerprint: str) -> np.ndarray:
+        """Normalised query embedding, served from the query-embedding cache when possible."""
+        cache_key = f"rag:qemb:mistral-embed:{fingerprint}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            self.cache_stats["embedding_hits"] += 1
+            return cached
+        self.cache_stats["embedding_misses"] += 1
+        query_emb = await self.embedding_coalescer.embed(query)
+        # Embeddings depend only on the text, not the corpus: keep for a week
+        cache.set(cache_key, query_emb, expire=7 * 86400)
+        return query_emb
+
+    async def _embed_batch_async(self, texts: List[str]) -> np.ndarray:
+        """One embeddings request for a coalesced batch of query texts."""
+        async with self.llm_limiter:
+            resp = await self.mistral_client.embeddings.create_async(
+                model="mistral-embed",
+                inputs=texts
+            )
+        return self._to_matrix([e.embedding for e in resp.data])
+
+    def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Embeds a batch of chunk texts into normalised matrix rows."""
+        resp = self.mistral_client.embeddings.create(
+            model="mistral-embed",
+            inputs=texts
+        )
+        return self._to_matrix([e.embedding for e in resp.data])
+
+    @staticmethod
+    def _to_matrix(vectors: List[List[float]]) -> np.ndarray:
+        """Stacks embeddings into a contiguous float32 matrix with unit-length rows."""
+        matrix = np.ascontiguousarray(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        return matrix
+
+    @staticmethod
+    def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k highest scores, best first, without a full sort."""
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        if k < len(scores):
+            idx = np.argpartition(scores, -k)[-k:]
+        else:
+            idx = np.arange(len(scores))
+        return idx[np.argsort(scores[idx])[::-1]]
 
     def _ensure_initialized(self):
         if not self._initialized:
@@ -126,12 +382,14 @@ class RAGEngine:
         try:
             log_doc = {
                 "event_type": f"rag_{event_type}",
-                "query": query[:100],
+                # Validated inputs are kept as checked: they are the local guardrail's training text
+                "query": query[:500] if event_type == "input_validation" else query[:100],
                 "details": details,
                 "timestamp": time.time()
             }
-            # Using audit_logs for unified monitoring
-            await audit_logs.insert_one(log_doc)
+            # Using audit_logs for unified monitoring (write-behind queue when running)
+            if not audit_writer.submit(log_doc):
+                await audit_logs.insert_one(log_doc)
         except Exception as e:
             print(f"Error logging RAG behavior: {e}")
 
@@ -141,6 +399,13 @@ class RAGEngine:
         Detects: Assignments, malicious prompts, and prompt injection.
         """
         self._ensure_initialized()
+
+        local = self.input_guardrail.classify(query)
+        if local is not None:
+            self.guardrail_stats["local_safe" if local["safe"] else "local_blocked"] += 1
+            await self.log_behavior("input_validation", query, local)
+            return local
+        self.guardrail_stats["llm"] += 1
         
         prompt = (
             f"As a career coach assistant, evaluate the following user input: '{query}'\n\n"
@@ -154,13 +419,15 @@ class RAGEngine:
         )
         
         try:
-            resp = self.mistral_client.chat.complete(
-                model="ministral-14b-2512",
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
-                temperature=0.0
-            )
+            async with self.llm_limiter:
+                resp = await self.mistral_client.chat.complete_async(
+                    model="ministral-14b-2512",
+                    messages=[{"role": "user", "content": prompt}],
+                    response_format={"type": "json_object"},
+                    temperature=0.0
+                )
             result = json.loads(resp.choices[0].message.content)
+            result["source"] = "llm"
             
             # Additional layer of keyword-based injection detection
             injection_keywords = ["ignore previous", "system prompt", "you are now", "jailbreak", "dan mode"]
@@ -175,99 +442,145 @@ class RAGEngine:
             print(f"Input Guardrail Error: {e}")
             return {"safe": True, "reason": "Guardrail bypass (error)", "category": "relevant"}
 
-    def _get_keyword_score(self, query: str, chunk: str) -> float:
-        """Improved keyword matching score."""
-        query_words = set(re.findall(r'\w+', query.lower()))
-        if not query_words:
-            return 0.0
-        
-        chunk_words = re.findall(r'\w+', chunk.lower())
-        if not chunk_words:
-            return 0.0
-            
-        count = sum(1 for w in chunk_words if w in query_words)
-        # Use density-based score
-        return count / len(chunk_words)
+    async def train_guardrail(self, limit: int = 5000) -> Dict[str, Any]:
+        """
+        Fits the local guardrail model on recent LLM-labelled `rag_input_validation`
+        events. Local verdicts are excluded so the model never trains on itself.
+        """
+        texts, unsafe = [], []
+        try:
+            cursor = audit_logs.find(
+                {"event_type": "rag_input_validation", "details.source": {"$ne": "local"}},
+                {"query": 1, "details.safe": 1},
+            ).sort("timestamp", -1).limit(limit)
+            async for doc in cursor:
+                safe = (doc.get("details") or {}).get("safe")
+                if doc.get("query") and isinstance(safe, bool):
+                    texts.append(doc["query"])
+                    unsafe.append(not safe)
+            trained = await asyncio.to_thread(self.input_guardrail.fit, texts, unsafe)
+        except Exception as e:
+            print(f"Error training local input guardrail: {e}")
+            return {"trained": False, "examples": len(texts)}
+        if trained:
+            print(f"Local input guardrail trained on {len(texts)} logged validations.")
+        return {"trained": trained, "examples": len(texts)}
 
     async def retrieve(self, query: str, top_k: int = 3) -> List[str]:
         """Hybrid Search (Vector + Keyword) + Ranking."""
+        snap, ids, _, _ = await self._ranked_retrieve(query, top_k)
+        return [snap.chunks[i] for i in ids]
+
+    async def _ranked_retrieve(self, query: str, top_k: int = 3) -> Tuple[CorpusSnapshot, List[int], List[float], List[float]]:
+        """
+        Hybrid search returning (snapshot, chunk rows, hybrid scores, cosine scores), best first.
+        Rows index into the returned snapshot, which is pinned for the whole call. Cosine
+        scores are empty in keyword-only mode.
+        """
         self._ensure_initialized()
-        if not self.chunks or not self.mistral_client:
-            return []
+        # Pin one snapshot for the whole call; a concurrent reload swaps self.snapshot only
+        snap = self.snapshot
+        if not snap.chunks or not self.mistral_client:
+            return snap, [], [], []
             
         start_time = time.time()
+        fingerprint = self._query_fingerprint(query)
+        if snap.embeddings is None:
+            mode = "keyword"
+        elif snap.ann_index is not None:
+            mode = f"ivf{self.ann_n_probe}"
+        else:
+            mode = "hybrid"
+        cache_key = f"rag:ranked:{snap.corpus_version}:{mode}:{top_k}:{fingerprint}"
         try:
-            hybrid_scores = []
-            
-            if self.embeddings:
-                resp = self.mistral_client.embeddings.create(
-                    model="mistral-embed",
-                    inputs=[query]
-                )
-                query_emb = np.array(resp.data[0].embedding)
-                
-                for i, emb in enumerate(self.embeddings):
-                    v_score = np.dot(query_emb, np.array(emb))
-                    k_score = self._get_keyword_score(query, self.chunks[i])
-                    # Weighting: 0.7 Semantic, 0.3 Keyword
-                    combined = (0.7 * v_score) + (0.3 * k_score)
-                    hybrid_scores.append(combined)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                self.cache_stats["retrieval_hits"] += 1
+                await self.log_behavior("retrieval", query, {
+                    "latency": time.time() - start_time,
+                    "num_retrieved": len(cached["ids"]),
+                    "cached": True
+                })
+                return snap, cached["ids"], cached["scores"], cached.get("cosines", [])
+            self.cache_stats["retrieval_misses"] += 1
+
+            if snap.keyword_index is not None:
+                k_scores = snap.keyword_index.scores(query)
             else:
-                for i, chunk in enumerate(self.chunks):
-                    hybrid_scores.append(self._get_keyword_score(query, chunk))
-            
-            top_candidates_idx = np.argsort(hybrid_scores)[-10:][::-1]
-            candidates = [self.chunks[i] for i in top_candidates_idx]
+                k_scores = np.zeros(len(snap.chunks), dtype=np.float32)
+
+            if snap.embeddings is not None:
+                query_emb = await self._embed_query(query, fingerprint)
+                v_scores = self._semantic_scores(snap, query_emb, k_scores)
+                # Weighting: 0.7 Semantic, 0.3 Keyword
+                hybrid_scores = (0.7 * v_scores) + (0.3 * k_scores)
+            else:
+                v_scores = None
+                hybrid_scores = k_scores
+
+            top_candidates_idx = self._top_k_indices(hybrid_scores, 10)
+            top_candidates_idx = top_candidates_idx[np.isfinite(hybrid_scores[top_candidates_idx])]
             
-            if not candidates:
-                return []
+            if len(top_candidates_idx) == 0:
+                return snap, [], [], []
 
             # Skip reranking for now since Mistral API doesn't support it
             # Just return top candidates from hybrid search
-            results = candidates[:top_k]
-            await self.log_behavior("retrieval", query, {
+            ids = [int(i) for i in top_candidates_idx[:top_k]]
+            scores = [float(hybrid_scores[i]) for i in ids]
+            cosines = [float(v_scores[i]) for i in ids] if v_scores is not None else []
+            details = {
                 "latency": time.time() - start_time,
-                "num_candidates": len(candidates),
-                "num_retrieved": len(results)
-            })
-            # Cache results for 24 hours
-            cache_key = f"rag_retrieve_{query}_{top_k}"
-            cache.set(cache_key, results, expire=86400)
-            return results
+                "num_candidates": len(top_candidates_idx),
+                "num_retrieved": len(ids),
+                "search": mode
+            }
+            if snap.chunk_meta is not None:
+                details["context_tokens"] = int(snap.chunk_meta.token_counts[ids].sum())
+            await self.log_behavior("retrieval", query, details)
+            # Cache results for 24 hours (key is scoped to the corpus version)
+            cache.set(cache_key, {"ids": ids, "scores": scores, "cosines": cosines}, expire=86400)
+            return snap, ids, scores, cosines
 
         except Exception as e:
             print(f"Error during RAG retrieval: {e}")
-            return []
+            return snap, [], [], []
 
     async def retrieve_with_correction(self, query: str, top_k: int = 3) -> Dict[str, Any]:
         """
         Corrective RAG (CRAG) Pattern with Quality Evaluation.
         Returns: {'documents': List[str], 'quality_score': float, 'status': str}
         """
-        retrieved_docs = await self.retrieve(query, top_k=top_k)
+        snap, ids, scores, cosines = await self._ranked_retrieve(query, top_k=top_k)
+        retrieved_docs = [snap.chunks[i] for i in ids]
         if not retrieved_docs:
             return {"documents": [], "quality_score": 0.0, "status": "no_results"}
 
+        # Confidence shortcut on the raw cosine, not the hybrid score: BM25 is max-normalised per
+        # query, so the best keyword match always gets the full keyword share however weak it is
+        min_cosine = min(cosines) if cosines else None
+        if min_cosine is not None and min_cosine >= RAG_CRAG_SKIP_COSINE:
+            self.cache_stats["crag_skipped"] += 1
+            await self.log_behavior("crag_evaluation", query, {"skipped": True, "min_cosine": min_cosine})
+            return {
+                "documents": retrieved_docs,
+                "quality_score": round(sum(scores) / len(scores), 3),
+                "status": "high_quality",
+                "needs_web_search": False
+            }
+
+        # Verdicts depend only on the query and the exact chunks, in order
+        chunk_ids = hashlib.sha1("|".join(content_hash(d) for d in retrieved_docs).encode("utf-8")).hexdigest()
+        verdict_key = f"rag:crag:{self._query_fingerprint(query)}:{chunk_ids}"
+
         try:
-            docs_summary = "\n\n".join([f"DOC {i+1}: {doc[:400]}..." for i, doc in enumerate(retrieved_docs)])
-            
-            prompt = (
-                f"Evaluate these {len(retrieved_docs)} documents for the query: '{query}'.\n\n"
-                f"Documents:\n{docs_summary}\n\n"
-                "Return ONLY a JSON object with these fields:\n"
-                "- 'relevance': array of booleans, one for each document in order (e.g., [true, false, true])\n"
-                "- 'quality_score': float between 0 and 1 (overall quality)\n"
-                "- 'needs_external_search': boolean (whether more info is needed)"
-            )
-            
-            eval_resp = self.mistral_client.chat.complete(
-                model="ministral-14b-2512",
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
-                temperature=0.0
-            )
-            
-            eval_data = json.loads(eval_resp.choices[0].message.content)
+            eval_data = cache.get(verdict_key)
+            if eval_data is not None:
+                self.cache_stats["crag_hits"] += 1
+            else:
+                self.cache_stats["crag_misses"] += 1
+                eval_data = await self._evaluate_documents(query, retrieved_docs)
+                cache.set(verdict_key, eval_data, expire=RAG_CRAG_CACHE_TTL)
             relevance_list = eval_data.get("relevance", [])
             
             # Validate relevance list is an array of booleans
@@ -276,7 +589,7 @@ class RAGEngine:
             
             # Ensure length matches
             if len(relevance_list) < len(retrieved_docs):
-                relevance_list.extend([True] * (len(retrieved_docs) - len(relevance_list)))
+                relevance_list = relevance_list + [True] * (len(retrieved_docs) - len(relevance_list))
             
             verified_docs = []
             for i, is_relevant in enumerate(relevance_list):
@@ -289,7 +602,8 @@ class RAGEngine:
                 status = "insufficient_data"
                 verified_docs = retrieved_docs[:1]
 
-            await self.log_behavior("crag_evaluation", query, eval_data)
+            # min_cosine next to the verdict is what RAG_CRAG_SKIP_COSINE is calibrated from
+            await self.log_behavior("crag_evaluation", query, {**eval_data, "min_cosine": min_cosine})
             
             return {
                 "documents": verified_docs,
@@ -302,6 +616,33 @@ class RAGEngine:
             print(f"CRAG Evaluation Error: {e}")
             return {"documents": retrieved_docs, "quality_score": 0.5, "status": "error"}
 
+    async def _evaluate_documents(self, query: str, retrieved_docs: List[str]) -> Dict[str, Any]:
+        """One LLM call grading the relevance of each retrieved document."""
+        # Chunks are token-bounded at index time, so they go into the prompt whole
+        docs_summary = "\n\n".join([f"DOC {i+1}: {doc}" for i, doc in enumerate(retrieved_docs)])
+
+        prompt = (
+            f"Evaluate these {len(retrieved_docs)} documents for the query: '{query}'.\n\n"
+            f"Documents:\n{docs_summary}\n\n"
+            "Return ONLY a JSON object with these fields:\n"
+            "- 'relevance': array of booleans, one for each document in order (e.g., [true, false, true])\n"
+            "- 'quality_score': float between 0 and 1 (overall quality)\n"
+            "- 'needs_external_search': boolean (whether more info is needed)"
+        )
+
+        async with self.llm_limiter:
+            eval_resp = await self.mistral_client.chat.complete_async(
+                model="ministral-14b-2512",
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
+                temperature=0.0
+            )
+
+        eval_data = json.loads(eval_resp.choices[0].message.content)
+        if not isinstance(eval_data, dict):
+            raise ValueError("CRAG evaluation is not a JSON object")
+        return eval_data
+
     async def validate_output(self, query: str, context: List[str], answer: str) -> Dict[str, Any]:
         """
         Output Guardrail: Ensures the answer is faithful to context and professional.
@@ -314,12 +655,13 @@ class RAGEngine:
         )
         
         try:
-            resp = self.mistral_client.chat.complete(
-                model="ministral-14b-2512",
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
-                temperature=0.0
-            )
+            async with self.llm_limiter:
+                resp = await self.mistral_client.chat.complete_async(
+                    model="ministral-14b-2512",
+                    messages=[{"role": "user", "content": prompt}],
+                    response_format={"type": "json_object"},
+                    temperature=0.0
+                )
             result = json.loads(resp.choices[0].message.content)
             await self.log_behavior("output_validation", query, result)
             return result
@@ -0,0 +1,109 @@
+"""
+Interview response cache.
+
+Only replies that can repeat across sessions are cached:
+- "greeting": the opening message, keyed by job title, difficulty, interview length
+  and a hash of the candidate profile
+- "force_end": the closing message of a session ended before the candidate answered
+  anything, keyed by job title, difficulty and the end instruction. A closing written
+  after answers comments on that candidate's transcript and is never shared.
+
+Keys are short SHA-1 digests of those fields, so nothing beyond a few strings is
+hashed per call. A small in-memory LRU sits in front of the shared disk cache,
+which keeps entries across restarts and worker processes.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from .cache_manager import cache
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.sha1("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    KINDS = ("greeting", "force_end")
+
+    def __init__(self, max_items: int = 512, expire: int = 1800, disk=cache):
+        self.max_items = max(1, max_items)
+        self.expire = expire
+        self.disk = disk
+        # key -> (turn, monotonic expiry)
+        self._memory: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            kind: {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+            for kind in self.KINDS
+        }
+
+    @staticmethod
+    def key_for(history, job_title: str, resume_feedback: Any, questions_limit: int,
+                difficulty: str, current_asked_count: int, force_end: bool) -> Optional[str]:
+        """Cache key for a reply that can repeat, or None when the reply is turn-specific."""
+        if force_end:
+            # Any earlier user entry is an answer the closing message would talk about
+            if any(m.get("role") == "user" for m in history[:-1]):
+                return None
+            last = history[-1]["content"] if history else ""
+            return f"interview:reply:force_end:{_digest(job_title, difficulty, last)}"
+        if not history and current_asked_count == 0:
+            profile = resume_feedback if isinstance(resume_feedback, str) else repr(resume_feedback or "")
+            return f"interview:reply:greeting:{_digest(job_title, difficulty, questions_limit, _digest(profile))}"
+        return None
+
+    @staticmethod
+    def _kind(key: str) -> str:
+        return key.split(":")[2]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        kind = self._kind(key)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] > time.monotonic():
+                    self._memory.move_to_end(key)
+                    self.stats[kind]["memory_hits"] += 1
+                    return entry[0]
+                del self._memory[key]
+        try:
+            value = self.disk.get(key)
+        except Exception as e:
+            print(f"Response cache read failed: {e}")
+            value = None
+        with self._lock:
+            if value is None:
+                self.stats[kind]["misses"] += 1
+                return None
+            self.stats[kind]["disk_hits"] += 1
+            self._remember(key, value)
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]):
+        if not value:
+            return
+        with self._lock:
+            self.stats[self._kind(key)]["stores"] += 1
+            self._remember(key, value)
+        try:
+            self.disk.set(key, value, expire=self.expire)
+        except Exception as e:
+            print(f"Response cache write failed: {e}")
+
+    def _remember(self, key: str, value: Dict[str, Any]):
+        self._memory[key] = (value, time.monotonic() + self.expire)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-kind hit/miss counters and hit rate, plus the size of the memory tier."""
+        with self._lock:
+            out: Dict[str, Any] = {"memory_items": len(self._memory)}
+            for kind, s in self.stats.items():
+                hits = s["memory_hits"] + s["disk_hits"]
+                total = hits + s["misses"]
+                out[kind] = dict(s, hit_rate=round(hits / total, 3) if total else 0.0)
+        return out
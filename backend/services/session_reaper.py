@@ -0,0 +1,108 @@
+"""
+Background reaper for abandoned interview sessions.
+
+Every `interval` seconds, open sessions whose `last_activity_at` is older than
+`idle_timeout` are closed (`ended_at` set, `ended_reason: "idle"`). Sessions
+are selected through the partial index on open sessions, oldest activity
+first, and closed `batch_size` at a time, at most `max_batches` per pass, so a
+large backlog is worked off over several passes instead of one long scan.
+The close is conditional on the session still being open and idle, so a turn
+landing mid-pass keeps its session alive. Active sessions survive restarts.
+"""
+import asyncio
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from ..core.db import interviews
+from ..core.config import (
+    INTERVIEW_IDLE_TIMEOUT_MINUTES,
+    INTERVIEW_REAPER_INTERVAL,
+    INTERVIEW_REAPER_BATCH,
+)
+from .utils import get_malaysia_time
+
+# Matches the partial index filter in core/indexes.py; `ended_at: None` would also match
+# documents without the field and could not use the index
+OPEN_SESSION = {"ended_at": {"$type": "null"}}
+
+
+class SessionReaper:
+    def __init__(self, collection, idle_timeout: timedelta = timedelta(hours=1),
+                 interval: float = 300.0, batch_size: int = 200, max_batches: int = 10):
+        self.collection = collection
+        self.idle_timeout = idle_timeout
+        self.interval = interval
+        self.batch_size = max(1, batch_size)
+        self.max_batches = max(1, max_batches)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.stats = {"passes": 0, "reaped": 0, "failed_passes": 0, "last_pass_at": None}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Starts the periodic reaper on the running event loop; the first pass runs right away."""
+        if self.running:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await self.reap_once()
+            except Exception as e:
+                self.stats["failed_passes"] += 1
+                print(f"Error reaping idle interview sessions: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def reap_once(self) -> int:
+        """One pass: closes up to max_batches * batch_size idle sessions; returns how many."""
+        now = get_malaysia_time()
+        idle = {**OPEN_SESSION, "last_activity_at": {"$lt": now - self.idle_timeout}}
+        reaped = 0
+        for _ in range(self.max_batches):
+            if self._stopping:
+                break
+            cur = self.collection.find(idle, {"_id": 1}).sort("last_activity_at", 1).limit(self.batch_size)
+            ids = [d["_id"] async for d in cur]
+            if not ids:
+                break
+            res = await self.collection.update_many(
+                {"_id": {"$in": ids}, **idle},
+                {"$set": {"ended_at": now, "ended_reason": "idle"}},
+            )
+            reaped += res.modified_count
+            if len(ids) < self.batch_size:
+                break
+        self.stats["passes"] += 1
+        self.stats["reaped"] += reaped
+        self.stats["last_pass_at"] = now
+        return reaped
+
+    async def stop(self):
+        """Stops the reaper after the batch in progress."""
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, running=self.running, idle_timeout_minutes=self.idle_timeout.total_seconds() / 60)
+
+
+# Global reaper for the interviews collection
+session_reaper = SessionReaper(
+    interviews,
+    idle_timeout=timedelta(minutes=INTERVIEW_IDLE_TIMEOUT_MINUTES),
+    interval=INTERVIEW_REAPER_INTERVAL,
+    batch_size=INTERVIEW_REAPER_BATCH,
+)
@@ -0,0 +1,100 @@
+"""
+Write-behind telemetry pipeline for audit_logs.
+
+Request handlers append log documents to a bounded in-memory queue; a
+background task drains it with `insert_many` every `flush_interval` seconds,
+or sooner once a full batch is waiting. When the queue is full new events are
+dropped and counted rather than slowing the request down. The remaining
+queue is flushed on shutdown.
+
+Until `start()` is called (e.g. scripts, tests) `submit()` returns False and
+callers fall back to a direct insert.
+"""
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from ..core.db import audit_logs
+from ..core.config import AUDIT_QUEUE_MAX, AUDIT_BATCH_SIZE, AUDIT_FLUSH_INTERVAL
+
+
+class TelemetryWriter:
+    def __init__(self, collection, max_queue: int = 10000, batch_size: int = 500, flush_interval: float = 1.0):
+        self.collection = collection
+        self.max_queue = max(1, max_queue)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.stats = {"enqueued": 0, "written": 0, "dropped": 0, "failed": 0, "flushes": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Starts the background flusher on the running event loop."""
+        if self.running:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def submit(self, doc: Dict[str, Any]) -> bool:
+        """
+        Queues one document. Returns False when the writer is not running, so the
+        caller can write it directly; a full queue drops the event (counted).
+        """
+        if not self.running:
+            return False
+        if len(self._queue) >= self.max_queue:
+            self.stats["dropped"] += 1
+            return True
+        self._queue.append(doc)
+        self.stats["enqueued"] += 1
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Writes everything queued so far in insert_many batches; returns the number written."""
+        written = 0
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            try:
+                await self.collection.insert_many(batch, ordered=False)
+                written += len(batch)
+                self.stats["written"] += len(batch)
+            except Exception as e:
+                self.stats["failed"] += len(batch)
+                print(f"Error flushing {len(batch)} audit log events: {e}")
+            self.stats["flushes"] += 1
+        return written
+
+    async def stop(self):
+        """Stops the flusher and writes whatever is still queued."""
+        if self._task is not None:
+            # Let the loop finish its current batch instead of cancelling mid-insert
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, queued=len(self._queue), running=self.running)
+
+
+# Global writer for the audit_logs collection
+audit_writer = TelemetryWriter(audit_logs, AUDIT_QUEUE_MAX, AUDIT_BATCH_SIZE, AUDIT_FLUSH_INTERVAL)
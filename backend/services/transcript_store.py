@@ -0,0 +1,102 @@
+"""
+Interview transcript store.
+
+Each transcript entry is its own document in `interview_turns`:
+    {session_id, seq, role, text, at}
+with a unique (session_id, seq) index (declared in core/indexes.py). The session document only keeps
+`turn_count`, so session reads stay small no matter how long the interview
+runs, and transcripts are read in seq ranges instead of as one array.
+
+Writers claim a seq range by incrementing `turn_count` in their guarded
+session update first, then insert the entries at those seqs; the unique
+index rejects anything that would reuse a seq. Sessions created before the store
+still carry an embedded `transcript` until migrated, either by the startup
+migration or on first use (migrate_session); writers refuse them until then.
+"""
+from typing import Any, Dict, List
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError
+from ..core.db import interview_turns
+
+
+class TranscriptStore:
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def append(self, session_id: str, start_seq: int, entries: List[Dict[str, Any]]):
+        """Stores `entries` at seqs start_seq, start_seq + 1, ..."""
+        if not entries:
+            return
+        docs = [
+            {"session_id": session_id, "seq": start_seq + i, "role": e["role"], "text": e["text"], "at": e.get("at")}
+            for i, e in enumerate(entries)
+        ]
+        await self.collection.insert_many(docs, ordered=True)
+
+    async def read(self, session_id: str, start: int = 0, limit: int = 0) -> List[Dict[str, Any]]:
+        """Entries with seq >= start in order; at most `limit` of them when limit > 0."""
+        cur = self.collection.find(
+            {"session_id": session_id, "seq": {"$gte": max(0, start)}},
+            {"_id": 0, "seq": 1, "role": 1, "text": 1, "at": 1},
+        ).sort("seq", ASCENDING)
+        if limit > 0:
+            cur = cur.limit(limit)
+        return [t async for t in cur]
+
+    async def page(self, session_id: str, after: int = -1, limit: int = 50) -> Dict[str, Any]:
+        """One page of entries after seq `after`; `next_after` is None on the last page."""
+        limit = max(1, min(limit, 200))
+        # One extra entry tells whether another page exists
+        items = await self.read(session_id, start=after + 1, limit=limit + 1)
+        more = len(items) > limit
+        items = items[:limit]
+        return {"items": items, "next_after": items[-1]["seq"] if more else None}
+
+    async def has_user_turn(self, session_id: str) -> bool:
+        """Whether the candidate answered at least once (with non-blank text)."""
+        hit = await self.collection.find_one(
+            {"session_id": session_id, "role": "user", "text": {"$regex": r"\S"}}, {"_id": 1}
+        )
+        return hit is not None
+
+    async def delete(self, session_id: str):
+        await self.collection.delete_many({"session_id": session_id})
+
+    async def migrate_session(self, sessions, s: Dict[str, Any]) -> bool:
+        """
+        Moves one session's legacy embedded `transcript` into the store and replaces it with
+        `turn_count`. Safe to rerun and to race with itself: entries already stored are skipped
+        by the unique index, and only the first run that finds the array still there sets
+        `turn_count`, so a run working from a stale read cannot rewind turns written since.
+        Returns False when the entries could not be stored; the session is then left as it was.
+        """
+        transcript = s.get("transcript") or []
+        docs = [
+            {"session_id": s["session_id"], "seq": i, "role": t.get("role"),
+             "text": t.get("text", ""), "at": t.get("at")}
+            for i, t in enumerate(transcript)
+        ]
+        if docs:
+            try:
+                await self.collection.insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                # Duplicate seqs come from an interrupted or concurrent run; anything else skips this session
+                if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                    print(f"Transcript migration failed for {s['session_id']}: {e}")
+                    return False
+        await sessions.update_one(
+            {"_id": s["_id"], "transcript": {"$exists": True}},
+            {"$set": {"turn_count": len(transcript)}, "$unset": {"transcript": ""}},
+        )
+        return True
+
+    async def migrate_embedded(self, sessions) -> int:
+        """Runs migrate_session over every session still carrying a `transcript`; returns how many moved."""
+        moved = 0
+        cur = sessions.find({"transcript": {"$exists": True}}, {"session_id": 1, "transcript": 1})
+        async for s in cur:
+            if await self.migrate_session(sessions, s):
+                moved += 1
+        return moved
+
+transcript_store = TranscriptStore(interview_turns)
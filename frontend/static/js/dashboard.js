@@ -307,7 +307,7 @@ const app = createApp({
         // If no local feedback but logged in, fetch from server
         if (!autoloadDisabled && !this.feedback && this.logged) {
           try {
-            const r = await axios.get('/api/resume/my');
+            const r = await axios.get('/api/resume/my?limit=1');
             const items = r.data || [];
             if (items && items.length > 0) {
               const latest = items.sort((a, b) => new Date(b.created_at) - new Date(a.created_at))[0];
@@ -339,7 +339,7 @@ const app = createApp({
       await Promise.allSettled([
         (async () => {
           try {
-            const r = await axios.get('/api/interview/history');
+            const r = await axios.get('/api/interview/history?limit=1&summary=true');
             if (r.status === 200) {
               const j = r.data;
               this.hasHistory = Array.isArray(j) && j.length > 0;
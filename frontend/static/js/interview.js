@@ -327,7 +327,7 @@ const app = createApp({
                     // from old test sessions appearing on the interview page.
                     if (!this.hasResume && this.hasAnalyzed) {
                         try {
-                            const r = await axios.get(window.icp.apiUrl('/api/resume/my'));
+                            const r = await axios.get(window.icp.apiUrl('/api/resume/my?limit=1'));
                             if (this._isUnmounted) return;
                             const items = r.data || [];
                             if (items && items.length > 0) {
@@ -653,6 +653,7 @@ const app = createApp({
             }
 
             this.thinking = true;
+            let streamed = null;
             
             try {
                 // Client-side invalid handler using strict InvalidGuard
@@ -695,13 +696,22 @@ const app = createApp({
                 
                 const fd = new FormData();
                 fd.append('user_text', userAnswer);
-                const response = await axios.post(window.icp.apiUrl(`/api/interview/${this.sessionId}/reply`), fd);
+                // Tokens are shown as they arrive; the final message may be corrected and replaces them
+                const data = await this.postReplyStream(fd, (text) => {
+                    if (this._isUnmounted) return;
+                    if (!streamed) {
+                        this.thinking = false;
+                        this.transcript.push({ role: 'ai', content: '' });
+                        streamed = this.transcript[this.transcript.length - 1];
+                    }
+                    streamed.content += text;
+                });
                 
                 if (this._isUnmounted) return;
                 
-                const msg = response.data.message;
-                const ended = !!response.data.ended;
-                this.transcript.push({ role: 'ai', content: msg });
+                const msg = data.message;
+                const ended = !!data.ended;
+                if (streamed) streamed.content = msg; else this.transcript.push({ role: 'ai', content: msg });
                 if (window.InvalidGuard) window.InvalidGuard.reset(); else this.invalidLocalAttempts = 0;
                 
                 if (ended) {
@@ -710,10 +720,10 @@ const app = createApp({
                     this.interviewAttempts = Math.max(0, this.interviewAttempts - 1);
                     
                     // Extract score and feedback for display - use structured data if available
-                    if (response.data.score !== undefined) {
-                        this.readinessScore = response.data.score;
-                        this.readinessBreakdown = response.data.breakdown || null;
-                        this.feedbackExplanation = response.data.feedback || msg;
+                    if (data.score !== undefined) {
+                        this.readinessScore = data.score;
+                        this.readinessBreakdown = data.breakdown || null;
+                        this.feedbackExplanation = data.feedback || msg;
                     } else {
                         // Fallback to extraction if not provided as structured data
                         const match = /Interview Readiness Score:\s*(\d+)\/100/i.exec(msg);
@@ -736,7 +746,7 @@ const app = createApp({
                     if (this.speaker) this.speak(msg); // Speak the whole concluding message
                     this.resetUIState();
                 } else {
-                    const asked = typeof response.data.asked_count !== 'undefined' ? parseInt(response.data.asked_count) : null;
+                    const asked = typeof data.asked_count !== 'undefined' ? parseInt(data.asked_count) : null;
                     if (!isNaN(asked) && asked > 0) {
                         this.currentQuestion = asked;
                     }
@@ -756,6 +766,7 @@ const app = createApp({
                 });
                 // Restore answer in case of error
                 this.answer = userAnswer; 
+                if (streamed) this.transcript.pop(); // Remove the partial AI reply
                 this.transcript.pop(); // Remove user message from transcript
             } finally {
                 if (!this._isUnmounted) {
@@ -765,6 +776,36 @@ const app = createApp({
             }
         },
         
+        async postReplyStream(fd, onToken) {
+            // Server-Sent Events over fetch (EventSource cannot POST); resolves with the "done" body
+            const token = window.icp && window.icp.state ? window.icp.state.token : localStorage.getItem("token");
+            const res = await fetch(window.icp.apiUrl(`/api/interview/${this.sessionId}/reply/stream`), {
+                method: 'POST',
+                headers: token ? { 'Authorization': 'Bearer ' + token } : {},
+                body: fd
+            });
+            if (!res.ok || !res.body) throw new Error(`Reply stream failed (${res.status})`);
+            const reader = res.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                let sep;
+                while ((sep = buffer.indexOf('\n\n')) !== -1) {
+                    const block = buffer.slice(0, sep);
+                    buffer = buffer.slice(sep + 2);
+                    const event = (/^event: (.*)$/m.exec(block) || [])[1];
+                    const data = JSON.parse((/^data: (.*)$/m.exec(block) || [null, '{}'])[1]);
+                    if (event === 'token') onToken(data.text);
+                    else if (event === 'done') return data;
+                    else if (event === 'error') throw new Error(data.detail || 'Reply stream failed');
+                }
+            }
+            throw new Error('Reply stream ended without a result');
+        },
+        
         isLikelyGibberish(text) {
             // Centralize gibberish detection to app.js logic if available
             if (window.icp && window.icp.isGibberish) {
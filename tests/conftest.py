@@ -51,12 +51,13 @@ def _col():
         def __aiter__(self): return self
         async def __anext__(self): raise StopAsyncIteration
         def sort(self, *a, **kw): return self
+        def limit(self, n): return self
 
     c.find = MagicMock(return_value=_Cur())
     return c
 
 for _name in ["users","pending_users","reset_tokens",
-              "resumes","interviews","audit_logs","usage"]:
+              "resumes","interviews","interview_turns","audit_logs","usage","migrations"]:
     setattr(_db, _name, _col())
 
 # Add event loop policy fixture for pytest-asyncio
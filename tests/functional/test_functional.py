@@ -12,7 +12,7 @@ from docx import Document
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 if ROOT not in sys.path: sys.path.insert(0, ROOT)
 
-from tests.integration.helpers import make_jwt, patch_all_db
+from tests.integration.helpers import make_jwt, make_turn, patch_all_db
 
 UID = "507f191e810c19729de860ea"
 
@@ -209,8 +209,8 @@ class TestF006MockInterviewFlow:
         # Start
         patch_all_db(users_val=user,
                      resumes_val={"feedback": {}, "job_title": "Software Engineer"})
-        with patch("backend.controllers.interview_routes.interview_reply",
-                   return_value="Tell me about yourself."):
+        with patch("backend.controllers.interview_routes.interview_reply", new_callable=AsyncMock,
+                   return_value=make_turn("Tell me about yourself.")):
             r = await ac.post("/api/interview/start",
                 data={"job_title": "Software Engineer",
                       "difficulty": "Beginner", "questions_limit": "10"},
@@ -220,8 +220,8 @@ class TestF006MockInterviewFlow:
 
         # Reply
         patch_all_db(users_val=user, interviews_val=session)
-        with patch("backend.controllers.interview_routes.interview_reply",
-                   return_value="What is your greatest strength?"), \
+        with patch("backend.controllers.interview_routes.interview_reply", new_callable=AsyncMock,
+                   return_value=make_turn("What is your greatest strength?")), \
              patch("backend.controllers.interview_routes.rag_engine.validate_input",
                    new_callable=AsyncMock, return_value={"safe": True}):
             r2 = await ac.post(f"/api/interview/{SID}/reply",
@@ -231,8 +231,8 @@ class TestF006MockInterviewFlow:
 
         # End
         patch_all_db(users_val=user, interviews_val=session)
-        with patch("backend.controllers.interview_routes.interview_reply",
-                   return_value="Thank you. Session closed. [FINISH]"):
+        with patch("backend.controllers.interview_routes.interview_reply", new_callable=AsyncMock,
+                   return_value=make_turn("Thank you. Session closed.", finished=True)):
             r3 = await ac.post(f"/api/interview/{SID}/end",
                                headers={"Authorization": f"Bearer {make_jwt(UID)}"})
         assert r3.status_code == 200
@@ -16,6 +16,12 @@ def make_jwt(user_id: str = "507f191e810c19729de860ea",
         secret, algorithm="HS256")
 
 
+def make_turn(message: str, finished: bool = False, score=None, breakdown=None) -> dict:
+    """Interview turn as returned by interview_engine.interview_reply."""
+    return {"message": message, "asks_question": "?" in message, "finished": finished,
+            "score": score, "breakdown": breakdown}
+
+
 class _AsyncCursor:
     """Proper async iterator for mocking Motor cursors."""
     def __init__(self, items):
@@ -30,6 +36,20 @@ class _AsyncCursor:
         return v
     def sort(self, *a, **kw):
         return self
+    def limit(self, n):
+        self._items = self._items[:n]
+        return self
+
+
+def _apply_update(doc, update):
+    """Minimal $set / $inc / $push($each) applied to a copy of `doc`."""
+    doc = {**doc, **update.get("$set", {})}
+    for k, v in update.get("$inc", {}).items():
+        doc[k] = (doc.get(k) or 0) + v
+    for k, v in update.get("$push", {}).items():
+        items = v["$each"] if isinstance(v, dict) and "$each" in v else [v]
+        doc[k] = list(doc.get(k) or []) + list(items)
+    return doc
 
 
 def make_col(find_one_val=None, find_items=None,
@@ -40,12 +60,24 @@ def make_col(find_one_val=None, find_items=None,
     col.insert_one      = AsyncMock(return_value=MagicMock(inserted_id=inserted_id))
     col.update_one      = AsyncMock(return_value=MagicMock(modified_count=modified_count))
     col.delete_one      = AsyncMock(return_value=MagicMock(deleted_count=deleted_count))
+    col.insert_many     = AsyncMock()
+    col.delete_many     = AsyncMock(return_value=MagicMock(deleted_count=deleted_count))
+    col.find_one_and_delete = AsyncMock(
+        return_value={"_id": inserted_id, "session_id": inserted_id} if deleted_count else None)
+    col.find_one_and_update = AsyncMock(
+        side_effect=lambda flt, update, **kw: None if find_one_val is None else _apply_update(find_one_val, update))
     col.create_index    = AsyncMock()
     col.count_documents = AsyncMock(return_value=0)
     col.find            = MagicMock(return_value=_AsyncCursor(find_items or []))
     return col
 
 
+def serve_turns(col, turns):
+    """Makes a mocked interview_turns collection answer seq-range finds from `turns`."""
+    col.find.side_effect = lambda flt, proj=None: _AsyncCursor(
+        t for t in turns if t["seq"] >= flt["seq"]["$gte"])
+
+
 # Modules that import db collections directly (need patching at each binding)
 _DB_CONSUMERS = [
     "backend.core.db",
@@ -61,7 +93,7 @@ _DB_CONSUMERS = [
 
 def patch_all_db(users_val=None, pending_val=None, reset_val=None,
                  resumes_val=None, interviews_val=None,
-                 resumes_items=None, interviews_items=None,
+                 resumes_items=None, interviews_items=None, turns_items=None,
                  deleted_count=1, modified_count=1):
     """
     Replace every imported collection reference across all controller/service
@@ -77,10 +109,12 @@ def patch_all_db(users_val=None, pending_val=None, reset_val=None,
     inv = make_col(find_one_val=interviews_val, find_items=interviews_items,
                    deleted_count=deleted_count)
     al  = make_col()
+    it  = make_col(find_items=turns_items)
 
     mapping = {
         "users": u, "pending_users": pu, "reset_tokens": rt,
         "resumes": res, "interviews": inv, "audit_logs": al,
+        "interview_turns": it,
     }
 
     for mod_name in _DB_CONSUMERS:
@@ -94,4 +128,8 @@ def patch_all_db(users_val=None, pending_val=None, reset_val=None,
             if hasattr(mod, attr):
                 setattr(mod, attr, val)
 
+    # The transcript store holds its collection on the instance
+    from backend.services.transcript_store import transcript_store
+    transcript_store.collection = it
+
     return mapping
@@ -143,3 +143,56 @@ class TestAdminMetrics:
                          headers={"Authorization": f"Bearer {make_jwt(ADMIN_ID, 'admin')}"})
         assert r.status_code == 200
         assert "interview_count" in r.json()
+
+    @pytest.mark.asyncio
+    async def test_rag_stats_returns_cache_counters(self, ac):
+        patch_all_db(users_val=ADMIN)
+        r = await ac.get("/api/admin/rag/stats",
+                         headers={"Authorization": f"Bearer {make_jwt(ADMIN_ID, 'admin')}"})
+        assert r.status_code == 200
+        assert "retrieval_hits" in r.json()
+        assert "embedding_hit_rate" in r.json()
+
+    @pytest.mark.asyncio
+    async def test_rag_stats_forbidden_for_user(self, ac):
+        patch_all_db(users_val=USER)
+        r = await ac.get("/api/admin/rag/stats",
+                         headers={"Authorization": f"Bearer {make_jwt(USER_ID, 'user')}"})
+        assert r.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_rag_reload_calls_engine(self, ac):
+        from unittest.mock import patch
+        patch_all_db(users_val=ADMIN)
+        with patch("backend.controllers.admin_routes.rag_engine.reload",
+                   new_callable=AsyncMock,
+                   return_value={"reloaded": True, "chunks": 3}) as reload:
+            r = await ac.post("/api/admin/rag/reload",
+                              headers={"Authorization": f"Bearer {make_jwt(ADMIN_ID, 'admin')}"})
+        assert r.status_code == 200
+        assert r.json()["reloaded"] is True
+        reload.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_rag_reload_forbidden_for_user(self, ac):
+        patch_all_db(users_val=USER)
+        r = await ac.post("/api/admin/rag/reload",
+                          headers={"Authorization": f"Bearer {make_jwt(USER_ID, 'user')}"})
+        assert r.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_interview_prompt_stats(self, ac):
+        patch_all_db(users_val=ADMIN)
+        r = await ac.get("/api/admin/interview/prompt-stats",
+                         headers={"Authorization": f"Bearer {make_jwt(ADMIN_ID, 'admin')}"})
+        assert r.status_code == 200
+        assert "avg_prompt_bytes" in r.json()
+        assert "prefix_cache" in r.json()
+
+    @pytest.mark.asyncio
+    async def test_db_maintenance_stats(self, ac):
+        patch_all_db(users_val=ADMIN)
+        r = await ac.get("/api/admin/db/maintenance",
+                         headers={"Authorization": f"Bearer {make_jwt(ADMIN_ID, 'admin')}"})
+        assert r.status_code == 200
+        assert "status" in r.json()
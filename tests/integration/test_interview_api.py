@@ -7,7 +7,7 @@ from datetime import datetime, timezone, timedelta
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 if ROOT not in sys.path: sys.path.insert(0, ROOT)
 
-from tests.integration.helpers import make_jwt, patch_all_db
+from tests.integration.helpers import make_jwt, make_turn, patch_all_db, serve_turns
 
 UID = "507f191e810c19729de860ea"
 SID = "session-test-001"
@@ -23,8 +23,7 @@ SESSION = {
     "job_title": "Software Engineer", "resume_feedback": {},
     "questions_limit": 10, "difficulty": "Beginner",
     "asked_count": 1, "invalid_attempts": 0,
-    "transcript": [{"role": "assistant", "text": "Tell me about yourself.",
-                    "at": datetime.now(timezone.utc)}],
+    "turn_count": 1,
     "created_at": datetime.now(timezone.utc), "ended_at": None,
 }
 
@@ -54,8 +53,8 @@ class TestInterviewStart:
     async def test_start_returns_session_id(self, ac):
         patch_all_db(users_val=BASE_USER,
                      resumes_val={"feedback": {}, "job_title": "Software Engineer"})
-        with patch("backend.controllers.interview_routes.interview_reply",
-                   return_value="Tell me about yourself."):
+        with patch("backend.controllers.interview_routes.interview_reply", new_callable=AsyncMock,
+                   return_value=make_turn("Tell me about yourself.")):
             r = await ac.post("/api/interview/start",
                 data={"job_title": "Software Engineer", "difficulty": "Beginner",
                       "questions_limit": "10"},
@@ -63,12 +62,31 @@ class TestInterviewStart:
         assert r.status_code == 200
         assert "session_id" in r.json()
 
+    @pytest.mark.asyncio
+    async def test_start_stores_compact_profile(self, ac):
+        feedback = {"DetectedJobTitle": "Backend Developer", "Keywords": ["Python"],
+                    "Experience": [{"Company": "Acme", "Bullets": ["Built things"]}]}
+        cols = patch_all_db(users_val=BASE_USER,
+                            resumes_val={"feedback": feedback, "job_title": "Software Engineer"})
+        with patch("backend.controllers.interview_routes.interview_reply", new_callable=AsyncMock,
+                   return_value=make_turn("Tell me about yourself.")) as reply:
+            r = await ac.post("/api/interview/start",
+                data={"job_title": "Software Engineer", "difficulty": "Beginner",
+                      "questions_limit": "10"},
+                headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        assert r.status_code == 200
+        profile = "Detected Title: Backend Developer\nKeywords: Python"
+        assert reply.call_args.kwargs["resume_feedback"] == profile
+        doc = cols["interviews"].insert_one.call_args[0][0]
+        assert doc["candidate_profile"] == profile
+        assert doc["resume_feedback"] == feedback
+
     @pytest.mark.asyncio
     async def test_no_analysis_returns_400(self, ac):
         patch_all_db(users_val={**BASE_USER, "has_analyzed": False},
                      resumes_val=None)
-        with patch("backend.controllers.interview_routes.interview_reply",
-                   return_value="Hi"):
+        with patch("backend.controllers.interview_routes.interview_reply", new_callable=AsyncMock,
+                   return_value=make_turn("Hi")):
             r = await ac.post("/api/interview/start",
                 data={"job_title": "Engineer", "difficulty": "Beginner",
                       "questions_limit": "10"},
@@ -86,8 +104,8 @@ class TestInterviewStart:
         patch_all_db(users_val={**BASE_USER, "daily_interview_count": 3,
                                 "daily_reset_at": datetime.now(timezone.utc)},
                      resumes_val={"feedback": {}, "job_title": "Dev"})
-        with patch("backend.controllers.interview_routes.interview_reply",
-                   return_value="Hi"):
+        with patch("backend.controllers.interview_routes.interview_reply", new_callable=AsyncMock,
+                   return_value=make_turn("Hi")):
             r = await ac.post("/api/interview/start",
                 data={"job_title": "Dev", "difficulty": "Beginner",
                       "questions_limit": "10"},
@@ -99,8 +117,8 @@ class TestInterviewReply:
     @pytest.mark.asyncio
     async def test_valid_reply_returns_next_question(self, ac):
         patch_all_db(users_val=BASE_USER, interviews_val=SESSION)
-        with patch("backend.controllers.interview_routes.interview_reply",
-                   return_value="What is your greatest strength?"), \
+        with patch("backend.controllers.interview_routes.interview_reply", new_callable=AsyncMock,
+                   return_value=make_turn("What is your greatest strength?")), \
              patch("backend.controllers.interview_routes.rag_engine.validate_input",
                    new_callable=AsyncMock,
                    return_value={"safe": True, "category": "relevant"}):
@@ -110,6 +128,29 @@ class TestInterviewReply:
         assert r.status_code == 200
         assert "message" in r.json()
 
+    @pytest.mark.asyncio
+    async def test_final_turn_reads_structured_score(self, ac):
+        session = {**SESSION, "asked_count": 10}
+        cols = patch_all_db(users_val=BASE_USER, interviews_val=session)
+        final = make_turn("Thank you!\n\nSolid answers overall.", finished=True, score=80,
+                          breakdown={"technical": 24, "communication": 24, "alignment": 16, "relevance": 16})
+        with patch("backend.controllers.interview_routes.interview_reply", new_callable=AsyncMock,
+                   return_value=final), \
+             patch("backend.controllers.interview_routes.rag_engine.validate_input",
+                   new_callable=AsyncMock, return_value={"safe": True, "category": "relevant"}):
+            r = await ac.post(f"/api/interview/{SID}/reply",
+                data={"user_text": "I led the migration to Postgres."},
+                headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        body = r.json()
+        assert body["ended"] is True and body["score"] == 80
+        assert body["breakdown"] == {"TechnicalScore": 24, "CommunicationScore": 24,
+                                     "AlignmentScore": 16, "RelevanceScore": 16}
+        assert body["feedback"] == "Thank you!\n\nSolid answers overall."
+        flt, update = cols["interviews"].find_one_and_update.call_args[0]
+        assert flt == {"session_id": SID, "ended_at": None, "asked_count": 10, "transcript": {"$exists": False}}
+        assert update["$set"]["readiness_score"] == 80
+        assert update["$inc"] == {"asked_count": 1, "turn_count": 2}
+
     @pytest.mark.asyncio
     async def test_ended_session_returns_ended_flag(self, ac):
         ended = {**SESSION, "ended_at": datetime.now(timezone.utc)}
@@ -132,13 +173,261 @@ class TestInterviewReply:
                 headers={"Authorization": f"Bearer {make_jwt(UID)}"})
         assert r.status_code == 404
 
+    @pytest.mark.asyncio
+    async def test_guardrail_runs_concurrently_with_reply(self, ac):
+        import asyncio, threading
+        started = threading.Event()
+
+        async def guard(text):
+            # Completes only once the interview completion is already running
+            for _ in range(200):
+                if started.is_set():
+                    return {"safe": True, "category": "relevant"}
+                await asyncio.sleep(0.01)
+            return {"safe": False, "category": "malicious", "reason": "ran serially"}
+
+        async def fake_reply(*args, **kwargs):
+            started.set()
+            return make_turn("What is your greatest strength?")
+
+        patch_all_db(users_val=BASE_USER, interviews_val=SESSION)
+        with patch("backend.controllers.interview_routes.interview_reply", new_callable=AsyncMock, side_effect=fake_reply), \
+             patch("backend.controllers.interview_routes.rag_engine.validate_input", side_effect=guard):
+            r = await ac.post(f"/api/interview/{SID}/reply",
+                data={"user_text": "I have strong Python skills."},
+                headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        assert r.status_code == 200
+        assert r.json()["message"] == "What is your greatest strength?"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path", ["reply", "reply/stream"])
+    async def test_guardrail_cancelled_when_turn_fails_before_reply(self, ac, path):
+        import asyncio
+        cancelled = asyncio.Event()
+
+        async def guard(text):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def history(s):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("turn store down")
+
+        patch_all_db(users_val=BASE_USER, interviews_val=SESSION)
+        with patch("backend.controllers.interview_routes.rag_engine.validate_input", side_effect=guard), \
+             patch("backend.controllers.interview_routes.session_history", side_effect=history):
+            with pytest.raises(RuntimeError):
+                await ac.post(f"/api/interview/{SID}/{path}",
+                    data={"user_text": "I have strong Python skills."},
+                    headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+            await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_reply_sends_summary_and_recent_turns_only(self, ac):
+        transcript = [{"role": "assistant" if i % 2 == 0 else "user", "text": f"turn {i}",
+                       "at": datetime.now(timezone.utc)} for i in range(41)]
+        session = {**SESSION, "asked_count": 20, "questions_limit": 30, "turn_count": 41,
+                   "context_summary": "Candidate introduced themselves.", "context_summary_upto": 30}
+        cols = patch_all_db(users_val=BASE_USER, interviews_val=session)
+        turns = [{**t, "seq": i} for i, t in enumerate(transcript)]
+        serve_turns(cols["interview_turns"], turns)
+        with patch("backend.controllers.interview_routes.interview_reply", new_callable=AsyncMock,
+                   return_value=make_turn("What is your greatest strength?")) as reply, \
+             patch("backend.controllers.interview_routes.rag_engine.validate_input",
+                   new_callable=AsyncMock, return_value={"safe": True, "category": "relevant"}), \
+             patch("backend.controllers.interview_routes.schedule_refresh") as schedule:
+            r = await ac.post(f"/api/interview/{SID}/reply",
+                data={"user_text": "I have strong Python skills."},
+                headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        assert r.status_code == 200
+        history = reply.call_args[0][0]
+        assert [m["content"] for m in history] == [f"turn {i}" for i in range(30, 41)] + ["I have strong Python skills."]
+        assert reply.call_args.kwargs["context_summary"] == "Candidate introduced themselves."
+        assert schedule.call_args[0][2:] == (43, 30)
+        # Only the turns after the summary are read
+        assert cols["interview_turns"].find.call_args[0][0] == {"session_id": SID, "seq": {"$gte": 30}}
+        docs = cols["interview_turns"].insert_many.call_args[0][0]
+        assert [d["seq"] for d in docs] == [41, 42]
+
+    @pytest.mark.asyncio
+    async def test_malicious_input_discards_speculative_reply(self, ac):
+        patch_all_db(users_val=BASE_USER, interviews_val=SESSION)
+        with patch("backend.controllers.interview_routes.interview_reply", new_callable=AsyncMock,
+                   return_value=make_turn("What is your greatest strength?")), \
+             patch("backend.controllers.interview_routes.rag_engine.validate_input",
+                   new_callable=AsyncMock,
+                   return_value={"safe": False, "category": "malicious", "reason": "abusive"}), \
+             patch("backend.controllers.interview_routes.inc_question", new_callable=AsyncMock) as inc:
+            r = await ac.post(f"/api/interview/{SID}/reply",
+                data={"user_text": "Some abusive text here."},
+                headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        assert r.status_code == 400
+        assert "abusive" in r.json()["detail"]
+        inc.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_turn_returns_409_without_counting(self, ac):
+        cols = patch_all_db(users_val=BASE_USER, interviews_val=SESSION)
+        # Another request already advanced asked_count, so the guarded write matches nothing
+        cols["interviews"].find_one_and_update.side_effect = None
+        cols["interviews"].find_one_and_update.return_value = None
+        with patch("backend.controllers.interview_routes.interview_reply", new_callable=AsyncMock,
+                   return_value=make_turn("What is your greatest strength?")), \
+             patch("backend.controllers.interview_routes.rag_engine.validate_input",
+                   new_callable=AsyncMock, return_value={"safe": True, "category": "relevant"}), \
+             patch("backend.controllers.interview_routes.inc_question", new_callable=AsyncMock) as inc:
+            r = await ac.post(f"/api/interview/{SID}/reply",
+                data={"user_text": "I have strong Python skills."},
+                headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        assert r.status_code == 409
+        inc.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_legacy_session_is_migrated_before_the_turn(self, ac):
+        legacy = {k: v for k, v in SESSION.items() if k != "turn_count"}
+        legacy["transcript"] = [{"role": "assistant", "text": "Tell me about yourself."}]
+        cols = patch_all_db(users_val=BASE_USER, interviews_val=legacy)
+        # Read again after the move, the array replaced by turn_count
+        reads = iter([legacy])
+        cols["interviews"].find_one.side_effect = lambda *a, **kw: next(reads, SESSION)
+        with patch("backend.controllers.interview_routes.interview_reply", new_callable=AsyncMock,
+                   return_value=make_turn("What is your greatest strength?")), \
+             patch("backend.controllers.interview_routes.rag_engine.validate_input",
+                   new_callable=AsyncMock, return_value={"safe": True, "category": "relevant"}):
+            r = await ac.post(f"/api/interview/{SID}/reply",
+                data={"user_text": "I have strong Python skills."},
+                headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        assert r.status_code == 200
+        moved = cols["interview_turns"].insert_many.call_args_list[0][0][0]
+        assert [(d["seq"], d["text"]) for d in moved] == [(0, "Tell me about yourself.")]
+        flt, update = cols["interviews"].update_one.call_args_list[0][0]
+        assert flt == {"_id": SID, "transcript": {"$exists": True}}
+        assert update["$set"]["turn_count"] == 1
+        assert cols["interviews"].find_one_and_update.call_args[0][0]["transcript"] == {"$exists": False}
+
+
+def _fake_stream(*texts, final=None):
+    async def gen(**kwargs):
+        for t in texts:
+            yield "token", t
+        yield "final", final if final is not None else make_turn("".join(texts))
+    return gen
+
+
+def _sse(body):
+    import json
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestInterviewStreaming:
+    @pytest.mark.asyncio
+    async def test_reply_stream_forwards_tokens_and_persists(self, ac):
+        cols = patch_all_db(users_val=BASE_USER, interviews_val=SESSION)
+        with patch("backend.controllers.interview_routes.stream_interview_reply",
+                   _fake_stream("What is ", "your greatest ", "strength?")), \
+             patch("backend.controllers.interview_routes.rag_engine.validate_input",
+                   new_callable=AsyncMock, return_value={"safe": True, "category": "relevant"}):
+            r = await ac.post(f"/api/interview/{SID}/reply/stream",
+                data={"user_text": "I have strong Python skills."},
+                headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/event-stream")
+        events = _sse(r.text)
+        assert [e for e, _ in events] == ["token", "token", "token", "done"]
+        assert "".join(d["text"] for e, d in events if e == "token") == "What is your greatest strength?"
+        assert events[-1][1]["message"] == "What is your greatest strength?"
+        assert events[-1][1]["asked_count"] == 2
+        cols["interviews"].find_one_and_update.assert_awaited_once()
+        update = cols["interviews"].find_one_and_update.call_args[0][1]
+        assert update["$inc"] == {"asked_count": 1, "turn_count": 2}
+        docs = cols["interview_turns"].insert_many.call_args[0][0]
+        assert [(d["seq"], d["text"]) for d in docs] == [
+            (1, "I have strong Python skills."), (2, "What is your greatest strength?")]
+        cols["interviews"].update_one.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_reply_stream_done_carries_corrected_message(self, ac):
+        patch_all_db(users_val=BASE_USER, interviews_val=SESSION)
+        # The streamed draft failed validation and was replaced by the correction re-prompt
+        with patch("backend.controllers.interview_routes.stream_interview_reply",
+                   _fake_stream("Thanks, goodbye.", final=make_turn("What is a REST API?"))), \
+             patch("backend.controllers.interview_routes.rag_engine.validate_input",
+                   new_callable=AsyncMock, return_value={"safe": True, "category": "relevant"}):
+            r = await ac.post(f"/api/interview/{SID}/reply/stream",
+                data={"user_text": "I have strong Python skills."},
+                headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        events = _sse(r.text)
+        assert events[0] == ("token", {"text": "Thanks, goodbye."})
+        assert events[-1][0] == "done" and events[-1][1]["message"] == "What is a REST API?"
+
+    @pytest.mark.asyncio
+    async def test_reply_stream_malicious_input_sends_error(self, ac):
+        cols = patch_all_db(users_val=BASE_USER, interviews_val=SESSION)
+        with patch("backend.controllers.interview_routes.stream_interview_reply",
+                   _fake_stream("Next question?")), \
+             patch("backend.controllers.interview_routes.rag_engine.validate_input",
+                   new_callable=AsyncMock,
+                   return_value={"safe": False, "category": "malicious", "reason": "abusive"}):
+            r = await ac.post(f"/api/interview/{SID}/reply/stream",
+                data={"user_text": "Some abusive text here."},
+                headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        events = _sse(r.text)
+        assert events == [("error", {"status": 400, "detail": "Invalid input detected: abusive"})]
+        cols["interviews"].find_one_and_update.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_reply_stream_model_error_sends_error_event(self, ac):
+        async def failing(**kwargs):
+            raise RuntimeError("429 rate limit")
+            yield
+
+        patch_all_db(users_val=BASE_USER, interviews_val=SESSION)
+        with patch("backend.controllers.interview_routes.stream_interview_reply", failing), \
+             patch("backend.controllers.interview_routes.rag_engine.validate_input",
+                   new_callable=AsyncMock, return_value={"safe": True}):
+            r = await ac.post(f"/api/interview/{SID}/reply/stream",
+                data={"user_text": "I have strong Python skills."},
+                headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        assert _sse(r.text) == [("error", {"status": 429, "detail": "AI_RATE_LIMIT"})]
+
+    @pytest.mark.asyncio
+    async def test_reply_stream_not_found(self, ac):
+        patch_all_db(users_val=BASE_USER, interviews_val=None)
+        r = await ac.post("/api/interview/nonexistent/reply/stream",
+            data={"user_text": "Answer"},
+            headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        assert r.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_start_stream_creates_session_at_end(self, ac):
+        cols = patch_all_db(users_val=BASE_USER,
+                            resumes_val={"feedback": {}, "job_title": "Software Engineer"})
+        with patch("backend.controllers.interview_routes.stream_interview_reply",
+                   _fake_stream("Hello! ", "Please introduce yourself?")):
+            r = await ac.post("/api/interview/start/stream",
+                data={"job_title": "Software Engineer", "difficulty": "Beginner",
+                      "questions_limit": "10"},
+                headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        events = _sse(r.text)
+        assert [e for e, _ in events] == ["token", "token", "done"]
+        assert "session_id" in events[-1][1]
+        assert events[-1][1]["message"] == "Hello! Please introduce yourself?"
+        cols["interviews"].insert_one.assert_awaited_once()
+
 
 class TestInterviewEnd:
     @pytest.mark.asyncio
     async def test_end_active_session(self, ac):
         patch_all_db(users_val=BASE_USER, interviews_val=SESSION)
-        with patch("backend.controllers.interview_routes.interview_reply",
-                   return_value="Goodbye. [FINISH]"):
+        with patch("backend.controllers.interview_routes.interview_reply", new_callable=AsyncMock,
+                   return_value=make_turn("Goodbye.", finished=True)):
             r = await ac.post(f"/api/interview/{SID}/end",
                               headers={"Authorization": f"Bearer {make_jwt(UID)}"})
         assert r.status_code == 200
@@ -166,6 +455,29 @@ class TestInterviewHistory:
         assert r.status_code == 200
         assert isinstance(r.json(), list)
 
+    @pytest.mark.asyncio
+    async def test_paged_summary_uses_projection_and_cursor(self, ac):
+        base = datetime(2025, 1, 10, tzinfo=timezone.utc)
+        items = [{"_id": f"507f1f77bcf86cd79943901{i}", "created_at": base - timedelta(days=i),
+                  "asked_count": i, "ended_at": None, "readiness_score": 70 + i} for i in range(3)]
+        cols = patch_all_db(users_val=BASE_USER, interviews_items=items)
+        r = await ac.get("/api/interview/history?limit=2&summary=true",
+                         headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        assert r.status_code == 200
+        assert [i["readiness_score"] for i in r.json()] == [70, 71]
+        assert "readiness_feedback" not in r.json()[0]
+        assert r.headers["X-Next-Cursor"] == f"{items[1]['created_at'].isoformat()}|{items[1]['_id']}"
+        query, projection = cols["interviews"].find.call_args[0]
+        assert query == {"user_id": UID}
+        assert set(projection) == {"asked_count", "created_at", "ended_at", "readiness_score"}
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_returns_400(self, ac):
+        patch_all_db(users_val=BASE_USER)
+        r = await ac.get("/api/interview/history?limit=2&before=not-a-cursor",
+                         headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        assert r.status_code == 400
+
     @pytest.mark.asyncio
     async def test_unauthenticated_returns_401(self, ac):
         assert (await ac.get("/api/interview/history")).status_code == 401
@@ -185,3 +497,26 @@ class TestInterviewDelete:
         r = await ac.delete("/api/interview/nonexistent-xyz",
                             headers={"Authorization": f"Bearer {make_jwt(UID)}"})
         assert r.status_code == 404
+
+
+class TestInterviewTranscript:
+    @pytest.mark.asyncio
+    async def test_pages_through_turns(self, ac):
+        turns = [{"seq": i, "role": "assistant" if i % 2 == 0 else "user", "text": f"turn {i}"} for i in range(5)]
+        cols = patch_all_db(users_val=BASE_USER, interviews_val=SESSION)
+        serve_turns(cols["interview_turns"], turns)
+        r = await ac.get(f"/api/interview/{SID}/transcript?limit=2",
+                         headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        page = r.json()
+        assert [t["text"] for t in page["items"]] == ["turn 0", "turn 1"]
+        assert page["next_after"] == 1
+        r = await ac.get(f"/api/interview/{SID}/transcript?after=3&limit=2",
+                         headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        assert r.json() == {"items": [turns[4]], "next_after": None}
+
+    @pytest.mark.asyncio
+    async def test_unknown_session_returns_404(self, ac):
+        patch_all_db(users_val=BASE_USER, interviews_val=None)
+        r = await ac.get(f"/api/interview/{SID}/transcript",
+                         headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        assert r.status_code == 404
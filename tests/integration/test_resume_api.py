@@ -155,6 +155,21 @@ class TestMyResumes:
         assert r.status_code == 200
         assert isinstance(r.json(), list)
 
+    @pytest.mark.asyncio
+    async def test_summary_page_leaves_out_text_and_feedback(self, ac):
+        cols = patch_all_db(users_val=BASE_USER,
+                            resumes_items=[{"_id": "abc", "filename": "cv.pdf", "status": "done",
+                                            "created_at": None, "tags": [], "job_title": "Dev",
+                                            "feedback": {"Score": 72, "ScoreBreakdown": {}}}])
+        r = await ac.get("/api/resume/my?limit=1&summary=true",
+                         headers={"Authorization": f"Bearer {make_jwt(UID)}"})
+        assert r.status_code == 200
+        assert r.json()[0]["resume_score"] == 72
+        assert "feedback" not in r.json()[0]
+        assert "X-Next-Cursor" not in r.headers
+        projection = cols["resumes"].find.call_args[0][1]
+        assert "text" not in projection and "feedback" not in projection
+
 
 class TestDownloadPDF:
     @pytest.mark.asyncio
@@ -146,3 +146,78 @@ class TestResponseTimeBaseline:
         elapsed = time.monotonic() - start
         assert elapsed < 3.0, f"10 /me requests took {elapsed:.2f}s"
         assert all(r.status_code == 200 for r in results)
+
+
+class TestRagEngineConcurrency:
+    """
+    Load test for the async RAG path: each fake Mistral call sleeps 50 ms.
+    With non-blocking calls, N concurrent retrievals overlap their I/O, so
+    throughput must scale with concurrency (up to the limiter's cap).
+    """
+    LATENCY = 0.05
+
+    def _engine(self, max_concurrency=8, max_batch=32):
+        from unittest.mock import MagicMock
+        from backend.services.rag_engine import RAGEngine, CorpusSnapshot
+        from backend.services.keyword_index import KeywordIndex
+        from backend.services.mistral_retry import ConcurrencyLimiter
+        from backend.services.embedding_coalescer import EmbeddingCoalescer
+
+        async def slow_embed(**kwargs):
+            await asyncio.sleep(self.LATENCY)
+            resp = MagicMock()
+            resp.data = [MagicMock(embedding=[1.0, 0.0]) for _ in kwargs["inputs"]]
+            return resp
+
+        engine = RAGEngine(docs_dir="/nonexistent")
+        chunks = ["resume tips for graduates", "interview questions for engineers"]
+        engine.snapshot = CorpusSnapshot(
+            chunks, RAGEngine._to_matrix([[1, 0], [0, 1]]), KeywordIndex(chunks), None, "v1"
+        )
+        engine.mistral_client = MagicMock()
+        engine.mistral_client.embeddings.create_async = slow_embed
+        engine.llm_limiter = ConcurrencyLimiter(max_concurrency)
+        engine.embedding_coalescer = EmbeddingCoalescer(engine._embed_batch_async, max_batch=max_batch)
+        engine._initialized = True
+        return engine
+
+    async def _run(self, engine, n):
+        import gc
+        import time
+        from unittest.mock import MagicMock
+        no_cache = MagicMock()
+        no_cache.get.return_value = None
+        with patch("backend.services.rag_engine.cache", no_cache):
+            # A full collection of the suite's leftovers can pause for longer than the window being timed
+            gc.collect()
+            start = time.monotonic()
+            results = await asyncio.gather(*(engine.retrieve(f"query {i}") for i in range(n)))
+            elapsed = time.monotonic() - start
+        assert all(results)
+        return n / elapsed
+
+    @pytest.mark.asyncio
+    async def test_throughput_scales_with_concurrency(self):
+        # max_batch=1 disables coalescing so each retrieval makes its own call
+        serial = await self._run(self._engine(max_batch=1), 1)
+        concurrent = await self._run(self._engine(max_batch=1), 16)
+        print(f"\nRAG retrieve throughput: 1 → {serial:.1f}/s, 16 → {concurrent:.1f}/s")
+        assert concurrent > serial * 4, (
+            f"Concurrent throughput {concurrent:.1f}/s did not scale over serial {serial:.1f}/s"
+        )
+
+    @pytest.mark.asyncio
+    async def test_limiter_bounds_throughput(self):
+        """With a single slot, calls serialize: 8 requests take ≥ 8 × latency."""
+        throughput = await self._run(self._engine(max_concurrency=1, max_batch=1), 8)
+        assert throughput <= 1 / self.LATENCY * 1.1
+
+    @pytest.mark.asyncio
+    async def test_burst_is_coalesced_into_few_embedding_calls(self):
+        """A burst of 40 retrievals becomes ⌈40 / 16⌉ = 3 batched embedding calls."""
+        engine = self._engine(max_batch=16)
+        throughput = await self._run(engine, 40)
+        stats = engine.embedding_coalescer.stats
+        print(f"\nCoalesced burst: 40 requests → {stats['batches']} calls, {throughput:.1f}/s")
+        assert stats["requests"] == 40
+        assert stats["batches"] == 3
@@ -0,0 +1,83 @@
+"""
+Unit Tests — backend/services/ann_index.py
+Tests: IVF build (CSR list layout), candidate probing, recall vs exact search,
+persistence keyed by corpus version.
+Pure NumPy — no DB or network.
+"""
+import os
+import sys
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.services.ann_index import IVFIndex
+
+
+def _clustered_matrix(n_clusters=8, per_cluster=50, dim=32, seed=1):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_clusters, dim))
+    rows = np.concatenate([c + 0.1 * rng.normal(size=(per_cluster, dim)) for c in centers])
+    rows /= np.linalg.norm(rows, axis=1, keepdims=True)
+    return rows.astype(np.float32)
+
+
+def _recall_at_10(index, matrix, n_probe, n_queries=20):
+    hits = 0
+    for qi in range(n_queries):
+        q = matrix[qi * 7]
+        exact = set(np.argsort(matrix @ q)[-10:])
+        rows = index.candidates(q, n_probe)
+        approx = set(rows[np.argsort(matrix[rows] @ q)[-10:]])
+        hits += len(exact & approx)
+    return hits / (10 * n_queries)
+
+
+class TestIVFIndex:
+    def test_every_row_in_exactly_one_list(self):
+        m = _clustered_matrix()
+        index = IVFIndex.build(m, n_lists=8)
+        assert index.n_lists == 8
+        assert index.list_offsets[-1] == m.shape[0]
+        assert sorted(index.list_rows.tolist()) == list(range(m.shape[0]))
+
+    def test_default_lists_is_sqrt_n(self):
+        index = IVFIndex.build(_clustered_matrix(per_cluster=50), n_lists=0)
+        assert index.n_lists == int(np.sqrt(400))
+
+    def test_full_probe_is_exact(self):
+        m = _clustered_matrix()
+        index = IVFIndex.build(m, n_lists=8)
+        assert len(index.candidates(m[0], n_probe=8)) == m.shape[0]
+        assert _recall_at_10(index, m, n_probe=8) == 1.0
+
+    def test_partial_probe_scans_fraction_with_good_recall(self):
+        m = _clustered_matrix()
+        index = IVFIndex.build(m, n_lists=8)
+        assert len(index.candidates(m[0], n_probe=2)) < m.shape[0]
+        assert _recall_at_10(index, m, n_probe=2) >= 0.9
+
+    def test_more_lists_than_rows_is_clamped(self):
+        m = _clustered_matrix(n_clusters=1, per_cluster=3)
+        assert IVFIndex.build(m, n_lists=50).n_lists == 3
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        m = _clustered_matrix()
+        index = IVFIndex.build(m, n_lists=8)
+        index.save(str(tmp_path), "v1")
+        loaded = IVFIndex.load(str(tmp_path), "v1")
+        assert loaded is not None
+        assert np.array_equal(loaded.list_rows, index.list_rows)
+        assert np.allclose(loaded.centroids, index.centroids)
+
+    def test_load_rejects_stale_corpus_version(self, tmp_path):
+        IVFIndex.build(_clustered_matrix(), n_lists=8).save(str(tmp_path), "v1")
+        assert IVFIndex.load(str(tmp_path), "v2") is None
+
+    def test_load_rejects_different_list_count(self, tmp_path):
+        IVFIndex.build(_clustered_matrix(), n_lists=8).save(str(tmp_path), "v1")
+        assert IVFIndex.load(str(tmp_path), "v1", n_lists=16) is None
+
+    def test_load_missing_file_returns_none(self, tmp_path):
+        assert IVFIndex.load(str(tmp_path), "v1") is None
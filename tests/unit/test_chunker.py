@@ -0,0 +1,107 @@
+"""
+Unit Tests — backend/services/chunker.py
+Tests: heading-aware sectioning, token budgets and overlap, oversized
+paragraph splitting, and the parallel metadata arrays.
+Pure Python/NumPy — no DB or network.
+"""
+import os
+import sys
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.services.chunker import Chunker, count_tokens
+
+GUIDE = (
+    "# Resume Basics\n"
+    "Keep your resume to one page when you have less than ten years of experience.\n"
+    "\n"
+    "Lead every bullet with an action verb and quantify the result where possible.\n"
+    "\n"
+    "INTERVIEW PREPARATION\n"
+    "Research the company, its products and its recent news before the interview.\n"
+    "\n"
+    "Prepare three stories that follow the STAR method: situation, task, action, result.\n"
+)
+
+
+class TestSections:
+    def test_chunks_never_cross_headings(self):
+        chunks = Chunker(max_tokens=200, overlap_tokens=0).chunk_documents([("guide.txt", GUIDE)])
+        assert len(chunks) == 2
+        assert chunks.texts[0].startswith("Resume Basics\n")
+        assert "action verb" in chunks.texts[0] and "STAR" not in chunks.texts[0]
+        assert chunks.texts[1].startswith("INTERVIEW PREPARATION\n")
+        assert "STAR" in chunks.texts[1] and "one page" not in chunks.texts[1]
+
+    def test_underlined_heading(self):
+        text = "Salary Negotiation\n==================\nNever give the first number; ask for the budgeted range instead.\n"
+        chunks = Chunker().chunk_documents([("neg.txt", text)])
+        assert chunks.texts == ["Salary Negotiation\nNever give the first number; ask for the budgeted range instead."]
+
+    def test_bullets_are_not_headings(self):
+        text = "- Tip:\nWrite a short summary that names the role you want and your strongest skill.\n"
+        chunks = Chunker().chunk_documents([("tips.txt", text)])
+        assert len(chunks) == 1
+        assert chunks.texts[0].startswith("- Tip:")
+
+    def test_tiny_fragments_are_dropped(self):
+        chunks = Chunker(min_tokens=10).chunk_documents([("a.txt", "# Title\nToo short.\n")])
+        assert len(chunks) == 0
+
+
+class TestTokenBudget:
+    def test_every_chunk_fits_budget(self):
+        paragraph = " ".join(f"Sentence number {i} describes one interview tip." for i in range(60))
+        chunker = Chunker(max_tokens=40, overlap_tokens=8)
+        chunks = chunker.chunk_documents([("long.txt", "# Tips\n" + paragraph)])
+        assert len(chunks) > 5
+        assert (chunks.token_counts <= 40).all()
+        for text, n in zip(chunks.texts, chunks.token_counts):
+            assert count_tokens(text) == n
+
+    def test_consecutive_chunks_overlap(self):
+        paragraph = " ".join(f"Point {i} is about resumes." for i in range(30))
+        chunks = Chunker(max_tokens=30, overlap_tokens=10).chunk_documents([("o.txt", paragraph)])
+        assert len(chunks) > 2
+        for prev, nxt in zip(chunks.texts, chunks.texts[1:]):
+            first_sentence = nxt.split(".")[0] + "."
+            assert first_sentence in prev
+
+    def test_large_paragraphs_still_overlap(self):
+        # Each paragraph is larger than the overlap budget, so only its last sentence is carried
+        paragraphs = [" ".join(f"Tip {p}-{i} covers thank-you emails." for i in range(3)) for p in range(4)]
+        chunks = Chunker(max_tokens=40, overlap_tokens=10).chunk_documents([("p.txt", "\n\n".join(paragraphs))])
+        assert len(chunks) == 4
+        assert (chunks.token_counts <= 40).all()
+        for prev, nxt in zip(chunks.texts, chunks.texts[1:]):
+            first_sentence = nxt.split(".")[0] + "."
+            assert prev.endswith(first_sentence)
+
+    def test_sentence_longer_than_budget_is_split_into_words(self):
+        words = " ".join(f"word{i}" for i in range(100))
+        chunks = Chunker(max_tokens=20, overlap_tokens=0).chunk_documents([("w.txt", words)])
+        assert len(chunks) == 5
+        assert " ".join(chunks.texts) == words
+
+
+class TestMetadata:
+    def test_parallel_arrays_align_with_texts(self):
+        other = "Follow up with a thank-you email within twenty-four hours of every interview.\n"
+        chunks = Chunker().chunk_documents([("guide.txt", GUIDE), ("follow_up.txt", other)])
+        n = len(chunks)
+        assert n == 3
+        for arr in (chunks.source_ids, chunks.starts, chunks.ends, chunks.token_counts):
+            assert isinstance(arr, np.ndarray) and arr.shape == (n,)
+        assert chunks.sources == ["guide.txt", "follow_up.txt"]
+        assert [chunks.source_of(i) for i in range(n)] == ["guide.txt", "guide.txt", "follow_up.txt"]
+
+    def test_offsets_point_at_chunk_body(self):
+        docs = {"guide.txt": GUIDE}
+        chunks = Chunker().chunk_documents(list(docs.items()))
+        for i, text in enumerate(chunks.texts):
+            body = docs[chunks.source_of(i)][chunks.starts[i]:chunks.ends[i]]
+            assert text.endswith(body)
+            assert body.startswith(("Keep", "Research"))
@@ -0,0 +1,126 @@
+"""
+Unit Tests — backend/services/db_maintenance.py
+Tests: missing indexes created with their options, drift and unmanaged index
+reporting, per-index errors, and the run-once migration claim (skip when
+applied, release on failure, stop at the first failure, stale takeover).
+Collections are AsyncMocks — no DB.
+"""
+import os
+import sys
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from pymongo.errors import DuplicateKeyError
+from backend.services.db_maintenance import apply_indexes, run_migrations, index_drift
+
+REGISTRY = {
+    "things": [
+        {"name": "owner_1", "keys": [("owner", 1)]},
+        {"name": "code_1", "keys": [("code", 1)], "unique": True},
+        {"name": "seen_1", "keys": [("seen", 1)], "expireAfterSeconds": 60},
+    ]
+}
+
+
+def _database(existing):
+    col = MagicMock()
+    col.index_information = AsyncMock(return_value=existing)
+    col.create_index = AsyncMock()
+    return {"things": col}, col
+
+
+class TestApplyIndexes:
+    @pytest.mark.asyncio
+    async def test_creates_only_missing_indexes_with_options(self):
+        database, col = _database({"_id_": {"key": [("_id", 1)]}, "owner_1": {"key": [("owner", 1.0)]}})
+        report = await apply_indexes(database, REGISTRY)
+        assert report["created"] == ["things.code_1", "things.seen_1"]
+        calls = {c.kwargs["name"]: c for c in col.create_index.call_args_list}
+        assert calls["code_1"].kwargs["unique"] is True
+        assert calls["seen_1"].kwargs["expireAfterSeconds"] == 60
+        assert report["drift"] == [] and report["unmanaged"] == []
+
+    @pytest.mark.asyncio
+    async def test_reports_drift_and_unmanaged_without_dropping(self):
+        database, col = _database({
+            "_id_": {"key": [("_id", 1)]},
+            "owner_1": {"key": [("owner", 1)]},
+            "code_1": {"key": [("code", 1)]},  # declared unique
+            "seen_1": {"key": [("seen", 1)], "expireAfterSeconds": 3600},
+            "legacy_idx": {"key": [("x", 1)]},
+        })
+        report = await apply_indexes(database, REGISTRY)
+        assert report["created"] == []
+        drift = {d["index"]: d["diff"] for d in report["drift"]}
+        assert drift["things.code_1"] == {"unique": {"declared": True, "actual": False}}
+        assert drift["things.seen_1"]["expireAfterSeconds"] == {"declared": 60, "actual": 3600}
+        assert report["unmanaged"] == ["things.legacy_idx"]
+        col.create_index.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_create_failure_reported_and_others_continue(self):
+        database, col = _database({})
+        col.create_index = AsyncMock(side_effect=[Exception("IndexOptionsConflict"), None, None])
+        report = await apply_indexes(database, REGISTRY)
+        assert report["errors"] == [{"index": "things.owner_1", "error": "IndexOptionsConflict"}]
+        assert report["created"] == ["things.code_1", "things.seen_1"]
+
+    def test_key_direction_floats_are_not_drift(self):
+        assert index_drift({"key": [("a", 1.0), ("b", -1.0)]}, {"keys": [("a", 1), ("b", -1)]}) == {}
+
+
+def _migrations_col(applied=()):
+    col = MagicMock()
+
+    async def insert_one(doc):
+        if doc["_id"] in applied:
+            raise DuplicateKeyError("dup")
+    col.insert_one = AsyncMock(side_effect=insert_one)
+    col.find_one_and_update = AsyncMock(return_value=None)
+    col.update_one = AsyncMock()
+    col.delete_one = AsyncMock()
+    return col
+
+
+class TestRunMigrations:
+    @pytest.mark.asyncio
+    async def test_runs_pending_in_order_and_skips_applied(self):
+        col = _migrations_col(applied={"0001"})
+        ran = []
+
+        def step(name):
+            async def fn():
+                ran.append(name)
+                return {"ok": name}
+            return fn
+        report = await run_migrations(col, [("0001", step("0001")), ("0002", step("0002")), ("0003", step("0003"))])
+        assert ran == ["0002", "0003"]
+        assert report == {"applied": ["0002", "0003"], "skipped": ["0001"], "failed": None}
+        flt, update = col.update_one.call_args[0]
+        assert flt == {"_id": "0003"} and update["$set"]["status"] == "done"
+
+    @pytest.mark.asyncio
+    async def test_failure_releases_claim_and_stops(self):
+        col = _migrations_col()
+
+        async def boom():
+            raise RuntimeError("bad data")
+        later = AsyncMock()
+        report = await run_migrations(col, [("0001", boom), ("0002", later)])
+        assert report["failed"] == {"migration": "0001", "error": "bad data"}
+        col.delete_one.assert_awaited_once_with({"_id": "0001", "status": "running"})
+        later.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_stale_claim_is_taken_over(self):
+        col = _migrations_col(applied={"0001"})
+        col.find_one_and_update = AsyncMock(return_value={"_id": "0001", "status": "running"})
+        fn = AsyncMock(return_value=None)
+        report = await run_migrations(col, [("0001", fn)])
+        assert report["applied"] == ["0001"]
+        flt = col.find_one_and_update.call_args[0][0]
+        assert flt["status"] == "running" and "$lt" in flt["started_at"]
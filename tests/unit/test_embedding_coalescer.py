@@ -0,0 +1,103 @@
+"""
+Unit Tests — backend/services/embedding_coalescer.py
+Tests: batching window, max batch size, duplicate collapsing, error and
+cancellation fan-out.
+No real network calls — the batch embedder is a local async stub.
+"""
+import os
+import sys
+import asyncio
+import numpy as np
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.services.embedding_coalescer import EmbeddingCoalescer
+
+
+class _StubBatchEmbedder:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    async def __call__(self, texts):
+        self.calls.append(list(texts))
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("429 rate limit")
+        return np.asarray([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+
+
+class TestEmbeddingCoalescer:
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_call(self):
+        embed = _StubBatchEmbedder()
+        coalescer = EmbeddingCoalescer(embed, window_ms=5, max_batch=32)
+        rows = await asyncio.gather(*(coalescer.embed("x" * n) for n in range(1, 6)))
+        assert len(embed.calls) == 1
+        assert [r[0] for r in rows] == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    @pytest.mark.asyncio
+    async def test_max_batch_flushes_immediately(self):
+        embed = _StubBatchEmbedder()
+        coalescer = EmbeddingCoalescer(embed, window_ms=1000, max_batch=2)
+        await asyncio.wait_for(
+            asyncio.gather(coalescer.embed("a"), coalescer.embed("bb")), timeout=0.5
+        )
+        assert embed.calls == [["a", "bb"]]
+
+    @pytest.mark.asyncio
+    async def test_batches_split_at_max_size(self):
+        embed = _StubBatchEmbedder()
+        coalescer = EmbeddingCoalescer(embed, window_ms=5, max_batch=3)
+        await asyncio.gather(*(coalescer.embed(f"q{i}") for i in range(7)))
+        assert [len(c) for c in embed.calls] == [3, 3, 1]
+        assert coalescer.stats["batches"] == 3
+
+    @pytest.mark.asyncio
+    async def test_duplicate_texts_sent_once(self):
+        embed = _StubBatchEmbedder()
+        coalescer = EmbeddingCoalescer(embed, window_ms=5)
+        a, b = await asyncio.gather(coalescer.embed("same"), coalescer.embed("same"))
+        assert embed.calls == [["same"]]
+        assert np.array_equal(a, b)
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_to_every_caller(self):
+        coalescer = EmbeddingCoalescer(_StubBatchEmbedder(fail=True), window_ms=5)
+        results = await asyncio.gather(
+            coalescer.embed("a"), coalescer.embed("b"), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_sequential_requests_after_window(self):
+        embed = _StubBatchEmbedder()
+        coalescer = EmbeddingCoalescer(embed, window_ms=1)
+        await coalescer.embed("first")
+        await coalescer.embed("second")
+        assert embed.calls == [["first"], ["second"]]
+
+    @pytest.mark.asyncio
+    async def test_short_batch_fails_every_caller(self):
+        async def short(texts):
+            return np.zeros((len(texts) - 1, 2), dtype=np.float32)
+        coalescer = EmbeddingCoalescer(short, window_ms=5)
+        results = await asyncio.wait_for(asyncio.gather(
+            coalescer.embed("a"), coalescer.embed("b"), return_exceptions=True
+        ), timeout=0.5)
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_batch_releases_callers(self):
+        async def hang(texts):
+            await asyncio.sleep(10)
+        coalescer = EmbeddingCoalescer(hang, window_ms=0)
+        callers = [asyncio.ensure_future(coalescer.embed(t)) for t in ("a", "b")]
+        await asyncio.sleep(0.01)
+        for task in list(coalescer._tasks):
+            task.cancel()
+        results = await asyncio.wait_for(asyncio.gather(*callers, return_exceptions=True), timeout=0.5)
+        assert all(isinstance(r, asyncio.CancelledError) for r in results)
@@ -0,0 +1,85 @@
+"""
+Unit Tests — backend/services/embedding_store.py
+Tests: content hashing, reuse of persisted rows, incremental embedding,
+memory-mapped loading, model mismatch invalidation.
+No real network calls — the embedding function is a local stub.
+"""
+import os
+import sys
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.services.embedding_store import EmbeddingStore, content_hash
+
+
+class _StubEmbedder:
+    """Deterministic embedder that records which texts it was asked for."""
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return np.asarray([[len(t), t.count("a"), 1.0] for t in texts], dtype=np.float32)
+
+
+class TestContentHash:
+    def test_same_text_same_hash(self):
+        assert content_hash("abc") == content_hash("abc")
+
+    def test_different_text_different_hash(self):
+        assert content_hash("abc") != content_hash("abd")
+
+
+class TestEmbeddingStore:
+    def test_first_run_embeds_everything_and_persists(self, tmp_path):
+        store = EmbeddingStore(str(tmp_path), model="mistral-embed")
+        embed = _StubEmbedder()
+        m = store.resolve(["alpha", "beta"], embed)
+        assert embed.calls == [["alpha", "beta"]]
+        assert m.shape == (2, 3)
+        assert os.path.exists(store.matrix_path)
+        assert os.path.exists(store.manifest_path)
+
+    def test_unchanged_chunks_load_without_embedding(self, tmp_path):
+        EmbeddingStore(str(tmp_path), "mistral-embed").resolve(["alpha", "beta"], _StubEmbedder())
+        store = EmbeddingStore(str(tmp_path), "mistral-embed")
+        embed = _StubEmbedder()
+        m = store.resolve(["alpha", "beta"], embed)
+        assert embed.calls == []
+        assert isinstance(m, np.memmap)
+        assert (store.last_reused, store.last_embedded) == (2, 0)
+
+    def test_only_changed_chunks_are_embedded(self, tmp_path):
+        first = EmbeddingStore(str(tmp_path), "mistral-embed").resolve(["alpha", "beta"], _StubEmbedder())
+        store = EmbeddingStore(str(tmp_path), "mistral-embed")
+        embed = _StubEmbedder()
+        m = store.resolve(["alpha", "gamma", "beta"], embed)
+        assert embed.calls == [["gamma"]]
+        assert np.array_equal(m[0], first[0])
+        assert np.array_equal(m[2], first[1])
+        # Store now reflects the new chunk list exactly
+        row_of, stored = store.load()
+        assert stored.shape[0] == 3
+        assert row_of[content_hash("gamma")] == 1
+
+    def test_missing_chunks_embedded_in_batches(self, tmp_path):
+        store = EmbeddingStore(str(tmp_path), "mistral-embed")
+        embed = _StubEmbedder()
+        store.resolve([f"chunk {i}" for i in range(5)], embed, batch_size=2)
+        assert [len(c) for c in embed.calls] == [2, 2, 1]
+
+    def test_model_change_invalidates_store(self, tmp_path):
+        EmbeddingStore(str(tmp_path), "mistral-embed").resolve(["alpha"], _StubEmbedder())
+        embed = _StubEmbedder()
+        EmbeddingStore(str(tmp_path), "other-embed").resolve(["alpha"], embed)
+        assert embed.calls == [["alpha"]]
+
+    def test_corrupt_manifest_is_ignored(self, tmp_path):
+        store = EmbeddingStore(str(tmp_path), "mistral-embed")
+        os.makedirs(tmp_path, exist_ok=True)
+        with open(store.manifest_path, "w") as f:
+            f.write("{not json")
+        assert store.load() == ({}, None)
@@ -0,0 +1,124 @@
+"""
+Unit Tests — backend/core/indexes.py
+Tests: the hot-path queries of the app are each served by a declared index
+(prefix rule, sort direction, partial filters), and the planner-style check
+itself. With MONGO_TEST_URI set, the same queries are explained against a real
+server and must not use a collection scan or an in-memory sort.
+"""
+import os
+import sys
+import uuid
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.core.indexes import INDEXES, find_index
+from backend.services.session_reaper import OPEN_SESSION
+
+# (collection, filter, sort) as issued by routes and services
+HOT_QUERIES = [
+    ("users", {"email": "u@t.com"}, []),
+    ("users", {"role": {"$in": ["admin", "super_admin"]}}, []),
+    ("pending_users", {"email": "u@t.com"}, []),
+    ("reset_tokens", {"token": "abc", "expires_at": {"$gt": 0}}, []),
+    ("reset_tokens", {"email": "u@t.com"}, []),
+    ("resumes", {"user_id": "u1"}, [("created_at", -1), ("_id", -1)]),
+    ("resumes", {"user_id": "u1"}, [("created_at", -1)]),
+    ("interviews", {"session_id": "s1"}, []),
+    ("interviews", {"user_id": "u1"}, [("created_at", -1), ("_id", -1)]),
+    ("interview_turns", {"session_id": "s1", "seq": {"$gte": 0}}, [("seq", 1)]),
+    ("audit_logs", {"event_type": "rag_input_validation"}, [("timestamp", -1)]),
+    ("audit_logs", {}, [("timestamp", -1)]),
+]
+
+# Idle session reaper: served by the partial index on open sessions
+REAPER_QUERY = ("interviews", {**OPEN_SESSION, "last_activity_at": {"$lt": 0}}, [("last_activity_at", 1)])
+
+
+def _equality(flt):
+    # Range / $in conditions on a field that heads the sort (or the index) still use it
+    return [f for f, v in flt.items() if not isinstance(v, dict)]
+
+
+def _shape(flt, sort):
+    eq = _equality(flt)
+    ranged = [f for f, v in flt.items() if isinstance(v, dict) and f not in {s for s, _ in sort}]
+    # A range field without a sort on it is treated as the next key in index order
+    return eq, list(sort) or [(f, 1) for f in ranged]
+
+
+class TestHotPaths:
+    @pytest.mark.parametrize("collection,flt,sort", HOT_QUERIES)
+    def test_query_has_an_index(self, collection, flt, sort):
+        eq, order = _shape(flt, sort)
+        assert find_index(collection, eq, order) or find_index(collection, eq), \
+            f"{collection} {flt} sort={sort} would scan the collection"
+
+    @pytest.mark.parametrize("collection,flt,sort", [q for q in HOT_QUERIES if q[2]])
+    def test_sorted_query_avoids_in_memory_sort(self, collection, flt, sort):
+        eq, order = _shape(flt, sort)
+        assert find_index(collection, eq, order), f"{collection} sort={sort} needs an in-memory sort"
+
+    def test_reaper_query_uses_open_session_index(self):
+        collection, _, sort = REAPER_QUERY
+        assert find_index(collection, [], sort, partial=OPEN_SESSION) == "open_last_activity"
+
+
+class TestFindIndex:
+    REG = {
+        "c": [
+            {"name": "a_b", "keys": [("a", 1), ("b", -1)]},
+            {"name": "open", "keys": [("t", 1)], "partialFilterExpression": {"open": True}},
+        ]
+    }
+
+    def test_prefix_and_reverse_sort(self):
+        assert find_index("c", ["a"], [("b", -1)], registry=self.REG) == "a_b"
+        assert find_index("c", ["a"], [("b", 1)], registry=self.REG) == "a_b"
+        assert find_index("c", [], [("a", -1), ("b", 1)], registry=self.REG) == "a_b"
+
+    def test_mixed_direction_sort_not_served(self):
+        assert find_index("c", [], [("a", 1), ("b", 1)], registry=self.REG) is None
+
+    def test_non_prefix_field_not_served(self):
+        assert find_index("c", ["b"], registry=self.REG) is None
+        assert find_index("missing", ["a"], registry=self.REG) is None
+
+    def test_partial_index_needs_its_filter(self):
+        assert find_index("c", [], [("t", 1)], registry=self.REG) is None
+        assert find_index("c", [], [("t", 1)], partial={"open": True}, registry=self.REG) == "open"
+
+    def test_every_index_name_unique_per_collection(self):
+        for coll, specs in INDEXES.items():
+            names = [s["name"] for s in specs]
+            assert len(names) == len(set(names)), coll
+
+
+@pytest.mark.skipif(not os.getenv("MONGO_TEST_URI"), reason="MONGO_TEST_URI not set")
+class TestExplainPlans:
+    @pytest.fixture(scope="class")
+    def scratch_db(self):
+        from pymongo import MongoClient
+        client = MongoClient(os.environ["MONGO_TEST_URI"])
+        db = client[f"icp_explain_{uuid.uuid4().hex[:8]}"]
+        for coll, specs in INDEXES.items():
+            for spec in specs:
+                opts = {k: spec[k] for k in ("unique", "expireAfterSeconds", "partialFilterExpression") if k in spec}
+                db[coll].create_index(spec["keys"], name=spec["name"], **opts)
+            # A handful of documents so the planner has something to choose between (distinct
+            # session_id / seq so the unique indexes accept them)
+            db[coll].insert_many([{"_seed": i, "session_id": f"seed-{i}", "seq": i} for i in range(5)])
+        yield db
+        client.drop_database(db.name)
+        client.close()
+
+    @pytest.mark.parametrize("collection,flt,sort", HOT_QUERIES + [REAPER_QUERY])
+    def test_winning_plan_uses_index(self, scratch_db, collection, flt, sort):
+        cur = scratch_db[collection].find(flt)
+        if sort:
+            cur = cur.sort(sort)
+        plan = str(cur.explain()["queryPlanner"]["winningPlan"])
+        assert "COLLSCAN" not in plan, f"{collection} {flt}: {plan}"
+        assert "'stage': 'SORT'" not in plan, f"{collection} {flt} sorts in memory: {plan}"
@@ -0,0 +1,142 @@
+"""
+Unit Tests — backend/services/interview_context.py
+Tests: fold range selection, bounded history, extractive digest cap, and the
+incremental, conditional summary update on the session document.
+Mongo collection and turn store are mocked; no API key, so the extractive digest is used.
+"""
+import os
+import sys
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.services.interview_context import TranscriptContext
+
+
+def _transcript(n):
+    # Interviewer opens, then user/assistant alternate
+    return [
+        {"role": "assistant" if i % 2 == 0 else "user", "text": f"message {i}"}
+        for i in range(n)
+    ]
+
+
+def _store(transcript):
+    # Turn store that serves transcript[start:]
+    store = MagicMock()
+    store.read = AsyncMock(side_effect=lambda session_id, start=0: transcript[start:])
+    return store
+
+
+class TestFoldRange:
+    def test_short_transcript_not_folded(self):
+        ctx = TranscriptContext(recent_messages=6, fold_every=4)
+        assert ctx.fold_range(_transcript(9), 0) is None
+
+    def test_folds_once_backlog_reaches_fold_every(self):
+        ctx = TranscriptContext(recent_messages=6, fold_every=4)
+        assert ctx.fold_range(_transcript(10), 0) == (0, 4)
+
+    def test_verbatim_window_starts_on_interviewer_message(self):
+        ctx = TranscriptContext(recent_messages=6, fold_every=4)
+        start, end = ctx.fold_range(_transcript(11), 0)
+        assert (start, end) == (0, 4)
+        assert _transcript(11)[end]["role"] == "assistant"
+
+    def test_continues_from_previous_upto(self):
+        ctx = TranscriptContext(recent_messages=6, fold_every=4)
+        assert ctx.fold_range(_transcript(12), 4) is None
+        assert ctx.fold_range(_transcript(14), 4) == (4, 8)
+
+
+class TestHistory:
+    def test_history_skips_summarized_entries(self):
+        ctx = TranscriptContext()
+        history = ctx.build_history(_transcript(10), 4)
+        assert [m["content"] for m in history] == [f"message {i}" for i in range(4, 10)]
+        assert history[0] == {"role": "assistant", "content": "message 4"}
+
+    def test_upto_past_end_is_clamped(self):
+        assert TranscriptContext().build_history(_transcript(3), 10) == []
+
+    def test_history_size_bounded_over_long_session(self):
+        ctx = TranscriptContext(recent_messages=6, fold_every=4)
+        transcript, upto = [], 0
+        for n in range(1, 201):
+            transcript = _transcript(n)
+            rng = ctx.fold_range(transcript, upto)
+            if rng:
+                upto = rng[1]
+            assert len(ctx.build_history(transcript, upto)) < 6 + 4 + 1
+
+
+class TestDigest:
+    def test_digest_appends_one_line_per_entry(self):
+        out = TranscriptContext().digest("", _transcript(2))
+        assert out == "Interviewer: message 0\nCandidate: message 1"
+
+    def test_digest_drops_oldest_lines_past_cap(self):
+        ctx = TranscriptContext(max_summary_chars=200)
+        entries = [{"role": "user", "text": f"answer {i} " + "x" * 40} for i in range(20)]
+        out = ctx.digest("", entries)
+        assert len(out) <= 200
+        assert "answer 19" in out and "answer 0 " not in out
+
+
+class TestSummarize:
+    @pytest.mark.asyncio
+    async def test_summary_call_goes_through_interview_limiter(self):
+        from backend.services.interview_engine import interview_limiter
+        resp = MagicMock()
+        resp.choices = [MagicMock(message=MagicMock(content="Notes."))]
+        call = AsyncMock(return_value=resp)
+        with patch("backend.services.interview_context.MISTRAL_API_KEY", "k"), \
+             patch("backend.services.interview_context.Mistral"), \
+             patch("backend.services.interview_context.mistral_call_async", call):
+            assert await TranscriptContext().summarize("", _transcript(2)) == "Notes."
+        assert call.call_args.kwargs["limiter"] is interview_limiter
+
+class TestRefresh:
+    @pytest.mark.asyncio
+    async def test_refresh_folds_and_writes_conditionally(self):
+        ctx = TranscriptContext(recent_messages=6, fold_every=4)
+        col = MagicMock()
+        col.find_one = AsyncMock(return_value={"_id": "s1"})
+        col.update_one = AsyncMock(return_value=MagicMock(modified_count=1))
+        with patch("backend.services.interview_context.MISTRAL_API_KEY", ""):
+            assert await ctx.refresh(col, "s1", _store(_transcript(10))) is True
+        flt, update = col.update_one.call_args[0]
+        assert flt == {"session_id": "s1", "context_summary_upto": {"$in": [None, 0]}}
+        assert update["$set"]["context_summary_upto"] == 4
+        assert "Candidate: message 3" in update["$set"]["context_summary"]
+
+    @pytest.mark.asyncio
+    async def test_refresh_extends_existing_summary(self):
+        ctx = TranscriptContext(recent_messages=6, fold_every=4)
+        col = MagicMock()
+        col.find_one = AsyncMock(return_value={
+            "context_summary": "Interviewer: earlier", "context_summary_upto": 4,
+        })
+        col.update_one = AsyncMock(return_value=MagicMock(modified_count=1))
+        store = _store(_transcript(14))
+        with patch("backend.services.interview_context.MISTRAL_API_KEY", ""):
+            await ctx.refresh(col, "s1", store)
+        # Only the entries after the existing summary are read
+        assert store.read.call_args.kwargs["start"] == 4
+        flt, update = col.update_one.call_args[0]
+        assert flt["context_summary_upto"] == 4
+        assert update["$set"]["context_summary_upto"] == 8
+        summary = update["$set"]["context_summary"]
+        assert summary.startswith("Interviewer: earlier\n")
+        assert "message 4" in summary and "message 7" in summary and "message 8" not in summary
+
+    @pytest.mark.asyncio
+    async def test_refresh_noop_when_nothing_to_fold(self):
+        col = MagicMock()
+        col.find_one = AsyncMock(return_value={"_id": "s1"})
+        col.update_one = AsyncMock()
+        assert await TranscriptContext().refresh(col, "s1", _store(_transcript(3))) is False
+        col.update_one.assert_not_awaited()
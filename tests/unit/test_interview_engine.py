@@ -1,12 +1,14 @@
 """
 Unit Tests — backend/services/interview_engine.py
-Tests: is_technical_role classification, model usage verification.
+Tests: is_technical_role classification, model usage verification, bounded
+concurrency, prompt prefix layout and stats, candidate profile, JSON turn
+contract, response cache, streaming replies.
 No real network calls — Mistral API is mocked.
 """
 import os
 import sys
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 if ROOT not in sys.path:
@@ -15,6 +17,25 @@ if ROOT not in sys.path:
 from backend.services.interview_engine import is_technical_role
 
 
+def _json_turn(message, asks_question=True, finished=False, score=None, breakdown=None):
+    """Model output in the interview turn JSON contract."""
+    import json
+    return json.dumps({"message": message, "asks_question": asks_question, "finished": finished,
+                       "score": score, "breakdown": breakdown})
+
+
+@pytest.fixture(autouse=True)
+def fresh_response_cache(tmp_path):
+    """Each test gets an empty response cache, so greetings cached by earlier runs never leak in."""
+    import diskcache
+    from backend.services.response_cache import ResponseCache
+    disk = diskcache.Cache(str(tmp_path / "response_cache"))
+    rc = ResponseCache(max_items=2, expire=60, disk=disk)
+    with patch("backend.services.interview_engine.response_cache", rc):
+        yield rc
+    disk.close()
+
+
 # ── is_technical_role ────────────────────────────────────────────────────────
 
 class TestIsTechnicalRole:
@@ -58,25 +79,26 @@ class TestIsTechnicalRole:
 class TestModelUsage:
     """Verify interview_engine uses mistral-small-latest, not large or nemo."""
 
-    def test_uses_mistral_small_latest(self):
+    @pytest.mark.asyncio
+    async def test_uses_mistral_small_latest(self):
         """interview_reply must call mistral-small-latest."""
         captured = {}
 
-        def fake_complete(**kwargs):
+        async def fake_complete(**kwargs):
             captured["model"] = kwargs.get("model")
             mock_resp = MagicMock()
-            mock_resp.choices[0].message.content = (
+            mock_resp.choices[0].message.content = _json_turn(
                 "Hello! Thanks for joining. Could you introduce yourself "
                 "and share why you are interested in this role?"
             )
             return mock_resp
 
         mock_client = MagicMock()
-        mock_client.chat.complete.side_effect = fake_complete
+        mock_client.chat.complete_async = AsyncMock(side_effect=fake_complete)
 
         with patch("backend.services.interview_engine.Mistral", return_value=mock_client):
             from backend.services.interview_engine import interview_reply
-            interview_reply(
+            await interview_reply(
                 history=[],
                 job_title="Software Engineer",
                 questions_limit=5,
@@ -96,3 +118,483 @@ class TestModelUsage:
         assert "mistral-small-latest" in src
         assert "mistral-large-latest" not in src
         assert "open-mistral-nemo" not in src
+
+
+class TestConcurrency:
+    @pytest.mark.asyncio
+    async def test_completions_bounded_by_limiter(self):
+        import asyncio
+        from backend.services.interview_engine import interview_reply
+        from backend.services.mistral_retry import ConcurrencyLimiter
+        in_flight, peak = 0, 0
+
+        async def slow_complete(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            resp = MagicMock()
+            resp.choices[0].message.content = _json_turn("What is your experience with SQL?")
+            return resp
+
+        client = MagicMock()
+        client.chat.complete_async = AsyncMock(side_effect=slow_complete)
+        history = [{"role": "user", "content": "hi"}]
+        with patch("backend.services.interview_engine.Mistral", return_value=client), \
+             patch("backend.services.interview_engine.interview_limiter", ConcurrencyLimiter(2)):
+            replies = await asyncio.gather(*(
+                interview_reply(history, job_title="Engineer", current_asked_count=2) for _ in range(6)
+            ))
+        assert peak == 2
+        assert [r["message"] for r in replies] == ["What is your experience with SQL?"] * 6
+
+
+# ── Prompt layout ────────────────────────────────────────────────────────────
+
+class TestPromptLayout:
+    def _system(self, **kwargs):
+        from backend.services.interview_engine import build_interview_messages
+        return build_interview_messages([], **kwargs)[0]["content"]
+
+    def test_static_prefix_identical_across_turns(self):
+        from backend.services.interview_engine import static_system_prefix
+        prefix = static_system_prefix("Data Analyst", "Intermediate", True)
+        for asked in (0, 1, 4, 5):
+            system = self._system(job_title="Data Analyst", difficulty="Intermediate",
+                                  questions_limit=5, current_asked_count=asked)
+            assert system.startswith(prefix)
+
+    def test_prefix_is_memoized(self):
+        from backend.services.interview_engine import static_system_prefix
+        self._system(job_title="Nurse", difficulty="Beginner")
+        before = static_system_prefix.cache_info().hits
+        self._system(job_title="Nurse", difficulty="Beginner", current_asked_count=3)
+        assert static_system_prefix.cache_info().hits == before + 1
+
+    def test_volatile_progress_block_comes_last(self):
+        system = self._system(job_title="Nurse", difficulty="Advanced", questions_limit=7,
+                              current_asked_count=2, resume_feedback={"Score": 70})
+        mix = system.index("QUESTION MIX")
+        session = system.index("Resume Score: 70/100")
+        progress = system.index("CRITICAL PROGRESS TRACKING")
+        assert mix < session < progress
+        assert "Questions Asked So Far: 2" in system[progress:]
+        assert "Questions Asked So Far" not in system[:progress]
+        assert "question #3 of 7" in system[progress:]
+
+    def test_stored_profile_used_verbatim(self):
+        system = self._system(job_title="Nurse", resume_feedback="Detected Title: Staff Nurse")
+        assert "  Detected Title: Staff Nurse\n" in system
+
+    def test_prefix_contains_role_and_difficulty(self):
+        from backend.services.interview_engine import static_system_prefix
+        prefix = static_system_prefix("Nurse", "Advanced", False)
+        assert "Target Job Title: Nurse" in prefix
+        assert "deep expertise" in prefix
+        assert "Non-Technical Role" in prefix
+
+    def test_prompt_stats_track_bytes_and_reported_tokens(self):
+        from backend.services.interview_engine import get_prompt_stats, record_prompt_usage
+        before = get_prompt_stats()
+        self._system(job_title="Nurse", difficulty="Beginner")
+        record_prompt_usage(MagicMock(usage=MagicMock(prompt_tokens=321)))
+        record_prompt_usage(MagicMock())  # no int usage: ignored
+        after = get_prompt_stats()
+        assert after["turns"] == before["turns"] + 1
+        assert after["prompt_bytes"] > before["prompt_bytes"]
+        assert after["static_prefix_bytes"] > before["static_prefix_bytes"]
+        assert after["usage_reports"] == before["usage_reports"] + 1
+        assert after["prompt_tokens"] == before["prompt_tokens"] + 321
+        assert 0 < after["static_prefix_share"] < 1
+        assert set(after["prefix_cache"]) == {"hits", "misses", "size"}
+
+
+# ── Candidate profile ────────────────────────────────────────────────────────
+
+FEEDBACK = {
+    "Score": 78, "DetectedJobTitle": "Backend Developer",
+    "Keywords": ["Python", "FastAPI", "MongoDB"],
+    "Advantages": ["Strong API design experience.", "Clear impact metrics.", "Good testing habits.", "Extra one."],
+    "Disadvantages": ["No cloud certifications."],
+    "Experience": [{"Company": "Acme", "Bullets": ["x" * 500]}],
+    "Suggestions": ["y" * 500],
+}
+
+
+class TestCandidateProfile:
+    def test_profile_keeps_title_keywords_strengths_and_gaps(self):
+        from backend.services.interview_engine import build_candidate_profile
+        profile = build_candidate_profile(FEEDBACK)
+        assert profile.split("\n") == [
+            "Detected Title: Backend Developer",
+            "Resume Score: 78/100",
+            "Keywords: Python, FastAPI, MongoDB",
+            "Strength: Strong API design experience.",
+            "Strength: Clear impact metrics.",
+            "Strength: Good testing habits.",
+            "Gap: No cloud certifications.",
+        ]
+
+    def test_profile_omits_bulky_sections(self):
+        from backend.services.interview_engine import build_candidate_profile
+        profile = build_candidate_profile(FEEDBACK)
+        assert "Acme" not in profile and "yyy" not in profile
+        assert len(profile) < len(str(FEEDBACK)) / 3
+
+    def test_profile_respects_budget(self):
+        from backend.services.interview_engine import build_candidate_profile
+        feedback = {**FEEDBACK, "Advantages": ["z" * 300] * 3}
+        profile = build_candidate_profile(feedback, max_chars=200)
+        assert len(profile) <= 200
+        assert profile.startswith("Detected Title: Backend Developer")
+
+    def test_empty_or_invalid_feedback(self):
+        from backend.services.interview_engine import build_candidate_profile
+        assert build_candidate_profile(None) == ""
+        assert build_candidate_profile({}) == ""
+        assert build_candidate_profile({"Keywords": "SQL, Excel"}) == "Keywords: SQL, Excel"
+
+
+# ── Turn contract ────────────────────────────────────────────────────────────
+
+class TestTurnContract:
+    def test_parse_turn_reads_fields(self):
+        from backend.services.interview_engine import parse_turn
+        turn = parse_turn(_json_turn("Thanks.", asks_question=False, finished=True, score="85",
+                                     breakdown={"technical": 25}))
+        assert turn == {"message": "Thanks.", "asks_question": False, "finished": True,
+                        "score": 85, "breakdown": {"technical": 25}}
+
+    def test_parse_turn_rejects_non_json(self):
+        from backend.services.interview_engine import parse_turn
+        assert parse_turn("What is a REST API?") is None
+        assert parse_turn('{"text": "no message key"}') is None
+        assert parse_turn(None) is None
+
+    def test_premature_finish_is_dropped_without_correction(self):
+        from backend.services.interview_engine import parse_turn, validate_turn
+        turn = parse_turn(_json_turn("Good answer. What is your biggest weakness? [FINISH]",
+                                     finished=True, score=70))
+        assert validate_turn(turn, premature=True, force_end=False) is False
+        assert turn["message"] == "Good answer. What is your biggest weakness?"
+        assert turn["finished"] is False and turn["score"] is None
+
+    def test_turn_without_question_needs_correction(self):
+        from backend.services.interview_engine import parse_turn, validate_turn
+        turn = parse_turn(_json_turn("Thank you, goodbye.", asks_question=False, finished=True))
+        assert validate_turn(turn, premature=True, force_end=False) is True
+
+    def test_force_end_always_finishes_without_score(self):
+        from backend.services.interview_engine import parse_turn, validate_turn
+        turn = parse_turn(_json_turn("Session closed.", asks_question=False, score=40))
+        assert validate_turn(turn, premature=True, force_end=True) is False
+        assert turn["finished"] is True and turn["score"] is None
+
+    @pytest.mark.asyncio
+    async def test_plain_text_closing_keeps_score(self):
+        from backend.services.interview_engine import interview_reply, normalize_score
+        closing = MagicMock()
+        closing.choices[0].message.content = (
+            "Thank you!\n\nGreat work.\nInterview Readiness Score: 80/100\n"
+            "Breakdown: Technical: 24, Communication: 24, Alignment: 16, Relevance: 16 [FINISH]")
+        client = MagicMock()
+        client.chat.complete_async = AsyncMock(return_value=closing)
+        with patch("backend.services.interview_engine.Mistral", return_value=client):
+            turn = await interview_reply([{"role": "user", "content": "my last answer"}], job_title="Engineer",
+                                         questions_limit=5, current_asked_count=5)
+        assert turn["message"] == "Thank you!\n\nGreat work."
+        assert turn["finished"] is True and turn["score"] == 80
+        assert normalize_score(turn["score"], turn["breakdown"])[1] == {
+            "TechnicalScore": 24, "CommunicationScore": 24, "AlignmentScore": 16, "RelevanceScore": 16}
+
+    def test_normalize_score_rescales_breakdown(self):
+        from backend.services.interview_engine import normalize_score
+        score, breakdown = normalize_score(80, {"technical": 40, "communication": 30, "alignment": 20, "relevance": 10})
+        assert score == 80
+        assert breakdown["TechnicalScore"] <= 30 and breakdown["AlignmentScore"] <= 20
+        assert set(breakdown) == {"TechnicalScore", "CommunicationScore", "AlignmentScore", "RelevanceScore"}
+
+    def test_normalize_score_fallbacks(self):
+        from backend.services.interview_engine import normalize_score
+        assert normalize_score(100, None) == (100, {"TechnicalScore": 30, "CommunicationScore": 30,
+                                                    "AlignmentScore": 20, "RelevanceScore": 20})
+        assert normalize_score(None, None)[1] == {"TechnicalScore": 0, "CommunicationScore": 0,
+                                                  "AlignmentScore": 0, "RelevanceScore": 0}
+        assert normalize_score(None, {"technical": 10, "communication": 10, "alignment": 5, "relevance": 5})[0] == 30
+
+    @pytest.mark.asyncio
+    async def test_correction_is_counted(self):
+        from backend.services.interview_engine import interview_reply, get_prompt_stats
+        bad, good = MagicMock(), MagicMock()
+        bad.choices[0].message.content = _json_turn("Thanks, goodbye.", asks_question=False, finished=True)
+        good.choices[0].message.content = _json_turn("What is a REST API?")
+        client = MagicMock()
+        client.chat.complete_async = AsyncMock(side_effect=[bad, good])
+        before = get_prompt_stats()
+        with patch("backend.services.interview_engine.Mistral", return_value=client):
+            turn = await interview_reply([{"role": "user", "content": "hi"}], job_title="Engineer",
+                                         questions_limit=5, current_asked_count=2)
+        after = get_prompt_stats()
+        assert turn["message"] == "What is a REST API?"
+        assert after["corrections"] == before["corrections"] + 1
+        assert after["structured_turns"] == before["structured_turns"] + 2
+        assert 0 < after["correction_rate"] <= 1
+        assert client.chat.complete_async.await_args_list[0].kwargs["response_format"] == {"type": "json_object"}
+
+
+class TestJsonMessageStream:
+    def _run(self, raw, size):
+        from backend.services.interview_engine import JsonMessageStream
+        stream = JsonMessageStream()
+        return "".join(stream.feed(raw[i:i + size]) for i in range(0, len(raw), size))
+
+    def test_extracts_message_across_any_split(self):
+        raw = _json_turn('Say "hi"\n\u00e9 then? \\ done')
+        for size in (1, 2, 3, 5, 64):
+            assert self._run(raw, size) == 'Say "hi"\n\u00e9 then? \\ done'
+
+    def test_ignores_other_fields(self):
+        raw = '{"finished": false, "message": "Why?", "score": null}'
+        assert self._run(raw, 4) == "Why?"
+
+
+# ── Response cache ───────────────────────────────────────────────────────────
+
+def _client(text="Hello! Could you introduce yourself?"):
+    client = MagicMock()
+    resp = MagicMock()
+    resp.choices[0].message.content = _json_turn(text)
+    client.chat.complete_async = AsyncMock(return_value=resp)
+    return client
+
+
+class TestResponseCache:
+    @pytest.mark.asyncio
+    async def test_greeting_served_from_cache(self, fresh_response_cache):
+        from backend.services.interview_engine import interview_reply
+        client = _client()
+        with patch("backend.services.interview_engine.Mistral", return_value=client):
+            first = await interview_reply([], job_title="Nurse", resume_feedback="Keywords: triage", questions_limit=10)
+            second = await interview_reply([], job_title="Nurse", resume_feedback="Keywords: triage", questions_limit=10)
+        assert first == second
+        assert client.chat.complete_async.await_count == 1
+        stats = fresh_response_cache.get_stats()["greeting"]
+        assert stats["misses"] == 1 and stats["memory_hits"] == 1 and stats["stores"] == 1
+
+    def test_greeting_key_includes_profile(self):
+        from backend.services.response_cache import ResponseCache
+        a = ResponseCache.key_for([], "Nurse", "Keywords: triage", 10, "Beginner", 0, False)
+        b = ResponseCache.key_for([], "Nurse", "Keywords: surgery", 10, "Beginner", 0, False)
+        assert a.startswith("interview:reply:greeting:") and a != b
+
+    @pytest.mark.asyncio
+    async def test_mid_session_turns_not_cached(self, fresh_response_cache):
+        from backend.services.interview_engine import interview_reply
+        from backend.services.response_cache import ResponseCache
+        history = [{"role": "assistant", "content": "Hi?"}, {"role": "user", "content": "Hello"}]
+        assert ResponseCache.key_for(history, "Nurse", "", 10, "Beginner", 1, False) is None
+        client = _client("What is triage?")
+        with patch("backend.services.interview_engine.Mistral", return_value=client):
+            await interview_reply(history, job_title="Nurse", current_asked_count=1)
+            await interview_reply(history, job_title="Nurse", current_asked_count=1)
+        assert client.chat.complete_async.await_count == 2
+        assert fresh_response_cache.get_stats()["greeting"]["misses"] == 0
+
+    def test_force_end_without_answers_keyed_by_end_instruction(self):
+        from backend.services.response_cache import ResponseCache
+        greeting = {"role": "assistant", "content": "Hi, introduce yourself?"}
+        skipped = [greeting, {"role": "user", "content": "[SYSTEM MESSAGE]: skipped"}]
+        other_skipped = [{"role": "assistant", "content": "Hello!"}, {"role": "user", "content": "[SYSTEM MESSAGE]: skipped"}]
+        key = ResponseCache.key_for(skipped, "Nurse", "", 10, "Beginner", 1, True)
+        assert key.startswith("interview:reply:force_end:")
+        assert key == ResponseCache.key_for(other_skipped, "Nurse", "", 10, "Beginner", 1, True)
+        assert key != ResponseCache.key_for([greeting, {"role": "user", "content": "[SYSTEM MESSAGE]: other"}],
+                                            "Nurse", "", 10, "Beginner", 1, True)
+
+    @pytest.mark.asyncio
+    async def test_force_end_after_answers_not_shared_between_sessions(self, fresh_response_cache):
+        from backend.services.interview_engine import interview_reply
+        from backend.services.response_cache import ResponseCache
+        end = {"role": "user", "content": "[SYSTEM MESSAGE]: answered"}
+        alice = [{"role": "assistant", "content": "Q1?"}, {"role": "user", "content": "I led the Postgres migration."}, end]
+        bob = [{"role": "assistant", "content": "Q1?"}, {"role": "user", "content": "I build mobile apps."}, end]
+        assert ResponseCache.key_for(alice, "Nurse", "", 10, "Beginner", 1, True) is None
+        client = _client("Thanks, your Postgres migration story was strong.")
+        with patch("backend.services.interview_engine.Mistral", return_value=client):
+            await interview_reply(alice, job_title="Nurse", current_asked_count=1, force_end=True)
+            await interview_reply(bob, job_title="Nurse", current_asked_count=1, force_end=True)
+        assert client.chat.complete_async.await_count == 2
+        assert fresh_response_cache.get_stats()["force_end"]["stores"] == 0
+
+    def test_disk_tier_survives_memory_eviction(self, fresh_response_cache):
+        rc = fresh_response_cache
+        keys = [rc.key_for([], f"Role {i}", "", 10, "Beginner", 0, False) for i in range(3)]
+        for i, key in enumerate(keys):
+            rc.set(key, f"greeting {i}")
+        assert rc.get_stats()["memory_items"] == 2
+        assert rc.get(keys[0]) == "greeting 0"
+        assert rc.get_stats()["greeting"]["disk_hits"] == 1
+
+    def test_prompt_stats_include_response_cache(self):
+        from backend.services.interview_engine import get_prompt_stats
+        assert set(get_prompt_stats()["response_cache"]) == {"memory_items", "greeting", "force_end"}
+
+
+# ── Streaming ────────────────────────────────────────────────────────────────
+
+def _run_filter(chunks, premature=True, force_end=False):
+    from backend.services.interview_engine import ReplyStreamFilter
+    f = ReplyStreamFilter(premature, force_end)
+    return "".join(f.feed(c) for c in chunks) + f.close()
+
+
+class TestReplyStreamFilter:
+    def test_plain_text_passes_through(self):
+        assert _run_filter(["Thanks. What ", "is your ", "greatest strength?"]) == "Thanks. What is your greatest strength?"
+
+    def test_finish_split_across_chunks_is_hidden(self):
+        assert _run_filter(["Goodbye! [FIN", "ISH]"], premature=False) == "Goodbye! "
+
+    def test_final_score_lines_kept_when_not_premature(self):
+        text = "Thanks!\nInterview Readiness Score: 80/100\n[FINISH]"
+        assert _run_filter([text[:20], text[20:]], premature=False) == "Thanks!\nInterview Readiness Score: 80/100\n"
+
+    def test_premature_score_line_dropped(self):
+        chunks = ["Good answer.\nInterview Read", "iness Score: 70", "/100\nWhat else?"]
+        assert _run_filter(chunks) == "Good answer.\n\nWhat else?"
+
+    def test_premature_feedback_header_cuts_rest(self):
+        chunks = ["Next question?\nPerformance ", "Feedback: you did well", " overall."]
+        assert _run_filter(chunks) == "Next question?\n"
+
+    def test_force_end_keeps_feedback_but_drops_score(self):
+        chunks = ["Overall Feedback: ok.\nInterview Readiness Score: 10/100\n", "[FINISH]"]
+        assert _run_filter(chunks, premature=True, force_end=True) == "Overall Feedback: ok.\n\n"
+
+    def test_held_back_prefix_released_when_not_a_marker(self):
+        from backend.services.interview_engine import ReplyStreamFilter
+        f = ReplyStreamFilter(premature=True)
+        assert f.feed("Tell me about your [") == "Tell me about your "
+        assert f.feed("team] lead role?") == "[team] lead role?"
+
+    def test_leading_whitespace_trimmed(self):
+        assert _run_filter(["  \n", " Hello?"]) == "Hello?"
+
+
+def _stream_events(texts):
+    from unittest.mock import MagicMock
+
+    class _Stream:
+        def __init__(self):
+            self._it = iter(texts)
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            try:
+                text = next(self._it)
+            except StopIteration:
+                raise StopAsyncIteration
+            event = MagicMock()
+            event.data.choices = [MagicMock(delta=MagicMock(content=text))]
+            return event
+
+    return _Stream()
+
+
+class TestStreamInterviewReply:
+    async def _collect(self, client, **kwargs):
+        from backend.services.interview_engine import stream_interview_reply
+        with patch("backend.services.interview_engine.Mistral", return_value=client):
+            return [e async for e in stream_interview_reply(**kwargs)]
+
+    @pytest.mark.asyncio
+    async def test_tokens_then_final(self):
+        from unittest.mock import AsyncMock
+        client = MagicMock()
+        raw = _json_turn("Hello! Could you \"introduce\"\nyourself?")
+        chunks = [raw[i:i + 7] for i in range(0, len(raw), 7)]
+        client.chat.stream_async = AsyncMock(return_value=_stream_events(chunks))
+        events = await self._collect(client, history=[], job_title="Engineer", questions_limit=5, current_asked_count=0)
+        tokens = [t for k, t in events if k == "token"]
+        assert "".join(tokens) == "Hello! Could you \"introduce\"\nyourself?"
+        kind, turn = events[-1]
+        assert kind == "final" and turn["message"] == "Hello! Could you \"introduce\"\nyourself?"
+        assert turn["finished"] is False
+        kwargs = client.chat.stream_async.await_args.kwargs
+        assert kwargs["model"] == "mistral-small-latest"
+        assert kwargs["response_format"] == {"type": "json_object"}
+
+    @pytest.mark.asyncio
+    async def test_cached_greeting_streamed_without_model_call(self, fresh_response_cache):
+        from unittest.mock import AsyncMock
+        key = fresh_response_cache.key_for([], "Engineer", None, 5, "Beginner", 0, False)
+        turn = {"message": "Welcome back?", "asks_question": True, "finished": False, "score": None, "breakdown": None}
+        fresh_response_cache.set(key, turn)
+        client = MagicMock()
+        client.chat.stream_async = AsyncMock()
+        events = await self._collect(client, history=[], job_title="Engineer", questions_limit=5, current_asked_count=0)
+        assert events == [("token", "Welcome back?"), ("final", turn)]
+        client.chat.stream_async.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_final_is_corrected_when_model_ends_early(self):
+        from unittest.mock import AsyncMock
+        client = MagicMock()
+        client.chat.stream_async = AsyncMock(return_value=_stream_events(
+            [_json_turn("Thank you, goodbye. [FINISH]", asks_question=False, finished=True, score=90)]))
+        retry = MagicMock()
+        retry.choices[0].message.content = _json_turn("What is a REST API?")
+        client.chat.complete_async = AsyncMock(return_value=retry)
+        events = await self._collect(client, history=[{"role": "user", "content": "hi"}],
+                                     job_title="Engineer", questions_limit=5, current_asked_count=2)
+        assert "[FINISH]" not in "".join(t for k, t in events if k == "token")
+        kind, turn = events[-1]
+        assert turn["message"] == "What is a REST API?"
+        assert turn["finished"] is False and turn["score"] is None
+        client.chat.complete_async.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_limiter_slot_not_held_while_stream_is_read(self):
+        import asyncio
+        from unittest.mock import AsyncMock
+        from backend.services.interview_engine import stream_interview_reply
+        from backend.services.mistral_retry import ConcurrencyLimiter
+        limiter = ConcurrencyLimiter(1)
+        client = MagicMock()
+        raw = _json_turn("What is a REST API?")
+        client.chat.stream_async = AsyncMock(return_value=_stream_events([raw[:20], raw[20:]]))
+        with patch("backend.services.interview_engine.Mistral", return_value=client), \
+             patch("backend.services.interview_engine.interview_limiter", limiter):
+            gen = stream_interview_reply([{"role": "user", "content": "hi"}], job_title="Engineer",
+                                         questions_limit=5, current_asked_count=2)
+            assert (await gen.__anext__())[0] == "token"
+            # A paused reader must not keep other sessions from opening their streams
+            async def other_session():
+                async with limiter:
+                    pass
+            await asyncio.wait_for(other_session(), timeout=0.5)
+            await gen.aclose()
+
+    @pytest.mark.asyncio
+    async def test_wrap_up_keeps_finish_in_final_text(self):
+        from unittest.mock import AsyncMock
+        client = MagicMock()
+        breakdown = {"technical": 24, "communication": 24, "alignment": 16, "relevance": 16}
+        text = _json_turn("Thank you!\n\nGood work.", asks_question=False, finished=True, score=80, breakdown=breakdown)
+        client.chat.stream_async = AsyncMock(return_value=_stream_events([text]))
+        events = await self._collect(client, history=[], questions_limit=5, current_asked_count=5)
+        assert events[-1] == ("final", {"message": "Thank you!\n\nGood work.", "asks_question": False,
+                                        "finished": True, "score": 80, "breakdown": breakdown})
+
+    @pytest.mark.asyncio
+    async def test_plain_text_output_still_shown(self):
+        from unittest.mock import AsyncMock
+        client = MagicMock()
+        client.chat.stream_async = AsyncMock(return_value=_stream_events(["What is ", "a REST API?"]))
+        events = await self._collect(client, history=[{"role": "user", "content": "hi"}],
+                                     job_title="Engineer", questions_limit=5, current_asked_count=2)
+        assert events == [("token", "What is a REST API?"), ("final", {
+            "message": "What is a REST API?", "asks_question": True, "finished": False, "score": None, "breakdown": None})]
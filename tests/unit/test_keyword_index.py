@@ -0,0 +1,70 @@
+"""
+Unit Tests — backend/services/keyword_index.py
+Tests: tokenization, postings construction, BM25 scoring and normalization.
+Pure NumPy — no DB or network.
+"""
+import os
+import sys
+import numpy as np
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.services.keyword_index import KeywordIndex, tokenize
+
+CHUNKS = [
+    "Python developers should list Django and Flask projects on the resume.",
+    "Behavioural interviews use the STAR method: situation, task, action, result.",
+    "A resume summary should be two to three sentences long.",
+    "",
+]
+
+
+class TestTokenize:
+    def test_lowercases_and_splits_on_non_word(self):
+        assert tokenize("STAR-method, Python3!") == ["star", "method", "python3"]
+
+    def test_empty_string(self):
+        assert tokenize("") == []
+
+
+class TestKeywordIndex:
+    def test_vocabulary_and_lengths(self):
+        idx = KeywordIndex(CHUNKS)
+        assert idx.n_docs == 4
+        assert "resume" in idx.vocab
+        assert idx.doc_lengths[3] == 0
+        resume_id = idx.vocab["resume"]
+        assert idx.postings_docs[resume_id].tolist() == [0, 2]
+
+    def test_scores_are_dense_and_aligned(self):
+        idx = KeywordIndex(CHUNKS)
+        scores = idx.scores("python resume")
+        assert scores.shape == (4,)
+        assert scores.dtype == np.float32
+        assert int(np.argmax(scores)) == 0
+        assert scores[1] == 0.0 and scores[3] == 0.0
+
+    def test_normalized_scores_peak_at_one(self):
+        idx = KeywordIndex(CHUNKS)
+        assert idx.scores("interview star method").max() == pytest.approx(1.0)
+
+    def test_raw_scores_not_normalized(self):
+        idx = KeywordIndex(CHUNKS)
+        raw = idx.scores("interview star method", normalize=False)
+        assert raw.max() > 1.0
+
+    def test_rare_terms_outweigh_common_terms(self):
+        idx = KeywordIndex(CHUNKS)
+        # "django" appears once, "resume" twice — rare term carries more weight
+        assert idx.idf[idx.vocab["django"]] > idx.idf[idx.vocab["resume"]]
+
+    def test_unknown_terms_score_zero(self):
+        idx = KeywordIndex(CHUNKS)
+        assert not idx.scores("kubernetes terraform").any()
+
+    def test_empty_corpus(self):
+        idx = KeywordIndex([])
+        assert idx.scores("anything").shape == (0,)
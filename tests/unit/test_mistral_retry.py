@@ -1,6 +1,7 @@
 """
 Unit Tests — backend/services/mistral_retry.py
-Tests: retry logic, circuit breaker open/close, rate-limit detection.
+Tests: sync and async retry logic, circuit breaker open/close, rate-limit
+detection, concurrency limiter.
 No real network calls.
 """
 import os
@@ -96,6 +97,66 @@ class TestMistralCall:
         mock_sleep.assert_called_once_with(2.0)
 
 
+class TestMistralCallAsync:
+    def setup_method(self):
+        _reset_circuit()
+
+    @pytest.mark.asyncio
+    async def test_retries_with_async_sleep(self):
+        from unittest.mock import AsyncMock
+        from backend.services.mistral_retry import mistral_call_async
+        fn = AsyncMock(side_effect=[Exception("429 rate limit"), "ok"])
+        with patch("backend.services.mistral_retry.asyncio.sleep", new_callable=AsyncMock) as mock_sleep, \
+             patch("backend.services.mistral_retry.time.sleep") as blocking_sleep:
+            assert await mistral_call_async(fn, max_retries=2, wait_seconds=2.0) == "ok"
+        mock_sleep.assert_awaited_once_with(2.0)
+        blocking_sleep.assert_not_called()
+        assert fn.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_raises_immediately(self):
+        from unittest.mock import AsyncMock
+        from backend.services.mistral_retry import mistral_call_async
+        fn = AsyncMock(side_effect=ValueError("invalid API key"))
+        with pytest.raises(ValueError):
+            await mistral_call_async(fn)
+        fn.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_raises_without_calling_fn(self):
+        from unittest.mock import AsyncMock
+        import backend.services.mistral_retry as mr
+        mr._cb_open_until = time.time() + 30.0
+        fn = AsyncMock(return_value="ok")
+        with pytest.raises(RuntimeError, match="AI_RATE_LIMIT"):
+            await mr.mistral_call_async(fn)
+        fn.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_limiter_slot_not_held_while_waiting_to_retry(self):
+        import asyncio
+        from backend.services.mistral_retry import ConcurrencyLimiter, mistral_call_async
+        limiter = ConcurrencyLimiter(1)
+        calls = []
+
+        async def flaky():
+            calls.append("flaky")
+            if len(calls) == 1:
+                raise Exception("503 service unavailable")
+            return "flaky ok"
+
+        async def quick():
+            calls.append("quick")
+            return "quick ok"
+
+        results = await asyncio.gather(
+            mistral_call_async(flaky, wait_seconds=0.05, limiter=limiter),
+            mistral_call_async(quick, limiter=limiter),
+        )
+        assert results == ["flaky ok", "quick ok"]
+        assert calls == ["flaky", "quick", "flaky"]
+
+
 class TestCircuitBreaker:
     def setup_method(self):
         _reset_circuit()
@@ -128,3 +189,63 @@ class TestCircuitBreaker:
         mr._cb_open_until = 0.0   # ensure closed
         fn = MagicMock(return_value="result")
         assert mistral_call(fn) == "result"
+
+
+class TestConcurrencyLimiter:
+    @pytest.mark.asyncio
+    async def test_caps_in_flight_calls(self):
+        import asyncio
+        from backend.services.mistral_retry import ConcurrencyLimiter
+        limiter = ConcurrencyLimiter(2)
+        in_flight, peak = 0, 0
+
+        async def call():
+            nonlocal in_flight, peak
+            async with limiter:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_releases_slot_on_error(self):
+        from backend.services.mistral_retry import ConcurrencyLimiter
+        limiter = ConcurrencyLimiter(1)
+        with pytest.raises(ValueError):
+            async with limiter:
+                raise ValueError("boom")
+        async with limiter:   # would deadlock if the slot leaked
+            pass
+
+    def test_releases_the_semaphore_it_acquired(self):
+        import asyncio
+        from backend.services.mistral_retry import ConcurrencyLimiter
+        limiter = ConcurrencyLimiter(1)
+
+        async def hold_across_loop_change():
+            async with limiter:
+                first = limiter._semaphore
+                # Another loop (e.g. a worker restart) swaps in a fresh semaphore meanwhile
+                limiter._semaphore = asyncio.Semaphore(1)
+            return first
+
+        first = asyncio.run(hold_across_loop_change())
+        assert not first.locked()
+        assert not limiter._semaphore.locked()
+
+    @pytest.mark.asyncio
+    async def test_nested_holds_release_in_order(self):
+        from backend.services.mistral_retry import ConcurrencyLimiter
+        limiter = ConcurrencyLimiter(2)
+        async with limiter:
+            async with limiter:
+                assert limiter._semaphore.locked()
+            assert not limiter._semaphore.locked()
+        assert limiter._held.get() == ()
+
+    def test_minimum_of_one_slot(self):
+        from backend.services.mistral_retry import ConcurrencyLimiter
+        assert ConcurrencyLimiter(0).max_concurrency == 1
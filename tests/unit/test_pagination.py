@@ -0,0 +1,87 @@
+"""
+Unit Tests — backend/services/pagination.py
+Tests: cursor round-trip and tie-breaking filter, malformed cursors, page size
+capping and next-cursor detection. Collection is a mock — no DB.
+"""
+import os
+import sys
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from bson import ObjectId
+from backend.services.pagination import encode_cursor, cursor_filter, fetch_page, MAX_PAGE_SIZE
+
+BASE = datetime(2025, 1, 10, tzinfo=timezone.utc)
+
+
+class _Cursor:
+    def __init__(self, items):
+        self._items = list(items)
+        self.sorted_by = None
+    def sort(self, keys):
+        self.sorted_by = keys
+        return self
+    def limit(self, n):
+        self._items = self._items[:n]
+        return self
+    def __aiter__(self):
+        return self
+    async def __anext__(self):
+        if not self._items:
+            raise StopAsyncIteration
+        return self._items.pop(0)
+
+
+def _docs(n):
+    return [{"_id": ObjectId(f"507f1f77bcf86cd79943{i:04d}"), "created_at": BASE - timedelta(hours=i)}
+            for i in range(n)]
+
+
+class TestCursor:
+    def test_round_trip_filters_after_last_item(self):
+        doc = _docs(1)[0]
+        flt = cursor_filter(encode_cursor(doc))
+        assert flt == {"$or": [
+            {"created_at": {"$lt": doc["created_at"]}},
+            {"created_at": doc["created_at"], "_id": {"$lt": doc["_id"]}},
+        ]}
+
+    def test_missing_created_at_has_no_cursor(self):
+        assert encode_cursor({"_id": "x", "created_at": None}) is None
+
+    @pytest.mark.parametrize("bad", ["", "no-separator", "2025-01-01|not-an-oid", "yesterday|507f1f77bcf86cd799439011"])
+    def test_malformed_cursor_raises(self, bad):
+        with pytest.raises(ValueError):
+            cursor_filter(bad)
+
+
+class TestFetchPage:
+    @pytest.mark.asyncio
+    async def test_next_cursor_only_when_more_remain(self):
+        col = MagicMock()
+        col.find = MagicMock(side_effect=lambda q, p: _Cursor(_docs(3)))
+        docs, nxt = await fetch_page(col, {"user_id": "u"}, {"created_at": 1}, 2)
+        assert len(docs) == 2 and nxt == encode_cursor(docs[-1])
+        docs, nxt = await fetch_page(col, {"user_id": "u"}, {"created_at": 1}, 5)
+        assert len(docs) == 3 and nxt is None
+
+    @pytest.mark.asyncio
+    async def test_before_is_combined_with_query(self):
+        col = MagicMock()
+        col.find = MagicMock(return_value=_Cursor([]))
+        before = encode_cursor(_docs(1)[0])
+        await fetch_page(col, {"user_id": "u"}, {}, 10, before)
+        query = col.find.call_args[0][0]
+        assert query == {"$and": [{"user_id": "u"}, cursor_filter(before)]}
+
+    @pytest.mark.asyncio
+    async def test_page_size_capped(self):
+        col = MagicMock()
+        col.find = MagicMock(side_effect=lambda q, p: _Cursor(_docs(MAX_PAGE_SIZE + 20)))
+        docs, nxt = await fetch_page(col, {}, {}, 10_000)
+        assert len(docs) == MAX_PAGE_SIZE and nxt is not None
@@ -1,6 +1,8 @@
 """
 Unit Tests — backend/services/rag_engine.py
-Tests: model usage verification for embeddings and reranking calls.
+Tests: model usage verification for embeddings and reranking calls,
+vectorized hybrid retrieval (semantic + BM25), retrieval and query-embedding caches, corpus hot-reload,
+CRAG verdict cache and confidence shortcut, local input guardrail routing.
 No real network calls — Mistral client is inspected via source analysis.
 """
 import os
@@ -70,3 +72,416 @@ class TestRagEngineModelUsage:
         assert count >= 3, (
             f"Expected at least 3 uses of 'ministral-14b-2512' in rag_engine, found {count}"
         )
+
+
+# ── Vectorized retrieval ─────────────────────────────────────────────────────
+
+def _embedding_response(vectors):
+    from unittest.mock import MagicMock
+    resp = MagicMock()
+    resp.data = [MagicMock(embedding=list(v)) for v in vectors]
+    return resp
+
+
+def _snapshot(chunks, vectors, corpus_version="v1", ann_lists=0):
+    """In-memory CorpusSnapshot; vectors=None gives keyword-only mode."""
+    from backend.services.rag_engine import RAGEngine, CorpusSnapshot
+    from backend.services.keyword_index import KeywordIndex
+    from backend.services.ann_index import IVFIndex
+    embeddings = RAGEngine._to_matrix(vectors) if vectors is not None else None
+    ann = IVFIndex.build(embeddings, n_lists=ann_lists) if ann_lists else None
+    return CorpusSnapshot(list(chunks), embeddings, KeywordIndex(list(chunks)), ann, corpus_version)
+
+
+def _ready_engine(chunks, vectors, **snapshot_kwargs):
+    """Build an initialized RAGEngine over in-memory chunks — no network."""
+    from unittest.mock import AsyncMock, MagicMock
+    from backend.services.rag_engine import RAGEngine
+    engine = RAGEngine(docs_dir="/nonexistent")
+    engine.snapshot = _snapshot(chunks, vectors, **snapshot_kwargs)
+    engine.mistral_client = MagicMock()
+    engine.mistral_client.embeddings.create_async = AsyncMock()
+    engine.mistral_client.chat.complete_async = AsyncMock()
+    engine._initialized = True
+    return engine
+
+
+class TestVectorizedRetrieval:
+    def test_matrix_is_contiguous_normalized_float32(self):
+        import numpy as np
+        from backend.services.rag_engine import RAGEngine
+        m = RAGEngine._to_matrix([[3.0, 4.0], [0.0, 0.0], [1.0, 0.0]])
+        assert m.dtype == np.float32
+        assert m.flags["C_CONTIGUOUS"]
+        assert np.allclose(np.linalg.norm(m[[0, 2]], axis=1), 1.0)
+        assert np.allclose(m[1], 0.0)
+
+    def test_top_k_indices_sorted_best_first(self):
+        import numpy as np
+        from backend.services.rag_engine import RAGEngine
+        scores = np.array([0.1, 0.9, 0.3, 0.7, 0.5], dtype=np.float32)
+        assert RAGEngine._top_k_indices(scores, 3).tolist() == [1, 3, 4]
+        assert RAGEngine._top_k_indices(scores, 10).tolist() == [1, 3, 4, 2, 0]
+        assert RAGEngine._top_k_indices(scores[:0], 3).tolist() == []
+
+    @pytest.mark.asyncio
+    async def test_retrieve_ranks_by_semantic_similarity(self):
+        from unittest.mock import patch
+        chunks = [f"chunk number {i} about unrelated filler text" for i in range(4)]
+        vectors = [[1, 0, 0], [0, 1, 0], [0, 0, 1], [0.7, 0.7, 0]]
+        engine = _ready_engine(chunks, vectors)
+        engine.mistral_client.embeddings.create_async.return_value = _embedding_response([[0, 1, 0]])
+        with patch("backend.services.rag_engine.cache", _DictCache()):
+            results = await engine.retrieve("query", top_k=2)
+        assert results == [chunks[1], chunks[3]]
+        engine.mistral_client.embeddings.create_async.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_retrieve_keyword_only_mode(self):
+        from unittest.mock import patch
+        engine = _ready_engine(["python developer resume tips here", "cooking recipes and kitchen advice"], None)
+        with patch("backend.services.rag_engine.cache", _DictCache()):
+            results = await engine.retrieve("python resume", top_k=1)
+        assert results == ["python developer resume tips here"]
+        engine.mistral_client.embeddings.create_async.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ivf_search_matches_exact_on_probed_clusters(self):
+        from unittest.mock import patch
+        chunks = [f"filler paragraph {i} with nothing in common" for i in range(6)]
+        vectors = [[1, 0.1, 0], [1, 0, 0.1], [0, 1, 0.3], [0.1, 1, 0], [0, 0.1, 1], [0.1, 0, 1]]
+        engine = _ready_engine(chunks, vectors, ann_lists=3)
+        engine.ann_n_probe = 1
+        engine.mistral_client.embeddings.create_async.return_value = _embedding_response([[0, 1, 0]])
+        with patch("backend.services.rag_engine.cache", _DictCache()):
+            results = await engine.retrieve("query", top_k=5)
+        # Only the probed cluster is scored; rows outside it are never returned
+        assert results == [chunks[3], chunks[2]]
+
+
+# ── Retrieval / query-embedding caches ───────────────────────────────────────
+
+class _DictCache:
+    """In-memory stand-in for the diskcache instance."""
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value, expire=None):
+        self.data[key] = value
+
+
+class TestRetrievalCache:
+    def _engine(self):
+        chunks = ["resume writing advice for engineers", "interview preparation checklist items"]
+        engine = _ready_engine(chunks, [[1, 0], [0, 1]], corpus_version="v1")
+        engine.mistral_client.embeddings.create_async.return_value = _embedding_response([[1, 0]])
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_second_call_served_from_cache(self):
+        from unittest.mock import patch
+        engine = self._engine()
+        with patch("backend.services.rag_engine.cache", _DictCache()):
+            first = await engine.retrieve("Resume advice", top_k=1)
+            second = await engine.retrieve("  resume   ADVICE", top_k=1)
+        assert first == second
+        assert engine.mistral_client.embeddings.create_async.await_count == 1
+        stats = engine.get_cache_stats()
+        assert stats["retrieval_hits"] == 1
+        assert stats["retrieval_misses"] == 1
+        assert stats["retrieval_hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_corpus_version_change_invalidates_results_but_reuses_embedding(self):
+        from unittest.mock import patch
+        engine = self._engine()
+        with patch("backend.services.rag_engine.cache", _DictCache()):
+            await engine.retrieve("resume advice", top_k=1)
+            engine.snapshot = _snapshot(engine.snapshot.chunks, [[1, 0], [0, 1]], corpus_version="v2")
+            await engine.retrieve("resume advice", top_k=1)
+        stats = engine.get_cache_stats()
+        assert stats["retrieval_misses"] == 2
+        assert stats["embedding_hits"] == 1
+        assert engine.mistral_client.embeddings.create_async.await_count == 1
+
+    def test_fingerprint_normalizes_case_and_whitespace(self):
+        from backend.services.rag_engine import RAGEngine
+        assert RAGEngine._query_fingerprint("Hello \t World") == RAGEngine._query_fingerprint("hello world")
+        assert RAGEngine._query_fingerprint("hello") != RAGEngine._query_fingerprint("world")
+
+    def test_fingerprint_keeps_symbols(self):
+        from backend.services.rag_engine import RAGEngine
+        keys = {RAGEngine._query_fingerprint(q) for q in ("C++ developer", "C# developer", "C developer")}
+        assert len(keys) == 3
+
+
+# ── Corpus hot-reload ────────────────────────────────────────────────────────
+
+PARA_A = "Tailor every resume to the job description and mirror its key skills."
+PARA_B = "Use the STAR method to structure answers to behavioural interview questions."
+PARA_C = "Quantify achievements with numbers such as revenue, users or time saved."
+
+
+class TestCorpusReload:
+    def _engine(self, tmp_path, paragraphs):
+        from unittest.mock import MagicMock
+        from backend.services.chunker import Chunker
+        from backend.services.rag_engine import RAGEngine
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "guide.txt").write_text("\n\n".join(paragraphs), encoding="utf-8")
+        engine = RAGEngine(docs_dir=str(docs), index_dir=str(tmp_path / "index"))
+        # Small budget so each test paragraph is its own chunk
+        engine.chunker = Chunker(max_tokens=16, overlap_tokens=0)
+        engine.mistral_client = MagicMock()
+        engine.mistral_client.embeddings.create.side_effect = (
+            lambda model, inputs: _embedding_response([[len(t), 1.0] for t in inputs])
+        )
+        engine.snapshot = engine._build_snapshot()
+        engine._initialized = True
+        return engine, docs
+
+    @pytest.mark.asyncio
+    async def test_reload_embeds_only_changed_chunks_and_swaps_snapshot(self, tmp_path):
+        engine, docs = self._engine(tmp_path, [PARA_A, PARA_B])
+        old = engine.snapshot
+        engine.mistral_client.embeddings.create.reset_mock()
+        (docs / "guide.txt").write_text("\n\n".join([PARA_A, PARA_B, PARA_C]), encoding="utf-8")
+
+        result = await engine.reload()
+
+        assert result["reloaded"] is True
+        assert result["embedded"] == 1 and result["reused"] == 2
+        engine.mistral_client.embeddings.create.assert_called_once()
+        assert engine.mistral_client.embeddings.create.call_args.kwargs["inputs"] == [PARA_C]
+        assert engine.snapshot is not old
+        assert engine.snapshot.corpus_version != old.corpus_version
+        # The previous snapshot is left intact for in-flight retrievals
+        assert old.chunks == [PARA_A, PARA_B]
+
+    @pytest.mark.asyncio
+    async def test_reload_without_changes_keeps_snapshot(self, tmp_path):
+        engine, _ = self._engine(tmp_path, [PARA_A, PARA_B])
+        old = engine.snapshot
+        result = await engine.reload()
+        assert result["reloaded"] is False
+        assert engine.snapshot is old
+
+    @pytest.mark.asyncio
+    async def test_in_flight_retrieval_finishes_on_old_snapshot(self, tmp_path):
+        import asyncio
+        from unittest.mock import AsyncMock, patch
+        engine, docs = self._engine(tmp_path, [PARA_A, PARA_B])
+        gate = asyncio.Event()
+
+        async def slow_embed(**kwargs):
+            await gate.wait()
+            return _embedding_response([[1.0, 0.0]])
+
+        engine.mistral_client.embeddings.create_async = AsyncMock(side_effect=slow_embed)
+        with patch("backend.services.rag_engine.cache", _DictCache()):
+            pending = asyncio.create_task(engine.retrieve("resume", top_k=5))
+            await asyncio.sleep(0.02)
+            (docs / "guide.txt").write_text(PARA_C, encoding="utf-8")
+            await engine.reload()
+            gate.set()
+            results = await pending
+        assert set(results) <= {PARA_A, PARA_B}
+        assert engine.snapshot.chunks == [PARA_C]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reloads_before_init_initialize_once(self, tmp_path):
+        import asyncio, time
+        engine, _ = self._engine(tmp_path, [PARA_A])
+        engine._initialized = False
+        calls = []
+
+        def slow_initialize():
+            calls.append(1)
+            time.sleep(0.05)
+            engine._initialized = True
+
+        engine.initialize = slow_initialize
+        first, second = await asyncio.gather(engine.reload(), engine.reload())
+        assert len(calls) == 1
+        assert first["reloaded"] is True
+        assert second == {"reloaded": False, "reason": "reload already in progress"}
+        assert engine._reloading is False
+
+    def test_docs_signature_changes_on_edit(self, tmp_path):
+        engine, docs = self._engine(tmp_path, [PARA_A])
+        before = engine._docs_signature()
+        (docs / "extra.txt").write_text(PARA_B, encoding="utf-8")
+        assert engine._docs_signature() != before
+
+
+# ── CRAG verdict cache ───────────────────────────────────────────────────────
+
+def _chat_response(content):
+    from unittest.mock import MagicMock
+    resp = MagicMock()
+    resp.choices = [MagicMock(message=MagicMock(content=content))]
+    return resp
+
+
+class TestCragVerdictCache:
+    VERDICT = '{"relevance": [true, false], "quality_score": 0.9, "needs_external_search": false}'
+
+    def _engine(self, vectors=([1, 0], [0.6, 0.8]), query_vector=(0, 1)):
+        chunks = ["resume writing advice for engineers", "interview preparation checklist items"]
+        engine = _ready_engine(chunks, [list(v) for v in vectors] if vectors else None)
+        engine.mistral_client.embeddings.create_async.return_value = _embedding_response([list(query_vector)])
+        engine.mistral_client.chat.complete_async.return_value = _chat_response(self.VERDICT)
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_same_query_and_chunks_reuse_verdict(self):
+        from unittest.mock import patch
+        engine = self._engine()
+        with patch("backend.services.rag_engine.cache", _DictCache()):
+            first = await engine.retrieve_with_correction("checklist", top_k=2)
+            second = await engine.retrieve_with_correction(" Checklist ", top_k=2)
+        assert first == second
+        assert first["status"] == "high_quality"
+        assert len(first["documents"]) == 1
+        assert engine.mistral_client.chat.complete_async.await_count == 1
+        stats = engine.get_cache_stats()
+        assert stats["crag_hits"] == 1 and stats["crag_misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_chunk_content_misses(self):
+        from unittest.mock import patch
+        engine = self._engine()
+        with patch("backend.services.rag_engine.cache", _DictCache()):
+            await engine.retrieve_with_correction("checklist", top_k=2)
+            edited = ["resume writing advice for engineers (updated)", "interview preparation checklist items"]
+            engine.snapshot = _snapshot(edited, [[1, 0], [0.6, 0.8]], corpus_version="v2")
+            await engine.retrieve_with_correction("checklist", top_k=2)
+        assert engine.mistral_client.chat.complete_async.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_confident_scores_skip_evaluation(self):
+        from unittest.mock import patch
+        engine = self._engine(query_vector=(1, 0))
+        with patch("backend.services.rag_engine.cache", _DictCache()):
+            result = await engine.retrieve_with_correction("resume writing advice", top_k=1)
+        engine.mistral_client.chat.complete_async.assert_not_awaited()
+        assert result["documents"] == ["resume writing advice for engineers"]
+        assert result["status"] == "high_quality"
+        assert engine.get_cache_stats()["crag_skipped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_keyword_share_does_not_skip_on_weak_cosine(self):
+        from unittest.mock import patch
+        # Hybrid 0.7 * 0.8 + 0.3 * 1.0 = 0.86, but the cosine alone is only 0.8
+        engine = self._engine(query_vector=(0.8, 0.6))
+        with patch("backend.services.rag_engine.cache", _DictCache()):
+            result = await engine.retrieve_with_correction("resume writing advice", top_k=1)
+        assert result["documents"] == ["resume writing advice for engineers"]
+        engine.mistral_client.chat.complete_async.assert_awaited_once()
+        assert engine.get_cache_stats()["crag_skipped"] == 0
+
+    @pytest.mark.asyncio
+    async def test_keyword_only_mode_never_skips(self):
+        from unittest.mock import patch
+        engine = self._engine(vectors=None)
+        with patch("backend.services.rag_engine.cache", _DictCache()):
+            await engine.retrieve_with_correction("resume writing advice", top_k=1)
+        engine.mistral_client.chat.complete_async.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_malformed_verdict_is_not_cached(self):
+        from unittest.mock import patch
+        engine = self._engine()
+        engine.mistral_client.chat.complete_async.return_value = _chat_response("[1, 2]")
+        fake_cache = _DictCache()
+        with patch("backend.services.rag_engine.cache", fake_cache):
+            result = await engine.retrieve_with_correction("checklist", top_k=2)
+        assert result["status"] == "error"
+        assert not any(k.startswith("rag:crag:") for k in fake_cache.data)
+
+
+# ── Local input guardrail ────────────────────────────────────────────────────
+
+class TestLocalGuardrailRouting:
+    @pytest.mark.asyncio
+    async def test_clear_answer_skips_llm(self):
+        import numpy as np
+        from unittest.mock import AsyncMock, patch
+        engine = _ready_engine(["chunk"], [[1, 0]])
+        guard = engine.input_guardrail
+        # A trained model that is confident every input is safe
+        guard.weights = np.zeros(guard.n_features, dtype=np.float32)
+        guard.bias = -5.0
+        with patch("backend.services.rag_engine.audit_logs.insert_one", new_callable=AsyncMock):
+            result = await engine.validate_input("I led the team that delivered our billing project.")
+        assert result["safe"] is True and result["source"] == "local"
+        engine.mistral_client.chat.complete_async.assert_not_awaited()
+        assert engine.get_cache_stats()["input_guardrail"]["local_safe"] == 1
+
+    @pytest.mark.asyncio
+    async def test_untrained_guardrail_sends_career_answer_to_llm(self):
+        from unittest.mock import AsyncMock, patch
+        engine = _ready_engine(["chunk"], [[1, 0]])
+        engine.mistral_client.chat.complete_async.return_value = _chat_response(
+            '{"safe": true, "reason": "ok", "category": "relevant"}'
+        )
+        answer = "I led the team that delivered our billing project. " * 12
+        insert = AsyncMock()
+        with patch("backend.services.rag_engine.audit_writer.submit", return_value=False), \
+             patch("backend.services.rag_engine.audit_logs.insert_one", insert):
+            result = await engine.validate_input(answer)
+        assert result["source"] == "llm"
+        engine.mistral_client.chat.complete_async.assert_awaited_once()
+        # Logged whole (up to the validated 500 chars), so training sees what was judged
+        logged = insert.await_args.args[0]
+        assert logged["event_type"] == "rag_input_validation" and logged["query"] == answer[:500]
+
+    @pytest.mark.asyncio
+    async def test_ambiguous_input_goes_to_llm(self):
+        from unittest.mock import AsyncMock, patch
+        engine = _ready_engine(["chunk"], [[1, 0]])
+        engine.mistral_client.chat.complete_async.return_value = _chat_response(
+            '{"safe": false, "reason": "off topic", "category": "misuse"}'
+        )
+        with patch("backend.services.rag_engine.audit_logs.insert_one", new_callable=AsyncMock):
+            result = await engine.validate_input("Write an essay about the Roman empire")
+        assert result == {"safe": False, "reason": "off topic", "category": "misuse", "source": "llm"}
+        engine.mistral_client.chat.complete_async.assert_awaited_once()
+        assert engine.get_cache_stats()["input_guardrail"]["llm"] == 1
+
+    @pytest.mark.asyncio
+    async def test_train_guardrail_uses_llm_labelled_events(self):
+        from unittest.mock import MagicMock, patch
+        engine = _ready_engine(["chunk"], [[1, 0]])
+        docs = (
+            [{"query": "I managed a project with a tight deadline", "details": {"safe": True}}] * 30
+            + [{"query": "Solve my calculus homework now", "details": {"safe": False, "source": "llm"}}] * 30
+        )
+
+        class _Cursor:
+            def sort(self, *a):
+                return self
+
+            def limit(self, n):
+                return self
+
+            def __aiter__(self):
+                self._it = iter(docs)
+                return self
+
+            async def __anext__(self):
+                try:
+                    return next(self._it)
+                except StopIteration:
+                    raise StopAsyncIteration
+
+        find = MagicMock(return_value=_Cursor())
+        with patch("backend.services.rag_engine.audit_logs.find", find):
+            result = await engine.train_guardrail()
+        assert result == {"trained": True, "examples": 60}
+        assert find.call_args.args[0]["details.source"] == {"$ne": "local"}
+        assert engine.input_guardrail.trained_on == 60
@@ -0,0 +1,109 @@
+"""
+Unit Tests — backend/services/session_reaper.py
+Tests: idle-only selection through the open-session filter, conditional batched
+closes, the per-pass batch cap, stats, and start/stop of the background loop.
+Collection is a mock — no DB.
+"""
+import os
+import sys
+import asyncio
+import pytest
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.services.session_reaper import SessionReaper, OPEN_SESSION
+
+
+class _Cursor:
+    def __init__(self, items):
+        self._items = list(items)
+    def sort(self, *a, **kw):
+        return self
+    def limit(self, n):
+        self._items = self._items[:n]
+        return self
+    def __aiter__(self):
+        return self
+    async def __anext__(self):
+        if not self._items:
+            raise StopAsyncIteration
+        return self._items.pop(0)
+
+
+def _collection(idle_ids):
+    """Serves `idle_ids` oldest first and drops each id once update_many closes it."""
+    remaining = list(idle_ids)
+    col = MagicMock()
+    col.find = MagicMock(side_effect=lambda flt, proj: _Cursor({"_id": i} for i in remaining))
+
+    async def update_many(flt, update):
+        closed = [i for i in flt["_id"]["$in"] if i in remaining]
+        for i in closed:
+            remaining.remove(i)
+        return MagicMock(modified_count=len(closed))
+    col.update_many = AsyncMock(side_effect=update_many)
+    return col
+
+
+class TestReapOnce:
+    @pytest.mark.asyncio
+    async def test_closes_idle_open_sessions_conditionally(self):
+        col = _collection(["a", "b"])
+        reaper = SessionReaper(col, idle_timeout=timedelta(minutes=30), batch_size=10)
+        assert await reaper.reap_once() == 2
+        flt = col.find.call_args[0][0]
+        assert flt["ended_at"] == OPEN_SESSION["ended_at"]
+        assert "$lt" in flt["last_activity_at"]
+        update_flt, update = col.update_many.call_args[0]
+        # Re-checked at write time so a session that just got a turn is left alone
+        assert update_flt["last_activity_at"] == flt["last_activity_at"]
+        assert update_flt["ended_at"] == OPEN_SESSION["ended_at"]
+        assert update["$set"]["ended_reason"] == "idle"
+
+    @pytest.mark.asyncio
+    async def test_works_in_batches_up_to_the_cap(self):
+        col = _collection([f"s{i}" for i in range(25)])
+        reaper = SessionReaper(col, batch_size=10, max_batches=2)
+        assert await reaper.reap_once() == 20
+        assert col.update_many.await_count == 2
+        # The rest is picked up by the next pass
+        assert await reaper.reap_once() == 5
+        assert reaper.get_stats()["reaped"] == 25 and reaper.get_stats()["passes"] == 2
+
+    @pytest.mark.asyncio
+    async def test_nothing_idle_makes_no_writes(self):
+        col = _collection([])
+        assert await SessionReaper(col).reap_once() == 0
+        col.update_many.assert_not_awaited()
+
+
+class TestLifecycle:
+    @pytest.mark.asyncio
+    async def test_start_runs_first_pass_and_stop_ends_loop(self):
+        col = _collection(["a"])
+        reaper = SessionReaper(col, interval=60)
+        reaper.start()
+        for _ in range(50):
+            if reaper.stats["passes"]:
+                break
+            await asyncio.sleep(0.01)
+        assert reaper.stats["reaped"] == 1
+        await reaper.stop()
+        assert reaper.running is False
+
+    @pytest.mark.asyncio
+    async def test_failed_pass_is_counted_and_loop_survives(self):
+        col = MagicMock()
+        col.find = MagicMock(side_effect=RuntimeError("db down"))
+        reaper = SessionReaper(col, interval=60)
+        reaper.start()
+        for _ in range(50):
+            if reaper.stats["failed_passes"]:
+                break
+            await asyncio.sleep(0.01)
+        assert reaper.stats["failed_passes"] == 1 and reaper.running
+        await reaper.stop()
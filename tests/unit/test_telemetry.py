@@ -0,0 +1,116 @@
+"""
+Unit Tests — backend/services/telemetry.py
+Tests: write-behind queueing, batched insert_many flushes, drop counters on a
+full queue, failure accounting, shutdown flush and the direct-insert fallback.
+Collections are AsyncMocks — no DB.
+"""
+import os
+import sys
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.services.telemetry import TelemetryWriter
+
+
+def _collection():
+    col = MagicMock()
+    col.insert_many = AsyncMock()
+    col.insert_one = AsyncMock()
+    return col
+
+
+class TestTelemetryWriter:
+    def test_submit_refused_when_not_started(self):
+        writer = TelemetryWriter(_collection())
+        assert writer.submit({"event_type": "x"}) is False
+        assert writer.get_stats()["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_events_flushed_in_batches(self):
+        col = _collection()
+        writer = TelemetryWriter(col, batch_size=4, flush_interval=60)
+        writer.start()
+        for i in range(10):
+            assert writer.submit({"n": i}) is True
+        await writer.stop()
+        sizes = [len(c.args[0]) for c in col.insert_many.await_args_list]
+        assert sizes == [4, 4, 2]
+        assert [d["n"] for c in col.insert_many.await_args_list for d in c.args[0]] == list(range(10))
+        stats = writer.get_stats()
+        assert stats["written"] == 10 and stats["queued"] == 0 and stats["running"] is False
+
+    @pytest.mark.asyncio
+    async def test_full_batch_wakes_flusher_before_interval(self):
+        col = _collection()
+        writer = TelemetryWriter(col, batch_size=3, flush_interval=60)
+        writer.start()
+        for i in range(3):
+            writer.submit({"n": i})
+        await asyncio.sleep(0.05)
+        col.insert_many.assert_awaited_once()
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_periodic_flush(self):
+        col = _collection()
+        writer = TelemetryWriter(col, batch_size=100, flush_interval=0.02)
+        writer.start()
+        writer.submit({"n": 1})
+        await asyncio.sleep(0.1)
+        col.insert_many.assert_awaited_once()
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_and_counts(self):
+        col = _collection()
+        writer = TelemetryWriter(col, max_queue=5, batch_size=100, flush_interval=60)
+        writer.start()
+        for i in range(8):
+            writer.submit({"n": i})
+        stats = writer.get_stats()
+        assert stats["queued"] == 5 and stats["dropped"] == 3 and stats["enqueued"] == 5
+        await writer.stop()
+        assert writer.get_stats()["written"] == 5
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_counted(self):
+        col = _collection()
+        col.insert_many.side_effect = RuntimeError("mongo down")
+        writer = TelemetryWriter(col, batch_size=10, flush_interval=60)
+        writer.start()
+        writer.submit({"n": 1})
+        writer.submit({"n": 2})
+        await writer.stop()
+        stats = writer.get_stats()
+        assert stats["failed"] == 2 and stats["written"] == 0 and stats["queued"] == 0
+
+
+class TestLogEventRouting:
+    @pytest.mark.asyncio
+    async def test_log_event_queues_when_writer_running(self):
+        import backend.services.audit as audit
+        col = _collection()
+        writer = TelemetryWriter(col, flush_interval=60)
+        writer.start()
+        direct = AsyncMock()
+        with patch.object(audit, "audit_writer", writer), \
+             patch.object(audit.audit_logs, "insert_one", direct):
+            await audit.log_event("u1", "a@b.com", "admin_login", "1.2.3.4", "success")
+        direct.assert_not_awaited()
+        assert writer.get_stats()["queued"] == 1
+        await writer.stop()
+        assert col.insert_many.await_args.args[0][0]["event_type"] == "admin_login"
+
+    @pytest.mark.asyncio
+    async def test_log_event_inserts_directly_without_writer(self):
+        import backend.services.audit as audit
+        direct = AsyncMock()
+        with patch.object(audit, "audit_writer", TelemetryWriter(_collection())), \
+             patch.object(audit.audit_logs, "insert_one", direct):
+            await audit.log_event("u1", "a@b.com", "admin_login", "1.2.3.4", "success")
+        direct.assert_awaited_once()
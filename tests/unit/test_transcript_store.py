@@ -0,0 +1,132 @@
+"""
+Unit Tests — backend/services/transcript_store.py
+Tests: seq assignment on append, ranged reads, paging with next_after, and the
+idempotent migration of embedded transcripts off the session documents.
+Collections are mocks — no DB.
+"""
+import os
+import sys
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from pymongo.errors import BulkWriteError
+from backend.services.transcript_store import TranscriptStore
+
+
+class _Cursor:
+    def __init__(self, items):
+        self._items = list(items)
+    def sort(self, *a, **kw):
+        return self
+    def limit(self, n):
+        self._items = self._items[:n]
+        return self
+    def __aiter__(self):
+        return self
+    async def __anext__(self):
+        if not self._items:
+            raise StopAsyncIteration
+        return self._items.pop(0)
+
+
+def _turns(n):
+    return [{"seq": i, "role": "assistant" if i % 2 == 0 else "user", "text": f"turn {i}"} for i in range(n)]
+
+
+def _collection(turns=()):
+    col = MagicMock()
+    col.insert_many = AsyncMock()
+    col.find = MagicMock(side_effect=lambda flt, proj=None: _Cursor(
+        t for t in turns if t["seq"] >= flt["seq"]["$gte"]))
+    return col
+
+
+class TestAppendAndRead:
+    @pytest.mark.asyncio
+    async def test_append_numbers_entries_from_start_seq(self):
+        col = _collection()
+        await TranscriptStore(col).append("s1", 5, [{"role": "user", "text": "a"}, {"role": "assistant", "text": "b"}])
+        docs = col.insert_many.call_args[0][0]
+        assert [(d["session_id"], d["seq"], d["text"]) for d in docs] == [("s1", 5, "a"), ("s1", 6, "b")]
+
+    @pytest.mark.asyncio
+    async def test_append_nothing_skips_write(self):
+        col = _collection()
+        await TranscriptStore(col).append("s1", 0, [])
+        col.insert_many.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_read_from_seq(self):
+        store = TranscriptStore(_collection(_turns(6)))
+        assert [t["seq"] for t in await store.read("s1", start=4)] == [4, 5]
+
+
+class TestPage:
+    @pytest.mark.asyncio
+    async def test_pages_until_exhausted(self):
+        store = TranscriptStore(_collection(_turns(5)))
+        first = await store.page("s1", limit=2)
+        assert [t["seq"] for t in first["items"]] == [0, 1] and first["next_after"] == 1
+        last = await store.page("s1", after=3, limit=2)
+        assert [t["seq"] for t in last["items"]] == [4] and last["next_after"] is None
+
+    @pytest.mark.asyncio
+    async def test_limit_is_capped(self):
+        col = _collection(_turns(300))
+        page = await TranscriptStore(col).page("s1", limit=10_000)
+        assert len(page["items"]) == 200
+
+
+class TestMigrateEmbedded:
+    @pytest.mark.asyncio
+    async def test_moves_transcript_and_sets_turn_count(self):
+        col = _collection()
+        sessions = MagicMock()
+        sessions.find = MagicMock(return_value=_Cursor([
+            {"_id": 1, "session_id": "s1", "transcript": [{"role": "assistant", "text": "hi"}, {"role": "user", "text": "yo"}]},
+        ]))
+        sessions.update_one = AsyncMock()
+        assert await TranscriptStore(col).migrate_embedded(sessions) == 1
+        assert [d["seq"] for d in col.insert_many.call_args[0][0]] == [0, 1]
+        flt, update = sessions.update_one.call_args[0]
+        assert flt == {"_id": 1, "transcript": {"$exists": True}}
+        assert update == {"$set": {"turn_count": 2}, "$unset": {"transcript": ""}}
+
+    @pytest.mark.asyncio
+    async def test_rerun_tolerates_already_stored_entries(self):
+        col = _collection()
+        col.insert_many = AsyncMock(side_effect=BulkWriteError({"writeErrors": [{"code": 11000}]}))
+        sessions = MagicMock()
+        sessions.find = MagicMock(return_value=_Cursor([
+            {"_id": 1, "session_id": "s1", "transcript": [{"role": "assistant", "text": "hi"}]},
+        ]))
+        sessions.update_one = AsyncMock()
+        assert await TranscriptStore(col).migrate_embedded(sessions) == 1
+        sessions.update_one.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_other_write_errors_leave_session_untouched(self):
+        col = _collection()
+        col.insert_many = AsyncMock(side_effect=BulkWriteError({"writeErrors": [{"code": 121}]}))
+        sessions = MagicMock()
+        sessions.find = MagicMock(return_value=_Cursor([
+            {"_id": 1, "session_id": "s1", "transcript": [{"role": "assistant", "text": "hi"}]},
+        ]))
+        sessions.update_one = AsyncMock()
+        assert await TranscriptStore(col).migrate_embedded(sessions) == 0
+        sessions.update_one.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_migrate_session_only_sets_turn_count_while_array_remains(self):
+        col = _collection()
+        sessions = MagicMock()
+        sessions.update_one = AsyncMock()
+        s = {"_id": 1, "session_id": "s1", "transcript": [{"role": "assistant", "text": "hi"}]}
+        assert await TranscriptStore(col).migrate_session(sessions, s) is True
+        # A stale read of an already migrated session must not rewind turn_count
+        flt, _ = sessions.update_one.call_args[0]
+        assert flt["transcript"] == {"$exists": True}